@@ -0,0 +1,227 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from core.tables.TableValues import TableValues
+
+class CompileCache:
+    """ A content-addressed cache of the pd2hv/max2hv, hv2ir and ir2c stages.
+        Entries are keyed on the content of the root patch, the compile options
+        and a fingerprint of the compiler sources. An entry is only used if all
+        of the files read while parsing (e.g. abstractions) are unchanged, and
+        no new abstractions have appeared in any of the searched directories.
+        The least recently used entries are evicted when the cache grows
+        beyond its maximum size.
+    """
+
+    # the default maximum size of the cache, in bytes
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+    # the compiler sources which affect the output of the cached stages,
+    # relative to the hvcc root directory
+    __COMPILER_PATHS = [
+        "hvcc.py",
+        "core",
+        "interpreters",
+        os.path.join("generators", "ir2c"),
+        os.path.join("generators", "copyright")
+    ]
+
+    __ENTRY_FILE = "entry.json"
+
+    __FILES_DIR = "files"
+
+    # memoized fingerprint of the compiler sources
+    __fingerprint = None
+
+    def __init__(self, cache_dir, max_size=None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = max_size or CompileCache.DEFAULT_MAX_SIZE
+
+    @classmethod
+    def hash_file(clazz, path):
+        """ Returns the sha1 hex digest of a file's contents,
+            or None if the file does not exist.
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    @classmethod
+    def hash_directory(clazz, path):
+        """ Returns the sha1 hex digest of the names of all Pd files in a directory.
+            The directory contents are not read.
+        """
+        if not os.path.isdir(path):
+            return None
+        names = sorted(f for f in os.listdir(path) if f.endswith(".pd"))
+        return hashlib.sha1("\n".join(names)).hexdigest()
+
+    @classmethod
+    def get_fingerprint(clazz):
+        """ Returns a hash of all compiler sources which affect the cached stages.
+            This is computed only once per process.
+        """
+        if clazz.__fingerprint is None:
+            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            h = hashlib.sha1()
+            for p in clazz.__COMPILER_PATHS:
+                p = os.path.join(root_dir, p)
+                if os.path.isfile(p):
+                    paths = [p]
+                else:
+                    paths = []
+                    for d, dirs, files in os.walk(p):
+                        dirs.sort()
+                        paths.extend(os.path.join(d, f) for f in sorted(files) \
+                            if not f.endswith(".pyc"))
+                for f in paths:
+                    h.update(os.path.relpath(f, root_dir))
+                    h.update(clazz.hash_file(f))
+            clazz.__fingerprint = h.hexdigest()
+        return clazz.__fingerprint
+
+    def get_key(self, in_path, options):
+        """ Returns the cache key for an input patch and a dictionary of
+            compile options.
+        """
+        h = hashlib.sha1()
+        h.update(CompileCache.get_fingerprint())
+        h.update(os.path.abspath(in_path))
+        h.update(CompileCache.hash_file(in_path) or "")
+        h.update(json.dumps(options, sort_keys=True))
+        return h.hexdigest()
+
+    def __get_entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def load(self, key):
+        """ Returns the cache entry for a key, or None if there is no valid entry.
+        """
+        entry_path = os.path.join(self.__get_entry_dir(key), CompileCache.__ENTRY_FILE)
+        try:
+            entry = TableValues.load(entry_path)
+        except Exception:
+            return None
+
+        # ensure that none of the dependencies have changed
+        for path, h in entry["dependencies"].iteritems():
+            if CompileCache.hash_file(path) != h:
+                return None
+        for path, h in entry["search_directories"].iteritems():
+            if CompileCache.hash_directory(path) != h:
+                return None
+
+        # update the last used time of the entry
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass # the entry may have just been evicted by another process
+
+        entry["key"] = key
+        return entry
+
+    def restore(self, entry, out_dir):
+        """ Copies the cached output files to the output directory and returns
+            the cached stage results, with their paths updated to the new
+            output directory.
+        """
+        files_dir = os.path.join(self.__get_entry_dir(entry["key"]), CompileCache.__FILES_DIR)
+        for f in entry["files"]:
+            dst = os.path.join(out_dir, f)
+            if not os.path.isdir(os.path.dirname(dst)):
+                os.makedirs(os.path.dirname(dst))
+            shutil.copy2(os.path.join(files_dir, f), dst)
+
+        results = OrderedDict(entry["results"])
+        old_out_dir = entry["out_dir"]
+        for r in results.values():
+            for k in ["in_dir", "out_dir"]:
+                if r.get(k) and r[k].startswith(old_out_dir):
+                    r[k] = out_dir + r[k][len(old_out_dir):]
+            r["cache"] = "hit"
+        return results
+
+    def store(self, key, results, out_dir, files, dependencies, search_directories):
+        """ Stores the stage results and output files (relative to the output
+            directory) of a compile.
+        """
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        # build the entry in a temporary directory such that it appears atomically
+        tmp_dir = tempfile.mkdtemp(prefix="tmp-", dir=self.cache_dir)
+        try:
+            files_dir = os.path.join(tmp_dir, CompileCache.__FILES_DIR)
+            for f in files:
+                dst = os.path.join(files_dir, f)
+                if not os.path.isdir(os.path.dirname(dst)):
+                    os.makedirs(os.path.dirname(dst))
+                shutil.copy2(os.path.join(out_dir, f), dst)
+
+            # the table values of the HeavyIR are written to a sidecar file
+            TableValues.dump({
+                "out_dir": out_dir,
+                "files": files,
+                "dependencies": {p: CompileCache.hash_file(p) for p in dependencies},
+                "search_directories": {p: CompileCache.hash_directory(p) for p in search_directories},
+                "results": results.items()
+            }, os.path.join(tmp_dir, CompileCache.__ENTRY_FILE))
+
+            entry_dir = self.__get_entry_dir(key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            elif not os.path.isdir(os.path.dirname(entry_dir)):
+                os.makedirs(os.path.dirname(entry_dir))
+            os.rename(tmp_dir, entry_dir)
+        except (OSError, IOError):
+            # another process may be storing the same entry
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """ Removes the least recently used entries until the cache is no
+            larger than its maximum size.
+        """
+        entries = []
+        total_size = 0
+        for d in os.listdir(self.cache_dir):
+            if len(d) != 2:
+                continue # temporary directories
+            for key in os.listdir(os.path.join(self.cache_dir, d)):
+                entry_dir = os.path.join(self.cache_dir, d, key)
+                try:
+                    last_used = os.path.getmtime(os.path.join(entry_dir, CompileCache.__ENTRY_FILE))
+                    size = sum(os.path.getsize(os.path.join(p, f)) \
+                        for p, _, files in os.walk(entry_dir) for f in files)
+                except OSError:
+                    continue
+                entries.append((last_used, size, entry_dir))
+                total_size += size
+
+        for last_used, size, entry_dir in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
@@ -13,30 +13,38 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import defaultdict
-
 from HeavyException import HeavyException
 
 class BufferPool:
 
     def __init__(self):
-        # the idea is that the same buffer is reused as quickly as possible so that it doesn't need
+        # the retain count of every buffer in the pool
+        self.__counts = {}
+
+        # the number of buffers of each type. New buffers are indexed by it.
+        self.__num_buffers = {
+            "~f>": 0,
+            "~i>": 0
+        }
+
+        # the unused buffers (with a retain count of zero) of each type, in the
+        # order in which they were released.
+        # The idea is that the same buffer is reused as quickly as possible so that it doesn't need
         # to be moved around in the cache. It does not give substantially different results
         # from a Counter-based implementation, but it is more consistent and predictable.
-        self.pool = {
-            "~f>": defaultdict(list),
-            "~i>": defaultdict(list)
+        self.__free = {
+            "~f>": [],
+            "~i>": []
         }
 
-
     def num_buffers(self, connection_type=None):
-        """ Returns the number of buffers with the given retain count. By default returns
-            the size of the entire pool. Number of buffers per connection type can also be retrieved.
+        """ Returns the number of buffers in the pool. By default returns the size of the
+            entire pool. Number of buffers per connection type can also be retrieved.
         """
         if connection_type is None:
             return self.num_buffers("~f>") + self.num_buffers("~i>")
-        elif connection_type in self.pool:
-            return sum(len(v) for v in self.pool[connection_type].values())
+        elif connection_type in self.__num_buffers:
+            return self.__num_buffers[connection_type]
         else:
             raise HeavyException("Unknown connection type: \"{0}\"".format(connection_type))
 
@@ -44,18 +52,20 @@ class BufferPool:
         """ Returns a currently unused buffer. The buffer can be assigned a retain count. An optional
             exclude set can also be supplied, ensuring that the returned buffer is not one of them.
         """
-        excludeSet = excludeSet if excludeSet is not None else set()
-
-        pool = self.pool[connection_type]
+        free = self.__free[connection_type]
 
         # get the most recently used, unused buffer
-        b = next((b for b in reversed(pool[0]) if b not in excludeSet), None)
-        if b is not None:
-            pool[0].remove(b)
+        if len(free) > 0 and (excludeSet is None or free[-1] not in excludeSet):
+            b = free.pop()
         else:
-            # if we get here, then no available buffer was found. Create a new one.
-            b = (connection_type, self.num_buffers(connection_type)) # new buffer index for the given type
-        pool[count].append(b)
+            b = next((b for b in reversed(free) if b not in excludeSet), None) if excludeSet else None
+            if b is not None:
+                free.remove(b)
+            else:
+                # if we get here, then no available buffer was found. Create a new one.
+                b = (connection_type, self.__num_buffers[connection_type]) # new buffer index for the given type
+                self.__num_buffers[connection_type] += 1
+        self.__set_count(b, count)
         return b
 
     def retain_buffer(self, b, count=1):
@@ -65,13 +75,7 @@ class BufferPool:
         if b[0] in ["zero", "input"]:
             return 0
         else:
-            pool = self.pool[b[0]]
-            for k, v in pool.iteritems():
-                if b in v:
-                    v.remove(b)
-                    pool[k+count].append(b)
-                    return k+count # return the new retain count
-            raise HeavyException("{0} not found in BufferPool!".format(b))
+            return self.__update_count(b, count)
 
     def release_buffer(self, b, count=1):
         """ Reduces the retain count of the buffer. Returns the new count.
@@ -82,13 +86,25 @@ class BufferPool:
         if b[0] in ["zero", "input"]:
             return 0
         else:
-            pool = self.pool[b[0]]
-            for k, v in pool.iteritems():
-                if b in v:
-                    v.remove(b)
-                    pool[k-count].append(b)
-                    return k-count # return the new retain count
+            return self.__update_count(b, -count)
+
+    def __update_count(self, b, count):
+        """ Adds count to the retain count of a buffer in the pool. Returns the new count.
+        """
+        k = self.__counts.get(b)
+        if k is None:
             raise HeavyException("{0} not found in BufferPool!".format(b))
+        if k == 0:
+            self.__free[b[0]].remove(b)
+        self.__set_count(b, k+count)
+        return k+count
+
+    def __set_count(self, b, count):
+        # a buffer which becomes unused is the first to be reused
+        self.__counts[b] = count
+        if count == 0:
+            self.__free[b[0]].append(b)
 
     def __repr__(self):
-        return self.pool["~f>"].__repr__() + self.pool["~i>"].__repr__()
+        return {k: v for k, v in self.__counts.iteritems() if v != 0}.__repr__() + \
+            self.__free.__repr__()
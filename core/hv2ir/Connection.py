@@ -13,16 +13,22 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-class Connection:
+class Connection(object):
     """ A Connection describes a connection between two objects.
+        Large graphs have many connections, so they have no __dict__.
     """
 
+    __slots__ = ("from_object", "outlet_index", "to_object", "inlet_index", "type", "__hash")
+
+    # all connections of a type share the same type string
+    __TYPES = {t: t for t in ["-->", "~f>", "~i>", "-~>"]}
+
     def __init__(self, from_object, outlet_index, to_object, inlet_index, conn_type):
         self.from_object = from_object
         self.outlet_index = outlet_index
         self.to_object = to_object
         self.inlet_index = inlet_index
-        self.type = conn_type
+        self.type = Connection.__TYPES.get(conn_type, conn_type)
 
         # cache the hash of this object
         self.__hash = hash((
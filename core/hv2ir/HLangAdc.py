@@ -26,7 +26,7 @@ class HLangAdc(HeavyLangObject):
             obj_type,
             args, graph,
             num_inlets=0,
-            num_outlets=len(args[HeavyLangObject._HEAVY_LANG_DICT[obj_type]["args"][0]["name"]]),
+            num_outlets=len(args[HeavyLangObject._get_heavy_lang_dict()[obj_type]["args"][0]["name"]]),
             annotations=annotations)
 
     def _resolved_outlet_type(self, outlet_index=0):
@@ -26,7 +26,7 @@ class HLangDac(HeavyLangObject):
             self,
             obj_type,
             args, graph,
-            num_inlets=len(args[HeavyLangObject._HEAVY_LANG_DICT["dac"]["args"][0]["name"]]),
+            num_inlets=len(args[HeavyLangObject._get_heavy_lang_dict()["dac"]["args"][0]["name"]]),
             num_outlets=0,
             annotations=annotations)
 
@@ -14,7 +14,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import random
 
 from HeavyLangObject import HeavyLangObject
 
@@ -30,7 +29,7 @@ class HLangNoise(HeavyLangObject):
             annotations=annotations)
 
     def reduce(self):
-        seed = int(random.uniform(1,2147483647)) # assign a random 32-bit seed
+        seed = int(self.get_random().uniform(1,2147483647)) # assign a random 32-bit seed
         noise_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
             "./hvlib/noise.hv.json")
         x = HeavyParser.graph_from_file(noise_path, graph_args={"seed":seed})
@@ -13,8 +13,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import random
-
 from HeavyLangObject import HeavyLangObject
 from HeavyIrObject import HeavyIrObject
 
@@ -30,6 +28,6 @@ class HLangRandom(HeavyLangObject):
             annotations=annotations)
 
     def reduce(self):
-        self.args["seed"] = int(random.uniform(-2147483647, 2147483648))
+        self.args["seed"] = int(self.get_random().uniform(-2147483647, 2147483648))
         x = HeavyIrObject("__random", self.args)
         return ({x}, self.get_connection_move_list(x))
@@ -21,7 +21,7 @@ from HeavyLangObject import HeavyLangObject
 class HLangSequence(HeavyLangObject):
     def __init__(self, obj_type, args, graph, annotations=None):
         # get the number of outlets that this object has
-        num_outlets = len(args[HeavyLangObject._HEAVY_LANG_DICT[obj_type]["args"][0]["name"]])
+        num_outlets = len(args[HeavyLangObject._get_heavy_lang_dict()[obj_type]["args"][0]["name"]])
         HeavyLangObject.__init__(self, obj_type, args, graph,
             num_inlets=1,
             num_outlets=num_outlets,
@@ -13,7 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import Counter
+from collections import Counter, defaultdict
 import os
 import re
 
@@ -24,6 +24,7 @@ from HeavyException import HeavyException
 from HeavyIrObject import HeavyIrObject
 from HIrReceive import HIrReceive
 from HeavyLangObject import HeavyLangObject
+from core.profiler.Profiler import Profiler
 
 class HeavyGraph(HeavyIrObject):
     """ Represents a graph. Subclasses HeavyIrObject for functionality.
@@ -44,6 +45,11 @@ class HeavyGraph(HeavyIrObject):
         # the dictionary of all objects in the graph
         self.objs = {}
 
+        # reverse indexes of self.objs, such that objects can be removed
+        # and found by type without searching the whole graph
+        self.__obj_ids = {} # object -> id
+        self.__objs_for_type = defaultdict(set) # type -> set of objects
+
         # set the local arguments
         self.args = graph_args or {}
 
@@ -65,6 +71,13 @@ class HeavyGraph(HeavyIrObject):
         # a pool of signal buffers for use during signal ordering and buffer assignment
         self.buffer_pool = None
 
+        # the number of temporary signal buffers of each type, after each buffer allocation
+        self.temporary_buffer_counts = {}
+
+        # how the signal objects of all graphs are ordered, see order_signal_objects().
+        # Only the value of the root graph is used.
+        self.signal_ordering = "depth-first"
+
     def resolve_arguments(self, obj_args):
         """ Resolves the object arguments based on values from the local graph.
         """
@@ -157,6 +170,8 @@ class HeavyGraph(HeavyIrObject):
         if obj_id not in self.objs:
             obj.graph = self
             self.objs[obj_id] = obj
+            self.__obj_ids[obj] = obj_id
+            self.__objs_for_type[obj.type].add(obj)
 
             # some object needs to be specially handled when added to the graph
             if obj.type in ["inlet", "__inlet"]:
@@ -276,7 +291,8 @@ class HeavyGraph(HeavyIrObject):
 
     def remove_object(self, o, obj_id=None):
         """ Removes an object and all of its connections from the graph.
-            A custom id for the object to be removed can be given.
+            A custom id for the object to be removed can be given. Otherwise
+            the id under which the object was added is used.
         """
         for connections in o.inlet_connections:
             for c in list(connections): # make copy of connections as it will be mutated
@@ -285,10 +301,10 @@ class HeavyGraph(HeavyIrObject):
             for c in list(connections): # make copy
                 self.disconnect_objects(c)
 
-        for k,v in self.objs.items():
-            if o is v:
-                del self.objs[k]
-                break
+        obj_id = self.__obj_ids.pop(o, obj_id)
+        if obj_id in self.objs and self.objs[obj_id] is o:
+            del self.objs[obj_id]
+            self.__objs_for_type[o.type].discard(o)
 
         if o.type in ["receive", "__receive", "send", "__send"]:
             self.__unregister_named_object(o, o.name)
@@ -309,7 +325,7 @@ class HeavyGraph(HeavyIrObject):
         """
         if recursive:
             channels = set(self.input_channel_set) # copy the output channel set
-            for o in [o for o in self.objs.values() if o.type == "__graph"]:
+            for o in self.__objs_for_type["__graph"]:
                 channels.update(o.get_input_channel_set(recursive=True))
             return channels
         else:
@@ -321,7 +337,7 @@ class HeavyGraph(HeavyIrObject):
         """
         if recursive:
             channels = set(self.output_channel_set) # copy the output channel set
-            for o in [o for o in self.objs.values() if o.type == "__graph"]:
+            for o in self.__objs_for_type["__graph"]:
                 channels.update(o.get_output_channel_set(recursive=True))
             return channels
         else:
@@ -339,12 +355,10 @@ class HeavyGraph(HeavyIrObject):
         """ Returns a list of all objects of a given type in this graph.
             The optional parameter "recursive" also includes all objects from subgraphs.
         """
-        obj_list = []
-        for o in self.objs.values():
-            if o.type == "__graph" and recursive:
+        obj_list = list(self.__objs_for_type[obj_type])
+        if recursive:
+            for o in self.__objs_for_type["__graph"]:
                 obj_list.extend(o.get_objects_for_type(obj_type, recursive))
-            elif o.type == obj_type:
-                obj_list.append(o)
         return obj_list
 
     def get_object_counter(self, recursive=False):
@@ -363,10 +377,22 @@ class HeavyGraph(HeavyIrObject):
                 c[o.type] += 1
         return c
 
-    def prepare(self):
+    def prepare(self, profiler=None, buffer_allocation="greedy", signal_ordering="depth-first"):
         """ Prepares a graph to be exported. Must be called from a root graph.
+            The time and memory of each transformation are recorded by
+            the profiler, if one is given.
+            Signal buffers are allocated either "greedy"-ly by the retain
+            count of each buffer, or by the "liveness" of their values.
+            Signal objects are ordered "depth-first" from each leaf, or such
+            that the "working-set" of live signal buffers stays small.
         """
         assert self.is_root_graph()
+        profiler = profiler or Profiler(enabled=False)
+        if buffer_allocation not in ["greedy", "liveness"]:
+            raise HeavyException("Unknown buffer allocation \"{0}\".".format(buffer_allocation))
+        if signal_ordering not in ["depth-first", "working-set"]:
+            raise HeavyException("Unknown signal ordering \"{0}\".".format(signal_ordering))
+        self.signal_ordering = signal_ordering
 
         try:
             # apply graph transformations when all graphs have been read
@@ -374,40 +400,55 @@ class HeavyGraph(HeavyIrObject):
 
             # resolve all connection types such that all HeavyLang objects can
             # be correctly reduced
-            self._resolve_connection_types()
+            with profiler.measure("_resolve_connection_types"):
+                self._resolve_connection_types()
 
             # TODO(mhroth): prune unnecessary objects and connections
             # All unnecessary objects and connections should be removed before the
             # graph is reduced. Reduction generally takes into account the existence
             # of connections when deciding on what HeavyIR objects to used.
-            self._remove_unused_inlet_connections()
+            with profiler.measure("_remove_unused_inlet_connections"):
+                self._remove_unused_inlet_connections()
 
             # reconnect all send~/receive~ objects and remove them from the graph
-            self.remap_send_receive()
+            with profiler.measure("remap_send_receive"):
+                self.remap_send_receive()
 
             # now that the basic graph has been constructed,
             # objects are reduced to their well-defined low-level types.
             # Some objects may be replaced by graphs containing only low-level objects.
             # The graph is changed in-place and consists of only low-level
             # objects and subgraphs. All invalid connections are pruned.
-            self.reduce()
+            with profiler.measure("reduce"):
+                self.reduce()
 
             # +~~ expansion
             # ensures that there is at most one signal connection at any inlet
-            self.cascade_expansion()
+            with profiler.measure("cascade_expansion"):
+                self.cascade_expansion()
 
             # fma replacement
             # convert [__mul~f ~f> __add~f] into [__fma~f]
-            self.fma_replacement()
+            with profiler.measure("fma_replacement"):
+                self.fma_replacement()
 
             # group all control receivers with the same name under one logical receiver
-            self.group_control_receivers()
+            with profiler.measure("group_control_receivers"):
+                self.group_control_receivers()
 
             # assign signal buffers to signal objects
             # Buffer assignment only takes place at the very end,
             # and does so recursively over all objects and subgraphs.
             # All objects are ordered before buffers are assigned.
-            self.assign_signal_buffers()
+            with profiler.measure("assign_signal_buffers"):
+                self.assign_signal_buffers()
+            self.temporary_buffer_counts["greedy"] = self.get_temporary_buffer_count()
+
+            # reassign the signal buffers based on the live range of each value
+            if buffer_allocation == "liveness":
+                with profiler.measure("reassign_signal_buffers"):
+                    self.reassign_signal_buffers()
+                self.temporary_buffer_counts["liveness"] = self.get_temporary_buffer_count()
         except HeavyException as e:
             e.notes = self.get_notices()
             e.notes["has_error"] = True
@@ -427,7 +468,7 @@ class HeavyGraph(HeavyIrObject):
                     self.disconnect_objects(c)
 
         # the recursive bit
-        for o in [o for o in self.objs.values() if (o.type == "__graph")]:
+        for o in list(self.__objs_for_type["__graph"]):
             o._remove_unused_inlet_connections()
 
     def _resolved_outlet_type(self, outlet_index=0):
@@ -492,51 +533,54 @@ class HeavyGraph(HeavyIrObject):
 
             if len(s_list) == 0:
                 continue # there are no signals going into this send
-            elif len(s_list) == 1:
-                s = s_list[0]
-                c = s.inlet_connections[0][0] # the connection
-
-                ir_var = HeavyIrObject("__var~f")
-                ir_varset = HeavyIrObject("__varwrite~f", {"var_id": ir_var.id})
-                s.graph.add_object(ir_var)
-                s.graph.add_object(ir_varset)
-
-                # move all connection to send object, to ir_varset
-                for c in list(s.inlet_connections[0]):
-                    s.graph.update_connection(c, [c.copy(to_object=ir_varset)])
-
-                # move connections from receivers, to be from __var~f
-                for o in r_list:
-                    ir_varread = HeavyIrObject("__varread~f", {"var_id": ir_var.id})
-                    o.graph.add_object(ir_varread)
-                    for x in list(o.outlet_connections[0]):
-                        o.graph.update_connection(x, [x.copy(from_object=ir_varread)])
-            else:
-                ir_vars = [HeavyIrObject("__var~f") for s in s_list]
-                for i,o in enumerate(s_list):
-                    ir_varset = HeavyIrObject("__varwrite~f", {"var_id": ir_vars[i].id})
-                    o.graph.add_object(ir_vars[i])
-                    o.graph.add_object(ir_varset)
-                    for c in list(o.inlet_connections[0]):
-                        o.graph.update_connection(c, [c.copy(to_object=ir_varset, inlet_index=0)])
-
-                for r in r_list:
-                    ir_add = HeavyIrObject("__add~f")
-                    r.graph.add_object(ir_add)
-
-                    for i,s in enumerate(s_list):
-                        ir_varread = HeavyIrObject("__varread~f", {"var_id": ir_vars[i].id})
-                        r.graph.add_object(ir_varread)
-                        r.graph.connect_objects(Connection(
-                            from_object=ir_varread,
-                            outlet_index=0,
-                            to_object=ir_add,
-                            inlet_index=(0 if i == 0 else 1),
-                            conn_type="~f>"
-                        ))
 
-                    for c in list(r.outlet_connections[0]):
-                        r.graph.update_connection(c, [c.copy(from_object=ir_add)])
+            # ids of the new objects are derived from the send name
+            with HeavyLangObject.id_scope("{0}:send~:{1}".format(self.id, name)):
+                if len(s_list) == 1:
+                    s = s_list[0]
+                    c = s.inlet_connections[0][0] # the connection
+
+                    ir_var = HeavyIrObject("__var~f")
+                    ir_varset = HeavyIrObject("__varwrite~f", {"var_id": ir_var.id})
+                    s.graph.add_object(ir_var)
+                    s.graph.add_object(ir_varset)
+
+                    # move all connection to send object, to ir_varset
+                    for c in list(s.inlet_connections[0]):
+                        s.graph.update_connection(c, [c.copy(to_object=ir_varset)])
+
+                    # move connections from receivers, to be from __var~f
+                    for o in r_list:
+                        ir_varread = HeavyIrObject("__varread~f", {"var_id": ir_var.id})
+                        o.graph.add_object(ir_varread)
+                        for x in list(o.outlet_connections[0]):
+                            o.graph.update_connection(x, [x.copy(from_object=ir_varread)])
+                else:
+                    ir_vars = [HeavyIrObject("__var~f") for s in s_list]
+                    for i,o in enumerate(s_list):
+                        ir_varset = HeavyIrObject("__varwrite~f", {"var_id": ir_vars[i].id})
+                        o.graph.add_object(ir_vars[i])
+                        o.graph.add_object(ir_varset)
+                        for c in list(o.inlet_connections[0]):
+                            o.graph.update_connection(c, [c.copy(to_object=ir_varset, inlet_index=0)])
+
+                    for r in r_list:
+                        ir_add = HeavyIrObject("__add~f")
+                        r.graph.add_object(ir_add)
+
+                        for i,s in enumerate(s_list):
+                            ir_varread = HeavyIrObject("__varread~f", {"var_id": ir_vars[i].id})
+                            r.graph.add_object(ir_varread)
+                            r.graph.connect_objects(Connection(
+                                from_object=ir_varread,
+                                outlet_index=0,
+                                to_object=ir_add,
+                                inlet_index=(0 if i == 0 else 1),
+                                conn_type="~f>"
+                            ))
+
+                        for c in list(r.outlet_connections[0]):
+                            r.graph.update_connection(c, [c.copy(from_object=ir_add)])
 
             # when all is said and done, remove the send and receive objects
             for o in s_list:
@@ -552,13 +596,15 @@ class HeavyGraph(HeavyIrObject):
             graphs contains no sub-graphs. Thus this method does not process subgraphs.
         """
         # refactor all constituent objects
-        for (obj_id, o) in self.objs.items():
-            # use items and not iteritems so that object dictionary remains mutable
+        for o in self.objs.values():
+            # use values and not itervalues so that object dictionary remains mutable
 
             # break the object into atomic (i.e. low-level) objects and
             # update connections. Replace the new representation with the old
             # one in the graph.
-            objects, connections = o.reduce()
+            # The ids of the new objects are derived from the id of the old one.
+            with HeavyLangObject.id_scope(o.id):
+                objects, connections = o.reduce()
 
             # if x is the original object (the case with low-level objects),
             # then no change must be made
@@ -578,8 +624,9 @@ class HeavyGraph(HeavyIrObject):
                 self.update_connection(c[0], c[1])
 
             # remove the old object (and any remaining connections) from the graph
-            self.remove_object(o, obj_id=obj_id)
-            # o.id may not be the same as obj_id if the object comes from an abstraction
+            # o.id may not be the same as its id in the graph if the object
+            # comes from an abstraction
+            self.remove_object(o)
 
         # a graph is reduced in-place and does not change any connections
         return ({self}, [])
@@ -594,39 +641,41 @@ class HeavyGraph(HeavyIrObject):
                 # get all of the signal connections to an object at this inlet
                 cc = [c for c in o.inlet_connections[i] if c.is_signal]
                 if len(cc) > 1:
-                    oL = HeavyIrObject("__add~f")
-                    self.add_object(oL)
-
-                    self.update_connection(
-                        cc[0],
-                        [Connection.copy(cc[0], to_object=oL, inlet_index=0)])
-                    self.update_connection(
-                        cc[1],
-                        [Connection.copy(cc[1], to_object=oL, inlet_index=1)])
-
-                    for j in xrange(2,len(cc)):
-                        x = HeavyIrObject("__add~f")
-                        self.add_object(x)
+                    # ids of the new objects are derived from the object and inlet
+                    with HeavyLangObject.id_scope("{0}:cascade:{1}".format(o.id, i)):
+                        oL = HeavyIrObject("__add~f")
+                        self.add_object(oL)
 
+                        self.update_connection(
+                            cc[0],
+                            [Connection.copy(cc[0], to_object=oL, inlet_index=0)])
+                        self.update_connection(
+                            cc[1],
+                            [Connection.copy(cc[1], to_object=oL, inlet_index=1)])
+
+                        for j in xrange(2,len(cc)):
+                            x = HeavyIrObject("__add~f")
+                            self.add_object(x)
+
+                            self.connect_objects(Connection(
+                                from_object=oL,
+                                outlet_index=0,
+                                to_object=x,
+                                inlet_index=0,
+                                conn_type="~f>"))
+                            self.update_connection(
+                                cc[j],
+                                [Connection.copy(cc[j], to_object=x, inlet_index=1)])
+
+                            oL = x
+
+                        # add a connection from the last +~ to this inlet
                         self.connect_objects(Connection(
                             from_object=oL,
                             outlet_index=0,
-                            to_object=x,
-                            inlet_index=0,
+                            to_object=o,
+                            inlet_index=i,
                             conn_type="~f>"))
-                        self.update_connection(
-                            cc[j],
-                            [Connection.copy(cc[j], to_object=x, inlet_index=1)])
-
-                        oL = x
-
-                    # add a connection from the last +~ to this inlet
-                    self.connect_objects(Connection(
-                        from_object=oL,
-                        outlet_index=0,
-                        to_object=o,
-                        inlet_index=i,
-                        conn_type="~f>"))
 
             if o.type == "__graph":
                 o.cascade_expansion()
@@ -649,7 +698,8 @@ class HeavyGraph(HeavyIrObject):
             len(o.outlet_connections[0][0].to_object.inlet_connections[1]) == 1 and \
             len(o.outlet_connections[0][0].to_object.outlet_connections[0]) > 0:
                 fma_type = "__fma~f" if o.outlet_connections[0][0].to_object.type == "__add~f" else "__fms~f"
-                fma = HeavyIrObject(fma_type)
+                with HeavyLangObject.id_scope("{0}:fma".format(o.id)):
+                    fma = HeavyIrObject(fma_type)
                 self.add_object(fma)
 
                 # move connection to left inlet of fma~
@@ -703,13 +753,14 @@ class HeavyGraph(HeavyIrObject):
                 self.add_error("Conflicting min/max/default values for parameter \"{0}\"".format(name))
 
             # create a new receiver
-            recv = HIrReceive("__receive",
-                args={
-                    "name": name,
-                    "extern": extern[0] if len(extern) > 0 else None,
-                    "attributes": attributes[0] if len(attributes) > 0 else {},
-                },
-                annotations={"scope": scope[0]})
+            with HeavyLangObject.id_scope("{0}:receive:{1}".format(self.id, name)):
+                recv = HIrReceive("__receive",
+                    args={
+                        "name": name,
+                        "extern": extern[0] if len(extern) > 0 else None,
+                        "attributes": attributes[0] if len(attributes) > 0 else {},
+                    },
+                    annotations={"scope": scope[0]})
 
             # add new receiver to the top level graph
             self.add_object(recv)
@@ -742,9 +793,115 @@ class HeavyGraph(HeavyIrObject):
         for o in [o for o in self.objs.values() if o.is_leaf()]:
             self.signal_order.extend(o.get_parent_order())
 
+        if self.get_root_graph().signal_ordering == "working-set":
+            working_set_order = HeavyGraph.__get_working_set_order(self.signal_order)
+            # the depth-first order is kept unless fewer buffers are needed
+            if HeavyGraph.__get_num_buffers(working_set_order) < \
+                    HeavyGraph.__get_num_buffers(self.signal_order):
+                self.signal_order = working_set_order
+
         # retain only objects that process a signal
         self.signal_order = [o for o in self.signal_order if o.does_process_signal]
 
+    @classmethod
+    def __get_working_set_order(clazz, order):
+        """ Reorders a depth-first order of objects such that fewer signal
+            buffers are live at the same time, and each buffer is read soon after
+            it has been written. Like the depth-first order, the parents of each
+            object are ordered before it, but the parent which needs the most
+            buffers to be computed is ordered first (as in Sethi-Ullman
+            numbering). Its result is then live while the other parents are
+            computed, rather than the other way around. Objects which write a
+            table or variable keep their order relative to all other objects
+            which access it, and objects which send messages keep their
+            order relative to each other.
+        """
+        # the parents of each object, without duplicates
+        parents = {o: [] for o in order}
+        for o in order:
+            for c in [c for cc in o.inlet_connections for c in cc]:
+                if c.from_object in parents and c.from_object not in parents[o]:
+                    parents[o].append(c.from_object)
+
+        # the number of buffers needed to compute each object, in depth-first order.
+        # Parents which are only ordered later close a (control) cycle, and are ignored.
+        need = {}
+        for o in order:
+            p_need = sorted([need.get(p, 0) for p in parents[o]], reverse=True)
+            need[o] = max([n+i for i, n in enumerate(p_need)] + [1 if o.does_process_signal else 0])
+
+        # the objects which must be ordered before each object, besides its parents
+        predecessors = defaultdict(list)
+        last_writers = {} # table or variable -> the last object which wrote it
+        readers = defaultdict(list) # table or variable -> the objects which read it since
+        last_sender = None
+        for o in order:
+            for key, is_writer in HeavyGraph.__get_shared_state(o).iteritems():
+                if key in last_writers:
+                    predecessors[o].append(last_writers[key])
+                if is_writer:
+                    predecessors[o].extend(readers.pop(key, []))
+                    last_writers[key] = o
+                else:
+                    readers[key].append(o)
+            if any(c.is_control for cc in o.outlet_connections for c in cc):
+                if last_sender is not None:
+                    predecessors[o].append(last_sender)
+                last_sender = o
+
+        visited = set()
+        working_set_order = []
+        def visit(o):
+            if o not in visited:
+                visited.add(o)
+                for p in predecessors[o]:
+                    visit(p)
+                for p in sorted(parents[o], key=lambda p: need[p], reverse=True):
+                    visit(p)
+                working_set_order.append(o)
+
+        # the leaves which need the most buffers are also ordered first
+        for o in sorted([o for o in order if o.is_leaf()], key=lambda o: need[o], reverse=True):
+            visit(o)
+        return working_set_order
+
+    @classmethod
+    def __get_shared_state(clazz, o):
+        """ Returns the tables and variables which an object or any object of
+            a graph accesses, and whether it writes them, {key: is_writer}.
+        """
+        if o.type == "__graph":
+            shared_state = {}
+            for x in o.objs.values():
+                for key, is_writer in HeavyGraph.__get_shared_state(x).iteritems():
+                    shared_state[key] = shared_state.get(key, False) or is_writer
+            return shared_state
+        else:
+            is_writer = "write" in o.type
+            return {(k, str(o.args[k])): is_writer for k in ["table", "var_id"] if k in o.args}
+
+    @classmethod
+    def __get_num_buffers(clazz, order):
+        """ Returns the number of signal buffers which the greedy buffer
+            allocation needs for the objects of one graph in the given order,
+            without the buffers needed inside of any subgraphs.
+        """
+        buffer_pool = BufferPool()
+        buffers = {} # (object, outlet index) -> buffer
+        for o in [o for o in order if o.does_process_signal]:
+            for c in [c for cc in o.inlet_connections for c in cc]:
+                if c.is_signal and (c.from_object, c.outlet_index) in buffers:
+                    buffer_pool.release_buffer(buffers[(c.from_object, c.outlet_index)])
+            exclude_set = set()
+            for i in xrange(o.num_outlets):
+                connection_type = o._resolved_outlet_type(outlet_index=i)
+                if Connection.is_signal_type(connection_type):
+                    b = buffer_pool.get_buffer(connection_type, len(o.outlet_connections[i]), exclude_set)
+                    buffers[(o, i)] = b
+                    if len(o.outlet_connections[i]) == 0:
+                        exclude_set.add(b)
+        return buffer_pool.num_buffers()
+
     def assign_signal_buffers(self, buffer_pool=None):
         self.buffer_pool = buffer_pool or BufferPool() # the top-level graph owns the buffer pool
 
@@ -795,6 +952,73 @@ class HeavyGraph(HeavyIrObject):
                     outlet_obj.graph.file,
                     len(c_list)))
 
+    def get_signal_objects(self):
+        """ Returns all signal objects of this graph and its subgraphs, in the
+            order in which they are processed.
+        """
+        signal_objects = []
+        for o in self.signal_order:
+            if o.type == "__graph":
+                signal_objects.extend(o.get_signal_objects())
+            else:
+                signal_objects.append(o)
+        return signal_objects
+
+    def reassign_signal_buffers(self):
+        """ Reassigns the signal buffers of all signal objects, once they have
+            been assigned by assign_signal_buffers(). The retain count of each
+            buffer is the number of times that its value is actually read,
+            instead of the number of its connections. A buffer is thereby
+            reused as soon as its value has been read for the last time,
+            even if the value also leaves a graph through an unconnected
+            outlet. The most recently freed buffer is still reused first,
+            such that the assignment is otherwise unchanged.
+            Must be called from a root graph. Only the buffers of signal
+            objects are reassigned, the buffers of graph inlets and outlets are not.
+        """
+        assert self.is_root_graph()
+        signal_objects = self.get_signal_objects()
+
+        # the live range of a value is from the object that writes it to the
+        # last object that reads it. Values are identified by their outlet.
+        num_reads = {} # (object, outlet index) -> number of reads
+        values = {} # (object, inlet index) -> (object, outlet index)
+        writers = {} # buffer -> (object, outlet index) of its current value
+        for o in signal_objects:
+            for i, b in enumerate(o.inlet_buffers):
+                if b in writers:
+                    values[(o, i)] = writers[b]
+                    num_reads[writers[b]] += 1
+            for i, b in enumerate(o.outlet_buffers):
+                if b[0] in ["~f>", "~i>"]:
+                    writers[b] = (o, i)
+                    num_reads[(o, i)] = 0
+
+        self.buffer_pool = BufferPool()
+        buffers = {} # (object, outlet index) -> reassigned buffer
+        for o in signal_objects:
+            for i in xrange(len(o.inlet_buffers)):
+                if (o, i) in values:
+                    o.inlet_buffers[i] = buffers[values[(o, i)]]
+                    self.buffer_pool.release_buffer(o.inlet_buffers[i])
+
+            # all outlets have independent buffers, see HeavyIrObject.assign_signal_buffers()
+            exclude_set = set()
+            for i, b in enumerate(o.outlet_buffers):
+                if (o, i) in num_reads:
+                    b = self.buffer_pool.get_buffer(b[0], num_reads[(o, i)], exclude_set)
+                    o.outlet_buffers[i] = buffers[(o, i)] = b
+                    if num_reads[(o, i)] == 0:
+                        exclude_set.add(b)
+
+    def get_temporary_buffer_count(self):
+        """ Returns the number of temporary signal buffers of each type.
+        """
+        return {
+            "float": self.buffer_pool.num_buffers("~f>"),
+            "integer": self.buffer_pool.num_buffers("~i>")
+        }
+
     def __repr__(self):
         if self.xname is not None:
             # TODO(mhroth): does not handle nested subgraph
@@ -836,10 +1060,7 @@ class HeavyGraph(HeavyIrObject):
             "signal": {
                 "numInputBuffers": max(input_channel_set) if len(input_channel_set) > 0 else 0,
                 "numOutputBuffers": max(output_channel_set) if len(output_channel_set) > 0 else 0,
-                "numTemporaryBuffers": {
-                    "float": self.buffer_pool.num_buffers("~f>"),
-                    "integer": self.buffer_pool.num_buffers("~i>")
-                },
+                "numTemporaryBuffers": self.get_temporary_buffer_count(),
                 "processOrder": self.get_ir_signal_list()
             }
         }
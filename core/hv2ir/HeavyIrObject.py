@@ -26,16 +26,27 @@ class HeavyIrObject(HeavyLangObject):
         the file heavy.ir.json.
     """
 
-    # load the HeavyIR object definitions
-    with open(os.path.join(os.path.dirname(__file__), "../json/heavy.ir.json"), "r") as f:
-        __HEAVY_OBJS_IR_DICT = json.load(f)
+    __slots__ = ("inlet_buffers", "outlet_buffers", "__is_ordered")
+
+    # the HeavyIR object definitions, loaded on first use
+    __HEAVY_OBJS_IR_DICT = None
+
+    @classmethod
+    def __get_heavy_objs_ir_dict(clazz):
+        """ Returns the HeavyIR object definitions, which are only read the
+            first time that they are needed.
+        """
+        if HeavyIrObject.__HEAVY_OBJS_IR_DICT is None:
+            with open(os.path.join(os.path.dirname(__file__), "../json/heavy.ir.json"), "r") as f:
+                HeavyIrObject.__HEAVY_OBJS_IR_DICT = json.load(f)
+        return HeavyIrObject.__HEAVY_OBJS_IR_DICT
 
     def __init__(self, obj_type, args=None, graph=None, num_inlets=-1, num_outlets=-1, annotations=None):
         # allow the number of inlets and outlets to be overridden
-        num_inlets = len(HeavyIrObject.__HEAVY_OBJS_IR_DICT[obj_type]["inlets"]) \
+        num_inlets = len(HeavyIrObject.__get_heavy_objs_ir_dict()[obj_type]["inlets"]) \
         if num_inlets < 0 else num_inlets
 
-        num_outlets = len(HeavyIrObject.__HEAVY_OBJS_IR_DICT[obj_type]["outlets"]) \
+        num_outlets = len(HeavyIrObject.__get_heavy_objs_ir_dict()[obj_type]["outlets"]) \
         if num_outlets < 0 else num_outlets
 
         HeavyLangObject.__init__(self, obj_type, args, graph, num_inlets, num_outlets, annotations)
@@ -55,7 +66,7 @@ class HeavyIrObject(HeavyLangObject):
         """ Resolves missing default arguments. Also checks to make sure that all
             required arguments are present.
         """
-        if self.type in HeavyIrObject.__HEAVY_OBJS_IR_DICT:
+        if self.type in HeavyIrObject.__get_heavy_objs_ir_dict():
             for arg in self.__obj_desc.get("args", []):
                 if arg["name"] not in self.args:
                     # if a defined argument is not in the argument dictionary
@@ -79,7 +90,7 @@ class HeavyIrObject(HeavyLangObject):
     def is_ir(clazz, obj_type):
         """Returns true if the type is an IR object. False otherwise.
         """
-        return obj_type in HeavyIrObject.__HEAVY_OBJS_IR_DICT
+        return obj_type in HeavyIrObject.__get_heavy_objs_ir_dict()
 
     @property
     def does_process_signal(self):
@@ -91,7 +102,7 @@ class HeavyIrObject(HeavyLangObject):
     def __obj_desc(self):
         """ Returns the original HeavyIR object description.
         """
-        return HeavyIrObject.__HEAVY_OBJS_IR_DICT[self.type]
+        return HeavyIrObject.__get_heavy_objs_ir_dict()[self.type]
 
     def inlet_requires_signal(self, inlet_index=0):
         """ Returns True if the indexed inlet requires a signal connection. False otherwise.
@@ -13,7 +13,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import decimal
+import hashlib
 import json
 import os
 import random
@@ -21,24 +23,49 @@ from struct import *
 import string
 
 from core.hv2ir.HeavyException import HeavyException
+from core.tables.TableValues import TableValues
 
-class HeavyLangObject:
+class HeavyLangObject(object):
     """ This is the base Heavy object class.
+        The attributes of all objects are slots, as large graphs have many
+        objects. Subclasses which add attributes have a __dict__.
     """
 
-    __RANDOM = random.Random()
+    __slots__ = (
+        "type", "id", "graph", "args", "annotations", "warnings", "errors",
+        "inlet_connections", "outlet_connections")
+
+    # all objects of a type share the same type string, {type: type}
+    __TYPES = {}
+
+    # the annotations of all objects without annotations. This is never modified.
+    __NO_ANNOTATIONS = {}
+
     __ID_CHARS = string.ascii_letters + string.digits
 
-    # load the Heavy object definitions
-    with open(os.path.join(os.path.dirname(__file__), "../json/heavy.lang.json"), "r") as f:
-        _HEAVY_LANG_DICT = json.load(f)
+    # the stack of scopes in which object ids are generated,
+    # each entry is a list of [scope name, number of ids generated]
+    __ID_SCOPES = [["", 0]]
+
+    # the Heavy object definitions, loaded on first use
+    __HEAVY_LANG_DICT = None
+
+    @classmethod
+    def _get_heavy_lang_dict(clazz):
+        """ Returns the Heavy object definitions, which are only read the
+            first time that they are needed.
+        """
+        if HeavyLangObject.__HEAVY_LANG_DICT is None:
+            with open(os.path.join(os.path.dirname(__file__), "../json/heavy.lang.json"), "r") as f:
+                HeavyLangObject.__HEAVY_LANG_DICT = json.load(f)
+        return HeavyLangObject.__HEAVY_LANG_DICT
 
     def __init__(self, obj_type, args=None, graph=None, num_inlets=-1, num_outlets=-1, annotations=None):
         # set the object type
-        self.type = obj_type
+        self.type = HeavyLangObject.__TYPES.setdefault(obj_type, obj_type)
 
         # generate a unique id for this object
-        self.id = "".join(HeavyLangObject.__RANDOM.choice(HeavyLangObject.__ID_CHARS) for _ in xrange(8))
+        self.id = HeavyLangObject.__get_next_id()
 
         # assign the parent graph
         self.graph = graph
@@ -47,11 +74,12 @@ class HeavyLangObject:
         self.args = args or {}
 
         # set local annotations
-        self.annotations = annotations or {}
+        self.annotations = annotations or HeavyLangObject.__NO_ANNOTATIONS
 
-        # a list of locally generated warnings and errors (notifications)
-        self.warnings = []
-        self.errors = []
+        # a list of locally generated warnings and errors (notifications).
+        # The lists are only created once there is a notification.
+        self.warnings = ()
+        self.errors = ()
 
         # resolve arguments and fill in missing defaults for HeavyLang objects
         self.__resolve_default_lang_args()
@@ -64,6 +92,36 @@ class HeavyLangObject:
         num_outlets = num_outlets if num_outlets >= 0 else len(self._obj_desc["outlets"])
         self.outlet_connections = [[] for _ in xrange(num_outlets)]
 
+    @classmethod
+    @contextlib.contextmanager
+    def id_scope(clazz, scope):
+        """ All objects created in this context get ids derived from the given
+            scope name, and the order in which they are created within it.
+            Scopes should be named after something stable in the patch (such as
+            the id of a parent object), such that ids do not change when
+            unrelated parts of the patch change.
+        """
+        clazz.__ID_SCOPES.append([scope, 0])
+        try:
+            yield
+        finally:
+            clazz.__ID_SCOPES.pop()
+
+    @classmethod
+    def __get_next_id(clazz):
+        """ Returns a deterministic 8 character id from the current id scope.
+        """
+        scope = clazz.__ID_SCOPES[-1]
+        digest = hashlib.md5("{0}#{1}".format(scope[0], scope[1])).digest()
+        scope[1] += 1
+        return "".join(clazz.__ID_CHARS[ord(c) % len(clazz.__ID_CHARS)] for c in digest[:8])
+
+    def get_random(self):
+        """ Returns a random number generator seeded from the object id,
+            such that an object always produces the same random values.
+        """
+        return random.Random(int(hashlib.md5(self.id).hexdigest(), 16))
+
     @property
     def scope(self):
         """ Returns the scope of this object, private by default.
@@ -93,7 +151,7 @@ class HeavyLangObject:
     def _obj_desc(self):
         """ Returns the HeavyLang object description.
         """
-        return HeavyLangObject._HEAVY_LANG_DICT[self.type]
+        return HeavyLangObject._get_heavy_lang_dict()[self.type]
 
     def inlet_connection_type(self, index):
         return self._obj_desc["inlets"][index]
@@ -109,11 +167,15 @@ class HeavyLangObject:
     def add_warning(self, warning):
         """ Add a warning to this object.
         """
+        if not self.warnings:
+            self.warnings = []
         self.warnings.append({"message": warning})
 
     def add_error(self, error):
         """ Add an error to this object and raise an exception.
         """
+        if not self.errors:
+            self.errors = []
         self.errors.append({"message": error})
         raise HeavyException(error)
 
@@ -145,6 +207,8 @@ class HeavyLangObject:
             else:
                 return bool(value)
         elif value_type == "floatarray":
+            if TableValues.is_values(value):
+                return value # table values are already floats
             if isinstance(value, list):
                 return [float(v) for v in value]
             if isinstance(value, str) or isinstance(value, unicode):
@@ -178,7 +242,7 @@ class HeavyLangObject:
         """ Resolves missing default arguments. Also checks to make sure that all
             required arguments are present. Does nothing if the object is IR.
         """
-        if self.type in HeavyLangObject._HEAVY_LANG_DICT:
+        if self.type in HeavyLangObject._get_heavy_lang_dict():
             for arg in self._obj_desc["args"]:
                 if arg["name"] not in self.args:
                     # if a defined argument is not in the argument dictionary
@@ -395,3 +459,8 @@ class HeavyLangObject:
     def __repr__(self):
         arg_str = " ".join(["{0}:{1}".format(k, o) for (k,o) in self.args.iteritems()])
         return "{0} {{{1}}}".format(self.type, arg_str) if len(arg_str) > 0 else self.type
+
+    def __hash__(self):
+        # objects are hashed by id (rather than by memory address),
+        # such that sets of objects are iterated in a reproducible order
+        return hash(self.id)
@@ -13,7 +13,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import json
 import os
 
 from HIrConvolution import HIrConvolution
@@ -52,6 +51,8 @@ from HLangVario import HLangVario
 from HeavyGraph import HeavyGraph
 from Connection import Connection
 
+from core.tables.TableValues import TableValues
+
 class HeavyParser:
 
     @classmethod
@@ -76,9 +77,8 @@ class HeavyParser:
         else:
             path_stack.add(hv_file)
 
-        # open and parse the heavy file
-        with open(hv_file, "r") as f:
-            json_heavy = json.load(f)
+        # open and parse the heavy file, and any table values in its sidecar file
+        json_heavy = TableValues.load(hv_file)
 
         return HeavyParser.graph_from_object(json_heavy, graph, graph_args, hv_file, path_stack, xname)
 
@@ -117,45 +117,49 @@ class HeavyParser:
         # instantiate all objects
         try:
             for obj_id, o in json_heavy["objects"].iteritems():
-                if o["type"] == "comment":
-                    continue # first and foremost, ignore comment objects
-
-                elif o["type"] == "graph":
-                    # inline HeavyGraph objects (i.e. subgraphs)
-                    # require a different set of initialisation arguments
-                    x = HeavyParser.graph_from_object(o, g, g.args, hv_file, path_stack, xname)
+                # ids of all objects created for this object are derived from
+                # its id in the graph, such that they are stable if other
+                # objects are added to or removed from the patch
+                with HeavyLangObject.id_scope("{0}/{1}".format(g.id, obj_id)):
+                    if o["type"] == "comment":
+                        continue # first and foremost, ignore comment objects
+
+                    elif o["type"] == "graph":
+                        # inline HeavyGraph objects (i.e. subgraphs)
+                        # require a different set of initialisation arguments
+                        x = HeavyParser.graph_from_object(o, g, g.args, hv_file, path_stack, xname)
 
-                else:
-                    # resolve the arguments dictionary based on the graph args
-                    args = g.resolve_arguments(o["args"])
-
-                    # before anything, search for an abstraction
-                    # in case we want to override default functionality
-                    # However, if we are in an abstraction that has the same
-                    # name as the type that we are looking for, don't recurse!
-                    abs_path = g.find_path_for_abstraction(o["type"])
-                    if abs_path is not None and abs_path not in path_stack:
-                        x = HeavyParser.graph_from_file(
-                            hv_file=abs_path,
-                            graph=g,
-                            graph_args=args,
-                            path_stack=path_stack)
-
-                    # if we know how to handle this object type natively
-                    # either as a custom type or as a generic IR object
-                    elif HeavyParser.get_class_for_type(o["type"]) is not None:
-                        obj_clazz = HeavyParser.get_class_for_type(o["type"])
-                        x = obj_clazz(o["type"], args, g, o.get("annotations", {}))
-
-                    # handle generic IR objects
-                    elif HeavyIrObject.is_ir(o["type"]):
-                        x = HeavyIrObject(o["type"], args, g, annotations=o.get("annotations", {}))
-
-                    # an object definition can't be found
                     else:
-                        g.add_error("Object type \"{0}\" cannot be found.".format(o["type"]))
-                        # note that add_error() raises an exception. So really, there is no continue.
-                        continue
+                        # resolve the arguments dictionary based on the graph args
+                        args = g.resolve_arguments(o["args"])
+
+                        # before anything, search for an abstraction
+                        # in case we want to override default functionality
+                        # However, if we are in an abstraction that has the same
+                        # name as the type that we are looking for, don't recurse!
+                        abs_path = g.find_path_for_abstraction(o["type"])
+                        if abs_path is not None and abs_path not in path_stack:
+                            x = HeavyParser.graph_from_file(
+                                hv_file=abs_path,
+                                graph=g,
+                                graph_args=args,
+                                path_stack=path_stack)
+
+                        # if we know how to handle this object type natively
+                        # either as a custom type or as a generic IR object
+                        elif HeavyParser.get_class_for_type(o["type"]) is not None:
+                            obj_clazz = HeavyParser.get_class_for_type(o["type"])
+                            x = obj_clazz(o["type"], args, g, o.get("annotations", {}))
+
+                        # handle generic IR objects
+                        elif HeavyIrObject.is_ir(o["type"]):
+                            x = HeavyIrObject(o["type"], args, g, annotations=o.get("annotations", {}))
+
+                        # an object definition can't be found
+                        else:
+                            g.add_error("Object type \"{0}\" cannot be found.".format(o["type"]))
+                            # note that add_error() raises an exception. So really, there is no continue.
+                            continue
 
                 # add the new object to the graph's object dictionary
                 g.add_object(x, obj_id)
@@ -14,31 +14,56 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import argparse
-import json
 import os
 import time
 
 from HeavyException import HeavyException
+from HeavyLangObject import HeavyLangObject
 from HeavyParser import HeavyParser
+from core.profiler.Profiler import Profiler
+from core.tables.TableValues import TableValues
 
 class hv2ir:
 
     @classmethod
-    def compile(clazz, hv_file, ir_file, patch_name=None, verbose=False):
+    def compile(clazz, hv_file, ir_file, patch_name=None, verbose=False, hv_json=None, profiler=None,
+            buffer_allocation="greedy", signal_ordering="depth-first"):
         """ Compiles a HeavyLang file into a HeavyIR file.
             Returns a tuple of compile time in seconds, a notification dictionary,
             and a heavy object counter.
+            If hv_json is given, the HeavyLang graph is taken from it directly
+            and hv_file is not read. It is then only used to resolve relative
+            abstraction paths. If ir_file is None, the HeavyIR is not written
+            and is only returned in the results.
+            If a profiler is given, it records the parsing, each graph
+            transformation and the IR generation.
+            Signal buffers are allocated "greedy"-ly or by "liveness". The
+            number of temporary buffers after each allocation is returned in
+            the results. Signal objects are ordered "depth-first" or by
+            "working-set", see HeavyGraph.order_signal_objects().
         """
 
         # keep track of the total compile time
         tick = time.time()
+        profiler = profiler or Profiler(enabled=False)
 
         hv_file = os.path.abspath(os.path.expanduser(hv_file))
-        ir_file = os.path.abspath(os.path.expanduser(ir_file))
+        if ir_file is not None:
+            ir_file = os.path.abspath(os.path.expanduser(ir_file))
 
         try:
             # parse heavy file
-            hv_graph = HeavyParser.graph_from_file(hv_file=hv_file, xname=patch_name)
+            # object ids are generated in a new scope for every compile,
+            # such that the same patch always results in the same ids
+            with HeavyLangObject.id_scope(""), profiler.measure("parse"):
+                if hv_json is not None:
+                    hv_graph = HeavyParser.graph_from_object(
+                        hv_json,
+                        hv_file=hv_file,
+                        path_stack={hv_file},
+                        xname=patch_name)
+                else:
+                    hv_graph = HeavyParser.graph_from_file(hv_file=hv_file, xname=patch_name)
         except HeavyException as e:
             return {
                 "stage": "hv2ir",
@@ -52,8 +77,8 @@ class hv2ir:
                 "obj_counter": None,
                 "in_file": os.path.basename(hv_file),
                 "in_dir": os.path.dirname(hv_file),
-                "out_file": os.path.basename(ir_file),
-                "out_dir": os.path.dirname(ir_file)
+                "out_file": os.path.basename(ir_file) if ir_file else None,
+                "out_dir": os.path.dirname(ir_file) if ir_file else None
             }
 
         try:
@@ -61,14 +86,18 @@ class hv2ir:
             hv_counter = hv_graph.get_object_counter(recursive=True)
 
             # prepare the graph for exporting
-            hv_graph.prepare()
+            with profiler.measure("prepare"):
+                hv_graph.prepare(profiler,
+                    buffer_allocation=buffer_allocation,
+                    signal_ordering=signal_ordering)
 
             # ensure that the output directory exists
-            if not os.path.exists(os.path.dirname(ir_file)):
+            if ir_file is not None and not os.path.exists(os.path.dirname(ir_file)):
                 os.makedirs(os.path.dirname(ir_file))
 
             # generate Heavy.IR
-            ir = hv_graph.to_ir()
+            with profiler.measure("to_ir"):
+                ir = hv_graph.to_ir()
         except HeavyException as e:
             return {
                 "stage": "hv2ir",
@@ -82,21 +111,21 @@ class hv2ir:
                 "obj_counter": hv_counter,
                 "in_file": os.path.basename(hv_file),
                 "in_dir": os.path.dirname(hv_file),
-                "out_file": os.path.basename(ir_file),
-                "out_dir": os.path.dirname(ir_file)
+                "out_file": os.path.basename(ir_file) if ir_file else None,
+                "out_dir": os.path.dirname(ir_file) if ir_file else None
             }
 
-        # write the hv.ir file
-        with open(ir_file, "w") as f:
+        # write the hv.ir file, table values are written to a binary sidecar file
+        if ir_file is not None:
             if verbose:
-                json.dump(
+                TableValues.dump(
                     ir,
-                    f,
+                    ir_file,
                     sort_keys=True,
                     indent=2,
                     separators=(",", ": "))
             else:
-                json.dump(ir, f)
+                TableValues.dump(ir, ir_file)
 
         if verbose:
             if len(ir["signal"]["processOrder"]) > 0:
@@ -116,10 +145,11 @@ class hv2ir:
             "compile_time": time.time()-tick, # record the total compile time
             "notifs": hv_graph.get_notices(),
             "obj_counter": hv_counter,
+            "temporary_buffers": hv_graph.temporary_buffer_counts,
             "in_file": os.path.basename(hv_file),
             "in_dir": os.path.dirname(hv_file),
-            "out_file": os.path.basename(ir_file),
-            "out_dir": os.path.dirname(ir_file),
+            "out_file": os.path.basename(ir_file) if ir_file else None,
+            "out_dir": os.path.dirname(ir_file) if ir_file else None,
             "ir": ir
         }
 
@@ -137,6 +167,16 @@ def main():
         "--name",
         default="heavy",
         help="")
+    parser.add_argument(
+        "--buffer-allocation",
+        choices=["greedy", "liveness"],
+        default="greedy",
+        help="How signal buffers are allocated. liveness reuses a buffer as soon as its value has been read for the last time.")
+    parser.add_argument(
+        "--signal-ordering",
+        choices=["depth-first", "working-set"],
+        default="depth-first",
+        help="How signal objects are ordered. working-set keeps fewer signal buffers live at the same time.")
     parser.add_argument("-v", "--verbose", action="count")
     args = parser.parse_args()
 
@@ -144,7 +184,9 @@ def main():
         hv_file=args.hv_path,
         ir_file=args.hv_ir_path,
         patch_name=args.name,
-        verbose=args.verbose)
+        verbose=args.verbose,
+        buffer_allocation=args.buffer_allocation,
+        signal_ordering=args.signal_ordering)
 
     if args.verbose:
         print "Total hv2ir time: {0:.2f}ms".format(d["compile_time"]*1000)
@@ -0,0 +1,102 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import cProfile
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None # not available on Windows, memory is then not reported
+
+class Profiler:
+    """ Records the wall time and peak memory of nested sections of the
+        compiler, such as stages, graph passes and generators.
+        A disabled profiler records nothing, such that it can always be passed
+        along.
+    """
+
+    def __init__(self, enabled=True, cprofile=False):
+        self.enabled = enabled
+        self.records = []
+        self.__depth = 0
+        self.__cprofile = cProfile.Profile() if (enabled and cprofile) else None
+
+    @classmethod
+    def get_peak_memory(clazz):
+        """ Returns the peak resident memory of this process in bytes,
+            or None if it is not available.
+        """
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes on Linux
+        return max_rss if sys.platform == "darwin" else 1024 * max_rss
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """ Records the wall time of a section, the peak memory of the process
+            at its end, and by how much the section increased it.
+            Sections may be nested.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        record = {"name": name, "depth": self.__depth}
+        self.records.append(record)
+        if self.__depth == 0 and self.__cprofile is not None:
+            self.__cprofile.enable()
+        self.__depth += 1
+        peak_memory = Profiler.get_peak_memory()
+        tick = time.time()
+        try:
+            yield
+        finally:
+            record["time"] = time.time() - tick
+            record["peak_memory"] = Profiler.get_peak_memory()
+            record["peak_memory_increase"] = (record["peak_memory"] - peak_memory) \
+                if peak_memory is not None else None
+            self.__depth -= 1
+            if self.__depth == 0 and self.__cprofile is not None:
+                self.__cprofile.disable()
+
+    def add_records(self, records):
+        """ Adds the records of another profiler (e.g. from a worker process)
+            as sections of the current one.
+        """
+        for r in records:
+            self.records.append(dict(r, depth=r["depth"] + self.__depth))
+
+    def dump_cprofile(self, path):
+        """ Writes the cProfile statistics of all top-level sections to a file,
+            which can be read with the pstats module.
+        """
+        self.__cprofile.dump_stats(path)
+
+    @classmethod
+    def print_records(clazz, records):
+        print "{0:<40} {1:>12} {2:>12} {3:>12}".format(
+            "section", "time (ms)", "peak (MB)", "+peak (MB)")
+        for r in records:
+            print "{0:<40} {1:>12.2f} {2:>12} {3:>12}".format(
+                "  " * r["depth"] + r["name"],
+                1000 * r["time"],
+                "{0:.1f}".format(r["peak_memory"] / 1048576.0) \
+                    if r["peak_memory"] is not None else "-",
+                "{0:.1f}".format(r["peak_memory_increase"] / 1048576.0) \
+                    if r["peak_memory_increase"] is not None else "-")
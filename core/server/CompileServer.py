@@ -0,0 +1,208 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+import json
+import os
+import socket
+import SocketServer
+import sys
+import traceback
+
+from core.tables.TableValues import TableValues
+
+class CompileServer:
+    """ A long-running compile server. Requests are JSON-RPC 2.0 messages, one
+        per line, read from a local UNIX socket or from stdin. Because the
+        process stays alive, the loaded object definitions, template
+        environments and any other per-process state are reused across all
+        requests. Requests are handled one at a time.
+
+        Supported methods:
+            compile(params): calls compile_fn(**params) and returns its results.
+            ping(): returns "pong".
+            shutdown(): stops the server after responding.
+    """
+
+    # JSON-RPC 2.0 error codes
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INTERNAL_ERROR = -32603
+
+    def __init__(self, compile_fn, defaults=None):
+        self.compile_fn = compile_fn
+        self.defaults = defaults or {}
+        self.num_requests = 0
+        self.__is_running = False
+
+    def is_running(self):
+        return self.__is_running
+
+    def handle_message(self, line):
+        """ Handles a single JSON-RPC request and returns the response message,
+            or None if the request was a notification (i.e. had no id).
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self.__error(None, CompileServer.PARSE_ERROR, str(e))
+
+        if not isinstance(request, dict) or "method" not in request:
+            return self.__error(None, CompileServer.INVALID_REQUEST, "Invalid request.")
+
+        request_id = request.get("id", None)
+        method = request["method"]
+        params = request.get("params", None) or {}
+        self.num_requests += 1
+
+        if method == "compile":
+            try:
+                result = self.__compile(params)
+            except Exception as e:
+                traceback.print_exc(file=sys.stderr)
+                return self.__error(request_id, CompileServer.INTERNAL_ERROR, str(e))
+        elif method == "ping":
+            result = "pong"
+        elif method == "shutdown":
+            self.__is_running = False
+            result = None
+        else:
+            return self.__error(request_id, CompileServer.METHOD_NOT_FOUND,
+                "Unknown method \"{0}\".".format(method))
+
+        if request_id is None:
+            return None
+        return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result},
+            default=TableValues.to_list)
+
+    def __compile(self, params):
+        kwargs = dict(self.defaults)
+        kwargs.update(params)
+        results = self.compile_fn(**kwargs)
+
+        # exceptions are reported as strings, such that the results can be JSONified
+        for r in results.values():
+            if r["notifs"].get("exception", None) is not None:
+                r["notifs"]["exception"] = str(r["notifs"]["exception"])
+        return results
+
+    def __error(self, request_id, code, message):
+        return json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": code, "message": message}
+        })
+
+    def serve_stdio(self, stdin=None, stdout=None):
+        """ Serves requests from stdin until it is closed, or until a shutdown
+            request. Anything printed while compiling is redirected to stderr,
+            such that stdout only carries responses.
+        """
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        sys_stdout = sys.stdout
+        sys.stdout = sys.stderr
+        self.__is_running = True
+        try:
+            while self.__is_running:
+                line = stdin.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = self.handle_message(line)
+                if response is not None:
+                    stdout.write(response + "\n")
+                    stdout.flush()
+        finally:
+            sys.stdout = sys_stdout
+            self.__is_running = False
+
+    def serve_socket(self, socket_path):
+        """ Serves requests on a UNIX socket until a shutdown request. Each
+            connection may send any number of requests.
+        """
+        server = self
+
+        class Handler(SocketServer.StreamRequestHandler):
+            def handle(self):
+                while server.is_running():
+                    line = self.rfile.readline()
+                    if not line:
+                        break
+                    if not line.strip():
+                        continue
+                    response = server.handle_message(line)
+                    if response is not None:
+                        self.wfile.write(response + "\n")
+                        self.wfile.flush()
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path) # a stale socket from a previous server
+        unix_server = SocketServer.UnixStreamServer(socket_path, Handler)
+        self.__is_running = True
+        try:
+            while self.__is_running:
+                unix_server.handle_request()
+        finally:
+            unix_server.server_close()
+            self.__is_running = False
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+
+class CompileClient:
+    """ A client of a CompileServer listening on a local UNIX socket.
+    """
+
+    def __init__(self, socket_path):
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(socket_path)
+        self.__file = self.__socket.makefile("rw")
+        self.__next_id = 0
+
+    def call(self, method, params=None):
+        """ Sends a request and returns its result. A RuntimeError is raised
+            if the server responds with an error.
+        """
+        self.__next_id += 1
+        self.__file.write(json.dumps({
+            "jsonrpc": "2.0",
+            "id": self.__next_id,
+            "method": method,
+            "params": params or {}
+        }) + "\n")
+        self.__file.flush()
+
+        line = self.__file.readline()
+        if not line:
+            raise RuntimeError("The compile server closed the connection.")
+        response = json.loads(line, object_pairs_hook=OrderedDict)
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response["result"]
+
+    def compile(self, **kwargs):
+        """ Compiles a patch on the server. The arguments are the same as
+            those of hvcc.compile_dataflow().
+        """
+        return self.call("compile", kwargs)
+
+    def shutdown(self):
+        self.call("shutdown")
+
+    def close(self):
+        self.__file.close()
+        self.__socket.close()
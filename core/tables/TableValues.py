@@ -0,0 +1,130 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import array
+import hashlib
+import json
+import os
+import sys
+
+class TableValues:
+    """ The preset values of tables are kept in compact arrays of 32-bit floats
+        (the sample type of the generated code), from parsing through to code
+        generation. When a HeavyLang or HeavyIR graph is written as JSON, all
+        table values are written to a binary sidecar file next to it. The JSON
+        then only refers to them, e.g.
+        {"sidecar": "heavy.hv.tables", "offset": 0, "length": 1024}
+        where offset and length are counted in values.
+    """
+
+    # the array typecode of table values
+    TYPECODE = "f"
+
+    # the number of bytes per value in a sidecar file (little-endian)
+    __ITEM_SIZE = 4
+
+    @classmethod
+    def new(clazz, values=None):
+        """ Returns a new array of table values, initialised from an iterable.
+        """
+        return array.array(TableValues.TYPECODE, values or [])
+
+    @classmethod
+    def is_values(clazz, x):
+        return isinstance(x, array.array)
+
+    @classmethod
+    def get_sidecar_path(clazz, json_path):
+        """ Returns the path of the sidecar file of a JSON file,
+            e.g. heavy.hv.json -> heavy.hv.tables
+        """
+        return os.path.splitext(json_path)[0] + ".tables"
+
+    @classmethod
+    def dump(clazz, obj, json_path, **kwargs):
+        """ Writes an object as JSON to the given path. All table values in it
+            are written to the sidecar file, which is removed if there are none.
+            Any further arguments are passed on to json.dump().
+        """
+        sidecar_path = TableValues.get_sidecar_path(json_path)
+        sidecar_name = os.path.basename(sidecar_path)
+        with open(sidecar_path, "wb") as f_sidecar:
+            def default(x):
+                if not TableValues.is_values(x):
+                    raise TypeError("{0} is not JSON serializable".format(repr(x)))
+                ref = {
+                    "sidecar": sidecar_name,
+                    "offset": f_sidecar.tell() / TableValues.__ITEM_SIZE,
+                    "length": len(x)
+                }
+                if sys.byteorder == "big":
+                    x = array.array(TableValues.TYPECODE, x)
+                    x.byteswap()
+                x.tofile(f_sidecar)
+                return ref
+
+            with open(json_path, "w") as f:
+                json.dump(obj, f, default=default, **kwargs)
+            has_values = f_sidecar.tell() > 0
+
+        if not has_values:
+            os.remove(sidecar_path)
+
+    @classmethod
+    def load(clazz, json_path):
+        """ Reads a JSON file written with dump(). The table values referred
+            to in it are read from its sidecar file.
+        """
+        json_dir = os.path.dirname(json_path)
+        sidecars = {} # the open sidecar files, by name
+
+        def object_hook(d):
+            if len(d) != 3 or "sidecar" not in d:
+                return d
+            f_sidecar = sidecars.get(d["sidecar"])
+            if f_sidecar is None:
+                f_sidecar = open(os.path.join(json_dir, d["sidecar"]), "rb")
+                sidecars[d["sidecar"]] = f_sidecar
+            f_sidecar.seek(d["offset"] * TableValues.__ITEM_SIZE)
+            x = TableValues.new()
+            x.fromfile(f_sidecar, d["length"])
+            if sys.byteorder == "big":
+                x.byteswap()
+            return x
+
+        try:
+            with open(json_path, "r") as f:
+                return json.load(f, object_hook=object_hook)
+        finally:
+            for f_sidecar in sidecars.values():
+                f_sidecar.close()
+
+    @classmethod
+    def to_list(clazz, x):
+        """ Returns table values as a list. To be used as the default function
+            of json.dump(), if the JSON must not refer to a sidecar file.
+        """
+        if not TableValues.is_values(x):
+            raise TypeError("{0} is not JSON serializable".format(repr(x)))
+        return x.tolist()
+
+    @classmethod
+    def to_digest(clazz, x):
+        """ Returns the sha1 hex digest of table values. To be used as the
+            default function of json.dumps(), if the JSON is only hashed.
+        """
+        if not TableValues.is_values(x):
+            raise TypeError("{0} is not JSON serializable".format(repr(x)))
+        return hashlib.sha1(x.tostring()).hexdigest()
@@ -17,6 +17,8 @@ from collections import defaultdict
 import json
 import os
 
+from ..output.OutputWriter import OutputWriter
+
 # generate build configuration files for use with https://github.com/enzienaudio/courtesan
 # Example arguments:
 #   macos_x64_args=["-project", "Hv_test_WwiseSourcePlugin.xcodeproj", "-arch", "x86_64", "-alltargets"]
@@ -25,7 +27,7 @@ import os
 
 def generate_json(out_dir, android_armv7a_args=None, ios_armv7a_args=None,
         linux_armv7a_args=None, linux_x64_args=None, macos_x64_args=None,
-        win_x64_args=None, win_x86_args=None):
+        win_x64_args=None, win_x86_args=None, writer=None):
     build_json = defaultdict(dict)
 
     if android_armv7a_args:
@@ -71,5 +73,5 @@ def generate_json(out_dir, android_armv7a_args=None, ios_armv7a_args=None,
             "binaryDir": ["build", "win", "x86", "Release"]
         }
 
-    with open(os.path.join(out_dir, "build.json"), "w") as f:
-        json.dump(build_json, f)
+    writer = writer or OutputWriter()
+    writer.write(os.path.join(out_dir, "build.json"), json.dumps(build_json))
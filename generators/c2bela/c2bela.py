@@ -13,11 +13,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import jinja2
 import os
-import shutil
 import time
 from ..buildjson import buildjson
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2bela:
     """ Generates a makefile to compile source to object files suitable for the
@@ -32,33 +32,29 @@ class c2bela:
         tick = time.time()
         patch_name = patch_name or "heavy"
 
+        # only files whose content has changed are written
+        writer = OutputWriter()
+
         try:
-            # ensure that the output directory does not exist
             out_dir = os.path.abspath(out_dir)
-            if os.path.exists(out_dir):
-                shutil.rmtree(out_dir)
 
             # copy over generated C source files
-            shutil.copytree(c_src_dir, os.path.join(out_dir, "source"))
+            writer.copy_tree(c_src_dir, os.path.join(out_dir, "source"))
+            writer.remove_stale(os.path.join(out_dir, "source"))
 
             # initialise the jinja template environment
-            env = jinja2.Environment()
-            env.loader = jinja2.FileSystemLoader(
+            env = template_env_manager.get_environment(
                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
 
-            # make sure directories exist
-            makefile_path = os.path.join(out_dir, "linux", "Makefile")
-            if not os.path.exists(os.path.dirname(makefile_path)):
-                os.makedirs(os.path.dirname(makefile_path))
-
             # generate linux makefile
-            with open(makefile_path, "w") as f:
-                f.write(env.get_template("linux/Makefile").render(name=patch_name))
+            makefile_path = os.path.join(out_dir, "linux", "Makefile")
+            writer.write(makefile_path, env.get_template("linux/Makefile").render(name=patch_name))
 
             # generate build json file
             buildjson.generate_json(
                 out_dir,
-                linux_armv7a_args=["-j"])
+                linux_armv7a_args=["-j"],
+                writer=writer)
 
             return  {
                 "stage": "c2bela",
@@ -72,6 +68,7 @@ class c2bela:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": "",
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
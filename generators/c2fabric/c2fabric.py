@@ -14,12 +14,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import hashlib
-import jinja2
 import os
-import shutil
 import time
 from ..buildjson import buildjson
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2fabric:
     """Generates a DSP component for Fabric.
@@ -64,25 +64,27 @@ class c2fabric:
         copyright = copyright_manager.get_copyright_for_c(copyright)
 
         # initialise the jinja template environment
-        env = jinja2.Environment()
-        env.filters["xcode_build"] = c2fabric.filter_xcode_build
-        env.filters["xcode_fileref"] = c2fabric.filter_xcode_fileref
-        env.filters["xcode_copy"] = c2fabric.filter_xcode_copy
-        env.loader = jinja2.FileSystemLoader(
-            encoding="utf-8-sig",
-            searchpath=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")])
+        env = template_env_manager.get_environment(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"),
+            filters={
+                "xcode_build": c2fabric.filter_xcode_build,
+                "xcode_fileref": c2fabric.filter_xcode_fileref,
+                "xcode_copy": c2fabric.filter_xcode_copy
+            },
+            encoding="utf-8-sig")
 
         src_out_dir = os.path.join(out_dir, "source")
 
+        # only files whose content has changed are written
+        writer = OutputWriter()
+
         try:
-            # ensure that the output directory does not exist
             out_dir = os.path.abspath(out_dir)
-            if os.path.exists(out_dir):
-                shutil.rmtree(out_dir)
 
             # copy over generated C source files
             src_out_dir = os.path.join(out_dir, "source", "heavy")
-            shutil.copytree(c_src_dir, src_out_dir)
+            writer.copy_tree(c_src_dir, src_out_dir)
+            writer.remove_stale(src_out_dir)
 
             files_to_copy = [w.format(patch_name) for w in ["Hv_{0}_FabricDSP.cs", "Hv_{0}_FabricDSPEditor.cs"]]
 
@@ -91,23 +93,19 @@ class c2fabric:
                 file_path = os.path.join(out_dir, f)
                 file_path = file_path.replace("{{name}}", patch_name)
 
-                if not os.path.exists(os.path.dirname(file_path)):
-                    os.makedirs(os.path.dirname(file_path))
-
-                with open(file_path, "w") as g:
-                    g.write(env.get_template(f).render(
-                        patch_name=patch_name,
-                        project_name="Hv_{0}_Fabric".format(patch_name),
-                        lib_name=patch_name,
-                        num_input_channels=num_input_channels,
-                        num_output_channels=num_output_channels,
-                        in_parameters=in_parameter_list,
-                        out_parameters=out_parameter_list,
-                        in_events=in_event_list,
-                        out_events=out_event_list,
-                        compile_files=os.listdir(src_out_dir),
-                        copy_files=files_to_copy,
-                        copyright=copyright))
+                writer.write(file_path, env.get_template(f).render(
+                    patch_name=patch_name,
+                    project_name="Hv_{0}_Fabric".format(patch_name),
+                    lib_name=patch_name,
+                    num_input_channels=num_input_channels,
+                    num_output_channels=num_output_channels,
+                    in_parameters=in_parameter_list,
+                    out_parameters=out_parameter_list,
+                    in_events=in_event_list,
+                    out_events=out_event_list,
+                    compile_files=os.listdir(src_out_dir),
+                    copy_files=files_to_copy,
+                    copyright=copyright))
 
             buildjson.generate_json(
                 out_dir,
@@ -115,7 +113,8 @@ class c2fabric:
                 linux_x64_args=["-j"],
                 macos_x64_args=["-project", "Hv_{0}_Fabric.xcodeproj".format(patch_name), "-arch", "x86_64", "-alltargets"],
                 win_x64_args=["/property:Configuration=Release", "/property:Platform=x64", "/t:Rebuild", "Hv_{0}_Fabric.sln".format(patch_name), "/m"],
-                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "Hv_{0}_Fabric.sln".format(patch_name), "/m"])
+                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "Hv_{0}_Fabric.sln".format(patch_name), "/m"],
+                writer=writer)
 
             return  {
                 "stage": "c2fabric",
@@ -129,6 +128,7 @@ class c2fabric:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": "",
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
@@ -16,8 +16,9 @@
 import os
 import subprocess
 import time
-import jinja2
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2js:
     """Compiles a directory of C source files into javascript. Requires the
@@ -152,10 +153,13 @@ class c2js:
             os.makedirs(out_dir)
         out_dir = os.path.abspath(out_dir)
 
+        # only files whose content has changed are written,
+        # the emscripten output is always regenerated
+        writer = OutputWriter()
+
         try:
             # initialise the jinja template environment
-            env = jinja2.Environment()
-            env.loader = jinja2.FileSystemLoader(os.path.join(
+            env = template_env_manager.get_environment(os.path.join(
                 os.path.dirname(__file__),
                 "template"))
 
@@ -182,13 +186,12 @@ class c2js:
             js_out_file = os.path.basename(js_path)
 
             # generate index.html from template
-            with open(os.path.join(out_dir, "index.html"), "w") as f:
-                f.write(env.get_template("index.html").render(
-                    name=patch_name,
-                    includes=["./{0}".format(js_out_file)],
-                    parameters=parameter_list,
-                    events=event_list,
-                    copyright=copyright_html))
+            writer.write(os.path.join(out_dir, "index.html"), env.get_template("index.html").render(
+                name=patch_name,
+                includes=["./{0}".format(js_out_file)],
+                parameters=parameter_list,
+                events=event_list,
+                copyright=copyright_html))
 
             return  {
                 "stage": "c2js",
@@ -202,6 +205,7 @@ class c2js:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": js_out_file,
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
@@ -15,10 +15,10 @@
 
 import hashlib
 import os
-import shutil
 import time
-import jinja2
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2pdext:
     """Generates a Pure Data external wrapper for a given patch.
@@ -57,53 +57,53 @@ class c2pdext:
         ext_name = ext_name or (patch_name+"~")
         struct_name = patch_name + "_tilde"
 
-        # ensure that the output directory does not exist
+        # only files whose content has changed are written
+        writer = OutputWriter()
         out_dir = os.path.abspath(out_dir)
-        if os.path.exists(out_dir):
-            shutil.rmtree(out_dir)
+        pdext_path = os.path.join(out_dir, "{0}.c".format(struct_name))
 
         # copy over generated C source files
-        shutil.copytree(c_src_dir, out_dir)
+        writer.copy_tree(c_src_dir, out_dir)
 
         # copy over static files
-        shutil.copy(
+        writer.copy(
             os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "m_pd.h"),
-            out_dir)
+            os.path.join(out_dir, "m_pd.h"))
 
         try:
             # initialise the jinja template environment
-            env = jinja2.Environment()
-            env.filters["max"] = c2pdext.filter_max
-            env.filters["xcode_build"] = c2pdext.filter_xcode_build
-            env.filters["xcode_fileref"] = c2pdext.filter_xcode_fileref
-            env.loader = jinja2.FileSystemLoader(
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+            env = template_env_manager.get_environment(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"),
+                filters={
+                    "max": c2pdext.filter_max,
+                    "xcode_build": c2pdext.filter_xcode_build,
+                    "xcode_fileref": c2pdext.filter_xcode_fileref
+                })
 
             # generate Pd external wrapper from template
-            pdext_path = os.path.join(out_dir, "{0}.c".format(struct_name))
-            with open(pdext_path, "w") as f:
-                f.write(env.get_template("pd_external.c").render(
-                    name=patch_name,
-                    struct_name=struct_name,
-                    display_name=ext_name,
-                    num_input_channels=num_input_channels,
-                    num_output_channels=num_output_channels,
-                    receivers=receiver_list,
-                    copyright=copyright))
+            writer.write(pdext_path, env.get_template("pd_external.c").render(
+                name=patch_name,
+                struct_name=struct_name,
+                display_name=ext_name,
+                num_input_channels=num_input_channels,
+                num_output_channels=num_output_channels,
+                receivers=receiver_list,
+                copyright=copyright))
+
+            # remove sources from previous compiles which are no longer generated
+            writer.remove_stale(out_dir)
+
+            # generate list of source files
+            files = [g for g in os.listdir(out_dir) if g.endswith((".h", ".hpp", ".c", ".cpp"))]
 
             # generate Xcode project
             xcode_path = os.path.join(out_dir, "{0}.xcodeproj".format(struct_name))
-            os.mkdir(xcode_path) # create the xcode project bundle
             pbxproj_path = os.path.join(xcode_path, "project.pbxproj")
 
-            # generate list of source files
-            files = [g for g in os.listdir(out_dir) if g.endswith((".h", ".hpp", ".c", ".cpp"))]
-
             # render the pbxproj file
-            with open(pbxproj_path, "w") as f:
-                f.write(env.get_template("project.pbxproj").render(
-                    name=ext_name,
-                    files=files))
+            writer.write(pbxproj_path, env.get_template("project.pbxproj").render(
+                name=ext_name,
+                files=files))
 
             return  {
                 "stage": "c2pdext",
@@ -117,6 +117,7 @@ class c2pdext:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": os.path.basename(pdext_path),
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
@@ -14,12 +14,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import hashlib
-import jinja2
 import os
-import shutil
 import time
 from ..copyright import copyright_manager
 from ..buildjson import buildjson
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2unity:
     """Generates a Audio Native Plugin wrapper for Unity 5.
@@ -63,50 +63,48 @@ class c2unity:
         copyright = copyright_manager.get_copyright_for_c(copyright)
 
         # initialise the jinja template environment
-        env = jinja2.Environment()
-        env.filters["xcode_build"] = c2unity.filter_xcode_build
-        env.filters["xcode_fileref"] = c2unity.filter_xcode_fileref
-        env.filters["cap"] = c2unity.filter_string_cap
-        env.loader = jinja2.FileSystemLoader(
-            encoding="utf-8-sig",
-            searchpath=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")])
+        env = template_env_manager.get_environment(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"),
+            filters={
+                "xcode_build": c2unity.filter_xcode_build,
+                "xcode_fileref": c2unity.filter_xcode_fileref,
+                "cap": c2unity.filter_string_cap
+            },
+            encoding="utf-8-sig")
 
         static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
         src_out_dir = os.path.join(out_dir, "source")
 
+        # only files whose content has changed are written
+        writer = OutputWriter()
+
         try:
-            # ensure that the output directory does not exist
             out_dir = os.path.abspath(out_dir)
-            if os.path.exists(out_dir):
-                shutil.rmtree(out_dir)
 
             # copy over static files
-            shutil.copytree(static_dir, out_dir)
+            writer.copy_tree(static_dir, out_dir)
 
             # copy over generated C source files
             src_out_dir = os.path.join(out_dir, "source", "heavy")
-            shutil.copytree(c_src_dir, src_out_dir)
+            writer.copy_tree(c_src_dir, src_out_dir)
+            writer.remove_stale(src_out_dir)
 
             # generate files from templates
             for f in env.list_templates(filter_func=c2unity.filter_templates):
                 file_path = os.path.join(out_dir, f)
                 file_path = file_path.replace("{{name}}", patch_name)
 
-                if not os.path.exists(os.path.dirname(file_path)):
-                    os.makedirs(os.path.dirname(file_path))
-
-                with open(file_path, "w") as g:
-                    g.write(env.get_template(f).render(
-                        patch_name=patch_name,
-                        files=os.listdir(src_out_dir),
-                        num_input_channels=num_input_channels,
-                        num_output_channels=num_output_channels,
-                        parameters=parameter_list,
-                        events=event_list,
-                        tables=table_list,
-                        pool_sizes_kb=externs["memoryPoolSizesKb"],
-                        compile_files=os.listdir(src_out_dir),
-                        copyright=copyright))
+                writer.write(file_path, env.get_template(f).render(
+                    patch_name=patch_name,
+                    files=os.listdir(src_out_dir),
+                    num_input_channels=num_input_channels,
+                    num_output_channels=num_output_channels,
+                    parameters=parameter_list,
+                    events=event_list,
+                    tables=table_list,
+                    pool_sizes_kb=externs["memoryPoolSizesKb"],
+                    compile_files=os.listdir(src_out_dir),
+                    copyright=copyright))
 
             buildjson.generate_json(
                 out_dir,
@@ -114,7 +112,8 @@ class c2unity:
                 linux_x64_args=["-j"],
                 macos_x64_args=["-project", "Hv_{0}_Unity.xcodeproj".format(patch_name), "-arch", "x86_64", "-alltargets"],
                 win_x64_args=["/property:Configuration=Release", "/property:Platform=x64", "/t:Rebuild", "Hv_{0}_Unity.sln".format(patch_name), "/m"],
-                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "Hv_{0}_Unity.sln".format(patch_name), "/m"])
+                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "Hv_{0}_Unity.sln".format(patch_name), "/m"],
+                writer=writer)
 
             return  {
                 "stage": "c2unity",
@@ -128,6 +127,7 @@ class c2unity:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": "",
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
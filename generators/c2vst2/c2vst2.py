@@ -16,11 +16,11 @@
 import datetime
 import hashlib
 import os
-import shutil
 import time
-import jinja2
 from ..buildjson import buildjson
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2vst2:
     """ Generates a VST 2.4 wrapper for a given patch.
@@ -58,47 +58,49 @@ class c2vst2:
         copyright_c = copyright_manager.get_copyright_for_c(copyright)
         copyright_plist = copyright or u"Copyright {0} Enzien Audio, Ltd. All Rights Reserved.".format(datetime.datetime.now().year)
 
+        # only files whose content has changed are written
+        writer = OutputWriter()
+
         try:
-            # ensure that the output directory does not exist
             out_dir = os.path.abspath(out_dir)
-            if os.path.exists(out_dir):
-                shutil.rmtree(out_dir)
 
             # copy over static files
-            shutil.copytree(os.path.join(os.path.dirname(__file__), "static"), out_dir)
+            writer.copy_tree(os.path.join(os.path.dirname(__file__), "static"), out_dir)
 
             # copy over generated C source files
             source_dir = os.path.join(out_dir, "source")
-            shutil.copytree(c_src_dir, source_dir)
+            writer.copy_tree(c_src_dir, source_dir)
 
             # initialise the jinja template environment
-            env = jinja2.Environment()
-            env.filters["uniqueid"] = c2vst2.filter_uniqueid
-            env.filters["xcode_build"] = c2vst2.filter_xcode_build
-            env.filters["xcode_fileref"] = c2vst2.filter_xcode_fileref
-            env.loader = jinja2.FileSystemLoader(
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+            env = template_env_manager.get_environment(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"),
+                filters={
+                    "uniqueid": c2vst2.filter_uniqueid,
+                    "xcode_build": c2vst2.filter_xcode_build,
+                    "xcode_fileref": c2vst2.filter_xcode_fileref
+                })
 
             # generate VST2 wrapper from template
             vst_h_path = os.path.join(source_dir, "HeavyVst2_{0}.hpp".format(patch_name))
-            with open(vst_h_path, "w") as f:
-                f.write(env.get_template("HeavyVst2.hpp").render(
-                    name=patch_name,
-                    class_name="HeavyVst2_"+patch_name,
-                    num_input_channels=num_input_channels,
-                    num_output_channels=num_output_channels,
-                    receivers=receiver_list,
-                    copyright=copyright_c))
+            writer.write(vst_h_path, env.get_template("HeavyVst2.hpp").render(
+                name=patch_name,
+                class_name="HeavyVst2_"+patch_name,
+                num_input_channels=num_input_channels,
+                num_output_channels=num_output_channels,
+                receivers=receiver_list,
+                copyright=copyright_c))
             vst_cpp_path = os.path.join(source_dir, "HeavyVst2_{0}.cpp".format(patch_name))
-            with open(vst_cpp_path, "w") as f:
-                f.write(env.get_template("HeavyVst2.cpp").render(
-                    name=patch_name,
-                    class_name="HeavyVst2_"+patch_name,
-                    num_input_channels=num_input_channels,
-                    num_output_channels=num_output_channels,
-                    receivers=receiver_list,
-                    pool_sizes_kb=externs["memoryPoolSizesKb"],
-                    copyright=copyright_c))
+            writer.write(vst_cpp_path, env.get_template("HeavyVst2.cpp").render(
+                name=patch_name,
+                class_name="HeavyVst2_"+patch_name,
+                num_input_channels=num_input_channels,
+                num_output_channels=num_output_channels,
+                receivers=receiver_list,
+                pool_sizes_kb=externs["memoryPoolSizesKb"],
+                copyright=copyright_c))
+
+            # remove sources from previous compiles which are no longer generated
+            writer.remove_stale(source_dir)
 
             # generate list of Heavy source files
             files = os.listdir(source_dir)
@@ -110,16 +112,13 @@ class c2vst2:
             #
             xcode_dir = os.path.join(out_dir, "xcode")
             xcodeproj_path = os.path.join(xcode_dir, "{0}.xcodeproj".format(patch_name))
-            os.makedirs(xcodeproj_path) # create the xcode project bundle
             pbxproj_path = os.path.join(xcodeproj_path, "project.pbxproj")
-            with open(pbxproj_path, "w") as f:
-                f.write(env.get_template("xcode/project.pbxproj").render(
-                    name=patch_name,
-                    files=files))
+            writer.write(pbxproj_path, env.get_template("xcode/project.pbxproj").render(
+                name=patch_name,
+                files=files))
 
-            with open(os.path.join(xcode_dir, "Info.plist"), "w") as f:
-                f.write(env.get_template("xcode/Info.plist").render(
-                    copyright=copyright_plist))
+            writer.write(os.path.join(xcode_dir, "Info.plist"), env.get_template("xcode/Info.plist").render(
+                copyright=copyright_plist))
 
 
 
@@ -127,16 +126,13 @@ class c2vst2:
             # VS2015
             #
             vs_dir = os.path.join(out_dir, "vs2015");
-            os.mkdir(vs_dir) # create the vs2015 directory
             sln_path = os.path.join(vs_dir, "{0}.sln".format(patch_name))
-            with open(sln_path, "w") as f:
-                f.write(env.get_template("vs2015/project.sln").render(
-                    name=patch_name))
+            writer.write(sln_path, env.get_template("vs2015/project.sln").render(
+                name=patch_name))
             vcxproj_path = os.path.join(vs_dir, "{0}.vcxproj".format(patch_name))
-            with open(vcxproj_path, "w") as f:
-                f.write(env.get_template("vs2015/project.vcxproj").render(
-                    name=patch_name,
-                    files=files))
+            writer.write(vcxproj_path, env.get_template("vs2015/project.vcxproj").render(
+                name=patch_name,
+                files=files))
 
 
 
@@ -144,18 +140,16 @@ class c2vst2:
             # Linux
             #
             linux_path = os.path.join(out_dir, "linux")
-            os.makedirs(linux_path)
-
-            with open(os.path.join(linux_path, "Makefile"), "w") as f:
-                f.write(env.get_template("linux/Makefile").render(
-                    name=patch_name))
+            writer.write(os.path.join(linux_path, "Makefile"), env.get_template("linux/Makefile").render(
+                name=patch_name))
 
             buildjson.generate_json(
                 out_dir,
                 linux_x64_args=["-j"],
                 macos_x64_args=["-project", "{0}.xcodeproj".format(patch_name), "-arch", "x86_64", "-alltargets"],
                 win_x64_args=["/property:Configuration=Release", "/property:Platform=x64", "/t:Rebuild", "{0}.sln".format(patch_name), "/m"],
-                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "{0}.sln".format(patch_name), "/m"])
+                win_x86_args=["/property:Configuration=Release", "/property:Platform=x86", "/t:Rebuild", "{0}.sln".format(patch_name), "/m"],
+                writer=writer)
 
             return {
                 "stage": "c2vst2",
@@ -169,6 +163,7 @@ class c2vst2:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": os.path.basename(vst_h_path),
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
@@ -15,11 +15,11 @@
 
 import hashlib
 import os
-import shutil
 import time
-import jinja2
 from ..buildjson import buildjson
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
 
 class c2wwise:
     """Generates a plugin wrapper for Audiokinetic's Wwise game audio middleware
@@ -64,12 +64,16 @@ class c2wwise:
         plugin_type = "Source" if num_input_channels == 0 else "FX"
         plugin_id = int(hashlib.md5(patch_name).hexdigest()[:4], 16) & 0x7FFF # unique id from patch name [0...32767]
 
-        env = jinja2.Environment()
-        env.filters["xcode_build"] = c2wwise.filter_xcode_build
-        env.filters["xcode_fileref"] = c2wwise.filter_xcode_fileref
-        env.loader = jinja2.FileSystemLoader(
-            encoding="utf-8-sig",
-            searchpath=[templates_dir])
+        env = template_env_manager.get_environment(
+            templates_dir,
+            filters={
+                "xcode_build": c2wwise.filter_xcode_build,
+                "xcode_fileref": c2wwise.filter_xcode_fileref
+            },
+            encoding="utf-8-sig")
+
+        # only files whose content has changed are written
+        writer = OutputWriter()
 
         try:
             if plugin_type == "FX":
@@ -80,9 +84,8 @@ class c2wwise:
 
             # copy over generated C source files
             patch_src_dir = os.path.join(out_dir, "source", "heavy")
-            if os.path.exists(patch_src_dir):
-                shutil.rmtree(patch_src_dir)
-            shutil.copytree(c_src_dir, patch_src_dir)
+            writer.copy_tree(c_src_dir, patch_src_dir)
+            writer.remove_stale(patch_src_dir)
 
             # template all source files
             src_extns = ["h", "hpp", "c", "cpp", "xml", "def", "rc", "plist"]
@@ -101,32 +104,23 @@ class c2wwise:
                 # static files
                 if file_name in ["stdafx.h", "Info.plist"]:
                     file_path = os.path.join(file_dir, file_name)
-
-                    if not os.path.exists(os.path.dirname(file_path)):
-                        os.makedirs(os.path.dirname(file_path))
-
-                    shutil.copyfile(os.path.join(templates_dir, f), file_path)
+                    writer.copy(os.path.join(templates_dir, f), file_path)
 
                 # templated files
                 else:
                     file_name = file_name.replace("{{name}}", patch_name)
                     file_name = file_name.replace("{{type}}", plugin_type)
                     file_path = os.path.join(file_dir, file_name)
-
-                    if not os.path.exists(os.path.dirname(file_path)):
-                        os.makedirs(os.path.dirname(file_path))
-
-                    with open(file_path, "w") as g:
-                        g.write(env.get_template(f).render(
-                            name=patch_name,
-                            parameters=in_parameter_list,
-                            sends=out_parameter_list,
-                            events=event_list,
-                            tables=table_list,
-                            pool_sizes_kb=externs["memoryPoolSizesKb"],
-                            plugin_type=plugin_type,
-                            plugin_id=plugin_id,
-                            copyright=copyright_xml if file_name.endswith(".xml") else copyright_c))
+                    writer.write(file_path, env.get_template(f).render(
+                        name=patch_name,
+                        parameters=in_parameter_list,
+                        sends=out_parameter_list,
+                        events=event_list,
+                        tables=table_list,
+                        pool_sizes_kb=externs["memoryPoolSizesKb"],
+                        plugin_type=plugin_type,
+                        plugin_id=plugin_id,
+                        copyright=copyright_xml if file_name.endswith(".xml") else copyright_c))
 
             files = [f for f in os.listdir(patch_src_dir)]
 
@@ -147,35 +141,26 @@ class c2wwise:
                     file_path = file_path.replace("{{type}}", plugin_type)
                     file_path = os.path.join(out_dir, file_path.replace("{{type}}", plugin_type))
 
-                if not os.path.exists(os.path.dirname(file_path)):
-                    os.makedirs(os.path.dirname(file_path))
-
-                with open(file_path, "w") as g:
-                    g.write(env.get_template(f).render(
-                        name=patch_name,
-                        parameters=in_parameter_list,
-                        sends=out_parameter_list,
-                        events=event_list,
-                        tables=table_list,
-                        plugin_type=plugin_type,
-                        plugin_id=plugin_id,
-                        wwise_version=wwise_sdk_version,
-                        msbuild_version="140",
-                        files=files))
-
-            # linux makefile
-            linux_makefile = os.path.join(out_dir, "linux", "Makefile")
-
-            if not os.path.exists(os.path.dirname(linux_makefile)):
-                    os.makedirs(os.path.dirname(linux_makefile))
-
-            with open(linux_makefile, "w") as g:
-                g.write(env.get_template("linux/Makefile").render(
+                writer.write(file_path, env.get_template(f).render(
                     name=patch_name,
+                    parameters=in_parameter_list,
+                    sends=out_parameter_list,
+                    events=event_list,
+                    tables=table_list,
                     plugin_type=plugin_type,
                     plugin_id=plugin_id,
-                    files=files,
-                    wwise_version=wwise_sdk_version))
+                    wwise_version=wwise_sdk_version,
+                    msbuild_version="140",
+                    files=files))
+
+            # linux makefile
+            linux_makefile = os.path.join(out_dir, "linux", "Makefile")
+            writer.write(linux_makefile, env.get_template("linux/Makefile").render(
+                name=patch_name,
+                plugin_type=plugin_type,
+                plugin_id=plugin_id,
+                files=files,
+                wwise_version=wwise_sdk_version))
 
             proj_name = "Hv_{0}_Wwise{1}Plugin".format(patch_name, plugin_type)
 
@@ -199,7 +184,8 @@ class c2wwise:
                     "/property:Configuration=Release",
                     "/property:Platform=x86",
                     "/t:Rebuild", "/m",
-                    "{0}.sln".format(proj_name)])
+                    "{0}.sln".format(proj_name)],
+                writer=writer)
 
             return  {
                 "stage": "c2wwise",
@@ -213,6 +199,7 @@ class c2wwise:
                 "in_file": "",
                 "out_dir": out_dir,
                 "out_file": "",
+                "files": writer.get_counts(),
                 "compile_time": time.time()-tick
             }
 
@@ -13,6 +13,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
+
 from HeavyObject import HeavyObject
 
 class HeavyTable(HeavyObject):
@@ -22,6 +24,12 @@ class HeavyTable(HeavyObject):
     c_struct = "HvTable"
     preamble = "hTable"
 
+    # the number of table values which are formatted at once
+    __CHUNK_SIZE = 4096
+
+    # formatted values without a decimal point or exponent, e.g. "1f"
+    __RE_INTEGER = re.compile(r", (-?\d+)f")
+
     @classmethod
     def get_C_header_set(self):
         return {"HvTable.h"}
@@ -40,15 +48,26 @@ class HeavyTable(HeavyObject):
 
     @classmethod
     def get_table_data_decl(clazz, obj_type, obj_id, args):
+        """ Returns the declarations of the table data. Each declaration is
+            an iterable of strings, such that large tables can be streamed.
+        """
         if len(args.get("values",[])) > 0:
-            return [
-                "float hTable_{0}_data[{1}] = {{{2}}};".format(
-                    obj_id,
-                    len(args["values"]),
-                    ", ".join(["{0}f".format(float(v)) for v in args["values"]]))]
+            return [clazz.__iter_table_data(obj_id, args["values"])]
         else:
             return []
 
+    @classmethod
+    def __iter_table_data(clazz, obj_id, values):
+        yield "float hTable_{0}_data[{1}] = {{".format(obj_id, len(values))
+        for i in xrange(0, len(values), HeavyTable.__CHUNK_SIZE):
+            chunk = tuple(values[i:i+HeavyTable.__CHUNK_SIZE])
+            # 9 significant digits restore a 32-bit float exactly.
+            # Integers are not valid float literals, zeros are the most common.
+            s = (", %.9gf" * len(chunk)) % chunk
+            s = HeavyTable.__RE_INTEGER.sub(r", \1.0f", s.replace(", 0f", ", 0.0f"))
+            yield s if i > 0 else s[2:]
+        yield "};"
+
     @classmethod
     def get_C_init(clazz, obj_type, obj_id, args):
         if len(args.get("values",[])) > 0:
@@ -16,14 +16,14 @@
 import argparse
 from collections import Counter
 from collections import OrderedDict
-import jinja2
-import json
 import os
-import shutil
 import time
 
 from PrettyfyC import PrettyfyC
 from ..copyright import copyright_manager
+from ..output.OutputWriter import OutputWriter
+from ..template_env import template_env_manager
+from core.tables.TableValues import TableValues
 
 from ControlBinop import ControlBinop
 from ControlCast import ControlCast
@@ -146,25 +146,27 @@ class ir2c:
             raise Exception("No class found for object type \"{0}\".".format(obj_type))
 
     @classmethod
-    def compile(clazz, hv_ir_path, static_dir, output_dir, externs, copyright=None):
+    def compile(clazz, hv_ir_path, static_dir, output_dir, externs, copyright=None, ir=None):
         """ Compiles a HeavyIR file into a C.
             Returns a tuple of compile time in seconds, a notification dictionary,
             and a HeavyIR object counter.
+            If the HeavyIR dictionary is given as ir, hv_ir_path is not read.
         """
 
         # keep track of the total compile time
         tick = time.time()
 
         # establish the jinja environment
-        env = jinja2.Environment()
-        env.filters["hvhash"] = ir2c.filter_hvhash
-        env.filters["extern"] = ir2c.filter_extern
-        env.loader = jinja2.FileSystemLoader(
-            os.path.join(os.path.dirname(__file__), "templates"))
+        env = template_env_manager.get_environment(
+            os.path.join(os.path.dirname(__file__), "templates"),
+            filters={
+                "hvhash": ir2c.filter_hvhash,
+                "extern": ir2c.filter_extern
+            })
 
-        # read the hv.ir.json file
-        with open(hv_ir_path, "r") as f:
-            ir = json.load(f)
+        # read the hv.ir.json file, and any table values in its sidecar file
+        if ir is None:
+            ir = TableValues.load(hv_ir_path)
 
         # generate the copyright
         copyright = copyright_manager.get_copyright_for_c(copyright)
@@ -240,12 +242,16 @@ class ir2c:
         # the project name to be used as a part of file and function names
         name = ir["name"]["escaped"]
 
+        # only files whose content has changed are written
+        writer = OutputWriter()
+
         # ensure that send_receive dictionary is alphabetised by the receiver key
         send_receive = OrderedDict(sorted([(k,v) for k,v in ir["control"]["receivers"].iteritems()], key=lambda x: x[0]))
 
         # write HeavyContext.h
-        with open(os.path.join(output_dir, "Heavy_{0}.hpp".format(name)), "w") as f:
-            f.write(env.get_template("Heavy_NAME.hpp").render(
+        writer.write(
+            os.path.join(output_dir, "Heavy_{0}.hpp".format(name)),
+            env.get_template("Heavy_NAME.hpp").render(
                 name=name,
                 include_set=include_set,
                 decl_list=decl_list,
@@ -255,8 +261,10 @@ class ir2c:
                 externs=externs))
 
         # write C++ implementation
-        with open(os.path.join(output_dir, "Heavy_{0}.cpp".format(name)), "w") as f:
-            f.write(env.get_template("Heavy_NAME.cpp").render(
+        # it is streamed, as the table data may be large
+        writer.write_stream(
+            os.path.join(output_dir, "Heavy_{0}.cpp".format(name)),
+            env.get_template("Heavy_NAME.cpp").generate(
                 name=name,
                 signal=ir["signal"],
                 init_list=init_list,
@@ -269,15 +277,16 @@ class ir2c:
                 copyright=copyright))
 
         # write C API, hv_NAME.h
-        with open(os.path.join(output_dir, "Heavy_{0}.h".format(name)), "w") as f:
-            f.write(env.get_template("Heavy_NAME.h").render(
+        writer.write(
+            os.path.join(output_dir, "Heavy_{0}.h".format(name)),
+            env.get_template("Heavy_NAME.h").render(
                 name=name,
                 copyright=copyright,
                 externs=externs))
 
         # copy static files to output directory
         for f in file_set:
-            shutil.copy2(
+            writer.copy(
                 src=os.path.join(static_dir, f),
                 dst=os.path.join(output_dir, f))
 
@@ -291,10 +300,12 @@ class ir2c:
                 "exception": None,
                 "errors": []
             },
-            "in_dir": os.path.dirname(hv_ir_path),
-            "in_file": os.path.basename(hv_ir_path),
+            "in_dir": os.path.dirname(hv_ir_path) if hv_ir_path else None,
+            "in_file": os.path.basename(hv_ir_path) if hv_ir_path else None,
             "out_dir": output_dir,
             "out_file": "",
+            "out_files": sorted(["Heavy_{0}.hpp".format(name), "Heavy_{0}.cpp".format(name), "Heavy_{0}.h".format(name)] + list(file_set)),
+            "files": writer.get_counts(),
             "compile_time": (time.time() - tick),
             "obj_counter": ir_counter
         }
@@ -21,11 +21,16 @@ import os
 
 class ir2c_perf:
 
+    # the HeavyIR object definitions, loaded on first use
+    __HEAVY_IR_JSON = None
+
     @classmethod
     def perf(clazz, ir, blocksize=512, mhz=1000, verbose=False):
         # read the hv.ir.json file
-        with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
-            HEAVY_IR_JSON = json.load(f)
+        if ir2c_perf.__HEAVY_IR_JSON is None:
+            with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
+                ir2c_perf.__HEAVY_IR_JSON = json.load(f)
+        HEAVY_IR_JSON = ir2c_perf.__HEAVY_IR_JSON
 
         objects = Counter()
         perf = Counter()
@@ -28,7 +28,7 @@ extern "C" {
  * Table Data
  */
 {% for x in table_data_list %}
-{{x}}
+{% for s in x %}{{s}}{% endfor %}
 {%- endfor %}
 {%- endif %}
 
@@ -0,0 +1,116 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import filecmp
+import os
+import shutil
+
+class OutputWriter:
+    """ Writes and copies generated files only if their content has changed.
+        Unchanged files keep their modification time, such that native build
+        systems (make, Xcode, MSBuild) only rebuild what has actually changed.
+        Keeps count of the files that were written, skipped and removed.
+    """
+
+    def __init__(self):
+        self.num_written = 0
+        self.num_skipped = 0
+        self.num_removed = 0
+        self.__paths = set() # all files that were written or skipped
+
+    def __make_dirs(self, path):
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+    def write(self, path, content):
+        """ Writes a string to a file, unless the file already has this content.
+        """
+        if isinstance(content, unicode):
+            content = content.encode("utf-8")
+        self.__paths.add(os.path.abspath(path))
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                if f.read() == content:
+                    self.num_skipped += 1
+                    return
+        else:
+            self.__make_dirs(path)
+        with open(path, "w") as f:
+            f.write(content)
+        self.num_written += 1
+
+    def write_stream(self, path, chunks):
+        """ Writes an iterable of strings to a file, unless the file already
+            has this content. The content is never held in memory as a whole.
+        """
+        self.__paths.add(os.path.abspath(path))
+        self.__make_dirs(path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for c in chunks:
+                if isinstance(c, unicode):
+                    c = c.encode("utf-8")
+                f.write(c)
+        if os.path.isfile(path):
+            if filecmp.cmp(tmp_path, path, shallow=False):
+                os.remove(tmp_path)
+                self.num_skipped += 1
+                return
+            os.remove(path)
+        os.rename(tmp_path, path)
+        self.num_written += 1
+
+    def copy(self, src, dst):
+        """ Copies a file, unless the destination already has the same content.
+        """
+        self.__paths.add(os.path.abspath(dst))
+        if os.path.isfile(dst) and filecmp.cmp(src, dst, shallow=False):
+            self.num_skipped += 1
+            return
+        self.__make_dirs(dst)
+        shutil.copy2(src, dst)
+        self.num_written += 1
+
+    def copy_tree(self, src_dir, dst_dir):
+        """ Copies all files in src_dir to dst_dir, skipping unchanged files.
+        """
+        for d, _, files in os.walk(src_dir):
+            for f in files:
+                self.copy(
+                    os.path.join(d, f),
+                    os.path.join(dst_dir, os.path.relpath(os.path.join(d, f), src_dir)))
+
+    def remove_stale(self, directory):
+        """ Removes all files directly in a directory which were not written
+            by this writer, e.g. the sources of a renamed patch.
+            Subdirectories (such as build products) are kept.
+        """
+        if not os.path.isdir(directory):
+            return
+        for f in os.listdir(directory):
+            path = os.path.abspath(os.path.join(directory, f))
+            if os.path.isfile(path) and path not in self.__paths:
+                os.remove(path)
+                self.num_removed += 1
+
+    def get_counts(self):
+        """ Returns the number of written, skipped and removed files, as
+            reported in the results of each stage.
+        """
+        return {
+            "written": self.num_written,
+            "skipped": self.num_skipped,
+            "removed": self.num_removed
+        }
@@ -0,0 +1,41 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import jinja2
+
+# all environments created so far, by template directory, filters and encoding
+_environments = {}
+
+def get_environment(template_dir, filters=None, encoding="utf-8"):
+    """ Returns a jinja environment which loads templates from the given
+        directory. The environment is shared by all callers with the same
+        template directory, filters and encoding, such that each template is
+        only compiled once per process. Templates are still reloaded if they
+        change on disk.
+    """
+    template_dir = os.path.abspath(template_dir)
+    filters = filters or {}
+    key = (template_dir, tuple(sorted(filters.items())), encoding)
+    env = _environments.get(key)
+    if env is None:
+        env = jinja2.Environment()
+        env.filters.update(filters)
+        env.loader = jinja2.FileSystemLoader(
+            encoding=encoding,
+            searchpath=[template_dir])
+        _environments[key] = env
+    return env
@@ -15,23 +15,51 @@
 
 import argparse
 from collections import OrderedDict
+import hashlib
+import importlib
 import json
+import multiprocessing
 import os
 import re
 import time
 
-import interpreters.pd2hv.pd2hv as pd2hv
-import interpreters.max2hv.max2hv as max2hv
-import core.hv2ir.hv2ir as hv2ir
-import generators.ir2c.ir2c as ir2c
-import generators.ir2c.ir2c_perf as ir2c_perf
-import generators.c2bela.c2bela as c2bela
-import generators.c2fabric.c2fabric as c2fabric
-import generators.c2js.c2js as c2js
-import generators.c2pdext.c2pdext as c2pdext
-import generators.c2wwise.c2wwise as c2wwise
-import generators.c2unity.c2unity as c2unity
-import generators.c2vst2.c2vst2 as c2vst2
+from core.cache.CompileCache import CompileCache
+from core.profiler.Profiler import Profiler
+from core.server.CompileServer import CompileServer
+from core.tables.TableValues import TableValues
+
+# the available generators, in the order in which they are run
+GENERATORS = OrderedDict([
+    ("bela", {"stage": "c2bela", "module": "generators.c2bela.c2bela", "description": "Bela plugin", "out_dir": "bela", "copyright": False}),
+    ("fabric", {"stage": "c2fabric", "module": "generators.c2fabric.c2fabric", "description": "Fabric plugin", "out_dir": "fabric", "copyright": True}),
+    ("js", {"stage": "c2js", "module": "generators.c2js.c2js", "description": "Javascript", "out_dir": "js", "copyright": True}),
+    ("pdext", {"stage": "c2pdext", "module": "generators.c2pdext.c2pdext", "description": "Pd external", "out_dir": "pdext", "copyright": True}),
+    ("unity", {"stage": "c2unity", "module": "generators.c2unity.c2unity", "description": "Unity plugin", "out_dir": "unity", "copyright": True}),
+    ("vst2", {"stage": "c2vst2", "module": "generators.c2vst2.c2vst2", "description": "VST2 plugin", "out_dir": "vst2.4", "copyright": True}),
+    ("wwise", {"stage": "c2wwise", "module": "generators.c2wwise.c2wwise", "description": "Wwise plugin", "out_dir": "wwise", "copyright": False})
+])
+
+# the modules of all stages. A module is only imported when its stage is first
+# used, such that e.g. generators which are not selected are never loaded.
+_STAGE_MODULES = {
+    "pd2hv": "interpreters.pd2hv.pd2hv",
+    "max2hv": "interpreters.max2hv.max2hv",
+    "hv2ir": "core.hv2ir.hv2ir",
+    "ir2c": "generators.ir2c.ir2c",
+    "ir2c_perf": "generators.ir2c.ir2c_perf"
+}
+_STAGE_MODULES.update((g["stage"], g["module"]) for g in GENERATORS.values())
+
+# the classes of all stages which have been loaded so far
+_stage_classes = {}
+
+def get_stage(stage):
+    """ Returns the class of a compiler stage, importing its module on first use.
+    """
+    if stage not in _stage_classes:
+        module = importlib.import_module(_STAGE_MODULES[stage])
+        _stage_classes[stage] = getattr(module, stage)
+    return _stage_classes[stage]
 
 class Colours:
     purple = "\033[95m"
@@ -126,9 +154,57 @@ def generate_extern_info(hvir, results):
         }
     }
 
+def _run_pooled_generator(task):
+    """ Runs a generator in a worker process. Any exception is reported in the
+        results of the stage, as a string such that it can be returned to the
+        parent process. The worker's profiler records are returned as well.
+    """
+    stage, kwargs, profile = task
+    profiler = Profiler(enabled=profile)
+    try:
+        with profiler.measure(stage):
+            r = get_stage(stage).compile(**kwargs)
+    except Exception as e:
+        r = {
+            "stage": stage,
+            "notifs": {
+                "has_error": True,
+                "exception": e,
+                "errors": [{"message": str(e)}],
+                "warnings": []
+            }
+        }
+    if r["notifs"].get("exception", None) is not None:
+        r["notifs"]["exception"] = str(r["notifs"]["exception"])
+    return (stage, r, profiler.records)
+
 def compile_dataflow(in_path, out_dir, patch_name=None,
         search_paths=None, generators=None, verbose=False,
-        copyright=None, hvir=None):
+        copyright=None, hvir=None, emit_intermediates=False, production=False,
+        cache_dir=None, cache_size=None, jobs=1, incremental=None, profiler=None,
+        buffer_allocation="greedy", signal_ordering="depth-first"):
+    """ Compiles a Pd or Max patch (or a directory of generated C sources) into
+        the requested generator outputs. Each stage hands its result directly
+        to the next one. The intermediate HeavyLang and HeavyIR files are only
+        written to the hv/ and ir/ directories if emit_intermediates is set.
+        In production mode, comments and other editor-only objects are removed
+        from the HeavyLang graph, which is then written as compact JSON.
+        If a cache_dir is given, the C sources of a patch are restored from the
+        cache if neither the patch nor its abstractions have changed. Each
+        cached stage then reports a "cache" hit or miss in its results.
+        The generators are run in a pool of the given number of worker
+        processes if jobs is larger than one. The abstraction files of a Pd
+        patch are then also read in parallel.
+        If an incremental dictionary is given, it keeps the state of the last
+        successful compile. The later stages are then skipped if the HeavyLang
+        graph or the HeavyIR of the patch are unchanged since, and their
+        previous results are reported as "incremental": "skipped". The same
+        dictionary may only be reused with the same arguments.
+        If a profiler is given, it records the time and memory of each stage,
+        of each transformation of the graph, and of each generator.
+        Signal buffers are allocated "greedy"-ly or by "liveness", and signal
+        objects are ordered "depth-first" or by "working-set", see hv2ir.
+    """
 
     results = OrderedDict() # default value, empty dictionary
 
@@ -144,59 +220,142 @@ def compile_dataflow(in_path, out_dir, patch_name=None,
 
     patch_name = patch_name or "heavy"
     generators = generators or {"c"}
+    hv_hash = None
+    ir_hash = None
+    profiler = profiler or Profiler(enabled=False)
+    if incremental is not None:
+        # the state is only restored once the compile has succeeded
+        previous = dict(incremental)
+        incremental.clear()
 
     if in_path.endswith((".pd", ".maxpat")):
         if verbose:
             print "--> Generating C"
-        if in_path.endswith(".pd"):
-            results["pd2hv"] = pd2hv.pd2hv.compile(
-                pd_path=in_path,
-                hv_dir=os.path.join(out_dir, "hv"),
-                search_paths=search_paths,
-                verbose=verbose)
-        elif in_path.endswith(".maxpat"):
-            results["max2hv"] = max2hv.max2hv.compile(
-                max_path=in_path,
-                hv_dir=os.path.join(out_dir, "hv"),
-                search_paths=search_paths,
-                verbose=verbose)
-
-        # check for errors
-        if results.values()[0]["notifs"].get("has_error", False):
-            return results
-
-        results["hv2ir"] = hv2ir.hv2ir.compile(
-            hv_file=os.path.join(results.values()[0]["out_dir"], results.values()[0]["out_file"]),
-            # ensure that the ir filename has no funky characters in it
-            ir_file=os.path.join(out_dir, "ir", re.sub("\W", "_", patch_name)+".heavy.ir.json"),
-            patch_name=patch_name,
-            verbose=verbose)
-
-        # check for errors
-        if results["hv2ir"]["notifs"].get("has_error", False):
-            return results
-
-        # get the hvir data
-        hvir = results["hv2ir"]["ir"]
-        patch_name = hvir["name"]["escaped"]
-        externs = generate_extern_info(hvir, results)
-
         c_src_dir = os.path.join(out_dir, "c")
-        results["ir2c"] = ir2c.ir2c.compile(
-            hv_ir_path=os.path.join(results["hv2ir"]["out_dir"], results["hv2ir"]["out_file"]),
-            static_dir=os.path.join(os.path.dirname(__file__), "generators/ir2c/static"),
-            output_dir=c_src_dir,
-            externs=externs,
-            copyright=copyright)
 
-        # check for errors
-        if results["ir2c"]["notifs"].get("has_error", False):
-            return results
+        cache = CompileCache(cache_dir, cache_size) if cache_dir else None
+        cache_entry = None
+        if cache is not None:
+            cache_key = cache.get_key(in_path, {
+                "patch_name": patch_name,
+                "search_paths": search_paths,
+                "copyright": copyright,
+                "emit_intermediates": bool(emit_intermediates),
+                "production": bool(production),
+                "buffer_allocation": buffer_allocation,
+                "signal_ordering": signal_ordering
+            })
+            cache_entry = cache.load(cache_key)
+
+        if cache_entry is not None:
+            # the patch has been compiled before, restore the cached C sources
+            with profiler.measure("cache"):
+                results.update(cache.restore(cache_entry, out_dir))
+            hvir = results["hv2ir"]["ir"]
+            externs = generate_extern_info(hvir, results)
+        else:
+            hv_dir = os.path.join(out_dir, "hv")
+            if in_path.endswith(".pd"):
+                with profiler.measure("pd2hv"):
+                    results["pd2hv"] = get_stage("pd2hv").compile(
+                        pd_path=in_path,
+                        hv_dir=hv_dir if emit_intermediates else None,
+                        search_paths=search_paths,
+                        verbose=verbose,
+                        production=production,
+                        jobs=jobs)
+            elif in_path.endswith(".maxpat"):
+                with profiler.measure("max2hv"):
+                    results["max2hv"] = get_stage("max2hv").compile(
+                        max_path=in_path,
+                        hv_dir=hv_dir if emit_intermediates else None,
+                        search_paths=search_paths,
+                        verbose=verbose)
+
+            # check for errors
+            if results.values()[0]["notifs"].get("has_error", False):
+                return results
+
+            # the HeavyLang graph is handed over to hv2ir in memory,
+            # it is not kept in the results
+            hv_json = results.values()[0].pop("hv")
+
+            if incremental is not None:
+                # nothing else needs to be done if the HeavyLang graph is unchanged
+                hv_hash = hashlib.sha1(json.dumps(hv_json, sort_keys=True, default=TableValues.to_digest)).hexdigest()
+                if hv_hash == previous.get("hv_hash"):
+                    incremental.update(previous)
+                    return _merge_incremental_results(results, previous)
+
+            with profiler.measure("hv2ir"):
+                results["hv2ir"] = get_stage("hv2ir").compile(
+                    # the hv file is only read if it is not provided in memory,
+                    # but its location is still used to resolve relative paths
+                    hv_file=os.path.join(hv_dir, os.path.splitext(os.path.basename(in_path))[0]+".hv.json"),
+                    # ensure that the ir filename has no funky characters in it
+                    ir_file=os.path.join(out_dir, "ir", re.sub("\W", "_", patch_name)+".heavy.ir.json") \
+                        if emit_intermediates else None,
+                    patch_name=patch_name,
+                    verbose=verbose,
+                    hv_json=hv_json,
+                    profiler=profiler,
+                    buffer_allocation=buffer_allocation,
+                    signal_ordering=signal_ordering)
+
+            # check for errors
+            if results["hv2ir"]["notifs"].get("has_error", False):
+                return results
+
+            # get the hvir data
+            hvir = results["hv2ir"]["ir"]
+
+            if incremental is not None:
+                # e.g. moving an object may change the graph, but not the IR
+                ir_hash = hashlib.sha1(json.dumps(hvir, sort_keys=True, default=TableValues.to_digest)).hexdigest()
+                if ir_hash == previous.get("ir_hash"):
+                    incremental.update(previous, hv_hash=hv_hash)
+                    return _merge_incremental_results(results, previous)
+
+            externs = generate_extern_info(hvir, results)
+
+            with profiler.measure("ir2c"):
+                results["ir2c"] = get_stage("ir2c").compile(
+                    hv_ir_path=os.path.join(results["hv2ir"]["out_dir"], results["hv2ir"]["out_file"]) \
+                        if emit_intermediates else None,
+                    static_dir=os.path.join(os.path.dirname(__file__), "generators/ir2c/static"),
+                    output_dir=c_src_dir,
+                    externs=externs,
+                    copyright=copyright,
+                    ir=hvir)
+
+            # check for errors
+            if results["ir2c"]["notifs"].get("has_error", False):
+                return results
+
+            if cache is not None:
+                # only the results of the cached stages are stored
+                cache_results = OrderedDict((k, r) for k, r in results.iteritems() if k != "hvcc")
+                for r in cache_results.values():
+                    r["cache"] = "miss"
+
+                # all output files of the cached stages, relative to out_dir
+                out_files = [os.path.relpath(os.path.join(c_src_dir, f), out_dir) \
+                    for f in results["ir2c"]["out_files"]]
+                out_files.extend(os.path.relpath(os.path.join(r["out_dir"], r["out_file"]), out_dir) \
+                    for r in cache_results.values() if r["stage"] != "ir2c" and r["out_dir"])
+
+                # pd2hv records all files read during parsing, max2hv only reads the root patch
+                parse_results = cache_results.values()[0]
+                cache.store(cache_key, cache_results, out_dir, out_files,
+                    dependencies=parse_results.get("dependencies", [in_path]),
+                    search_directories=parse_results.get("search_directories", []))
+
+        patch_name = hvir["name"]["escaped"]
 
         # ir2c_perf
         results["ir2c_perf"] = {
             "stage": "ir2c_perf",
-            "obj_counter": ir2c_perf.ir2c_perf.perf(results["hv2ir"]["ir"], verbose=verbose),
+            "obj_counter": get_stage("ir2c_perf").perf(results["hv2ir"]["ir"], verbose=verbose),
             "in_dir": results["hv2ir"]["out_dir"],
             "in_file": results["hv2ir"]["out_file"],
             "notifs": {}
@@ -213,113 +372,234 @@ def compile_dataflow(in_path, out_dir, patch_name=None,
             try:
                 # hvir_dir == project/c/../ir == project/ir
                 hvir_dir = os.path.join(in_path, "..", "ir")
-                hvir_path = os.path.join(hvir_dir, os.listdir(hvir_dir)[0])
+                # the table values are in a sidecar file next to the hvir file
+                hvir_path = os.path.join(hvir_dir, [f for f in os.listdir(hvir_dir) if f.endswith(".json")][0])
                 if os.path.isfile(hvir_path):
-                    with open(hvir_path, "r") as f:
-                        hvir = json.load(f)
-                        patch_name = hvir["name"]["escaped"]
-                        externs = generate_extern_info(hvir, results)
+                    hvir = TableValues.load(hvir_path)
+                    patch_name = hvir["name"]["escaped"]
+                    externs = generate_extern_info(hvir, results)
                 else:
                     return add_error(results, "Cannot find hvir file.")
             except Exception as e:
                 return add_error(results, "ir could not be found or loaded: {0}.".format(e))
 
-    # run the c2x generators, merge the results
     num_input_channels = hvir["signal"]["numInputBuffers"]
     num_output_channels = hvir["signal"]["numOutputBuffers"]
 
-    if "bela" in generators:
-        if verbose:
-            print "--> Generating Bela plugin"
-        results["c2fabric"] = c2bela.c2bela.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "bela"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            verbose=verbose)
-
-    if "fabric" in generators:
-        if verbose:
-            print "--> Generating Fabric plugin"
-        results["c2fabric"] = c2fabric.c2fabric.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "fabric"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            copyright=copyright,
-            verbose=verbose)
-
-    if "js" in generators:
-        if verbose:
-            print "--> Generating Javascript"
-        results["c2js"] = c2js.c2js.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "js"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            copyright=copyright,
-            verbose=verbose)
-
-    if "pdext" in generators:
-        if verbose:
-            print "--> Generating Pd external"
-        results["c2pdext"] = c2pdext.c2pdext.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "pdext"),
-            patch_name=patch_name,
-            ext_name=patch_name+"~",
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            copyright=copyright,
-            verbose=verbose)
-
-    if "unity" in generators:
-        if verbose:
-            print "--> Generating Unity plugin"
-        results["c2unity"] = c2unity.c2unity.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "unity"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            copyright=copyright,
-            verbose=verbose)
-
-    if "vst2" in generators:
-        if verbose:
-            print "--> Generating VST2 plugin"
-        results["c2vst2"] = c2vst2.c2vst2.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "vst2.4"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            copyright=copyright,
-            verbose=verbose)
-
-    if "wwise" in generators:
-        if verbose:
-            print "--> Generating Wwise plugin"
-        results["c2wwise"] = c2wwise.c2wwise.compile(
-            c_src_dir=c_src_dir,
-            out_dir=os.path.join(out_dir, "wwise"),
-            patch_name=patch_name,
-            num_input_channels=num_input_channels,
-            num_output_channels=num_output_channels,
-            externs=externs,
-            verbose=verbose)
+    # run the c2x generators, merge the results
+    tasks = []
+    for gen, g in GENERATORS.iteritems():
+        if gen in generators:
+            kwargs = {
+                "c_src_dir": c_src_dir,
+                "out_dir": os.path.join(out_dir, g["out_dir"]),
+                "patch_name": patch_name,
+                "num_input_channels": num_input_channels,
+                "num_output_channels": num_output_channels,
+                "externs": externs,
+                "verbose": verbose
+            }
+            if g["copyright"]:
+                kwargs["copyright"] = copyright
+            if gen == "pdext":
+                kwargs["ext_name"] = patch_name+"~"
+            tasks.append((g["stage"], kwargs, profiler.enabled))
+
+            if verbose:
+                print "--> Generating {0}".format(g["description"])
+
+    if jobs > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            # map() returns the results in the order of the tasks
+            for stage, r, records in pool.map(_run_pooled_generator, tasks):
+                results[stage] = r
+                profiler.add_records(records)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for stage, kwargs, _ in tasks:
+            with profiler.measure(stage):
+                results[stage] = get_stage(stage).compile(**kwargs)
+
+    if incremental is not None:
+        # only a successful compile can be reused
+        if not any(r["notifs"].get("has_error", False) for r in results.values()):
+            incremental.update({"hv_hash": hv_hash, "ir_hash": ir_hash, "results": results})
 
     return results
 
+def _merge_incremental_results(results, previous):
+    """ Adds the previous results of all stages that were skipped.
+    """
+    for stage, r in previous["results"].iteritems():
+        if stage not in results:
+            results[stage] = dict(r, incremental="skipped")
+    return results
+
+def _get_modification_times(paths):
+    mtimes = {}
+    for p in paths:
+        try:
+            mtimes[p] = os.path.getmtime(p)
+        except OSError:
+            mtimes[p] = None
+    return mtimes
+
+def watch(in_path, out_dir, interval=0.5, **kwargs):
+    """ Compiles a patch, and recompiles it whenever the patch, one of its
+        abstractions or one of the directories that abstractions were searched
+        in changes. Only the stages affected by a change are run again, and
+        only the C sources whose content has changed are rewritten.
+        Runs until interrupted.
+    """
+    incremental = {}
+    watched_paths = {in_path}
+    while True:
+        tick = time.time()
+        results = compile_dataflow(in_path, out_dir, incremental=incremental, **kwargs)
+        print_results(results)
+
+        parse_results = results.get("pd2hv", {})
+        if "dependencies" in parse_results:
+            watched_paths = {in_path}
+            watched_paths.update(parse_results["dependencies"])
+            watched_paths.update(parse_results["search_directories"])
+
+        skipped = [k for k, r in results.iteritems() if r.get("incremental") == "skipped"]
+        num_written = sum(r["files"]["written"] for k, r in results.iteritems() \
+            if "files" in r and k not in skipped)
+        print "Compiled {0} in {1:.2f}ms{2}, {3} files written. Watching {4} files for changes...".format(
+            os.path.basename(in_path),
+            1000*(time.time()-tick),
+            " (skipped {0})".format(", ".join(skipped)) if skipped else "",
+            num_written,
+            len(watched_paths))
+
+        mtimes = _get_modification_times(watched_paths)
+        while _get_modification_times(watched_paths) == mtimes:
+            time.sleep(interval)
+
+def _compile_pooled_patch(kwargs):
+    """ Compiles a patch in a worker process. Exceptions are reported as
+        strings, such that the results can be returned to the parent process.
+    """
+    results = compile_dataflow(**kwargs)
+    for r in results.values():
+        if r["notifs"].get("exception", None) is not None:
+            r["notifs"]["exception"] = str(r["notifs"]["exception"])
+    return results
+
+def compile_many(patches, jobs=1, **kwargs):
+    """ Compiles many patches in one process, or in a pool of the given number
+        of worker processes. Each patch is a dictionary of compile_dataflow()
+        arguments, which override the common keyword arguments.
+        Compiling in one process only imports the compiler once, and reuses
+        loaded definitions and template environments across all patches.
+        Returns a list of the results of each patch, in the order of the patches.
+    """
+    tasks = []
+    for p in patches:
+        task = dict(kwargs)
+        task.update(p)
+        tasks.append(task)
+
+    if jobs > 1 and len(tasks) > 1:
+        # worker processes cannot start their own pools of generators
+        for task in tasks:
+            task["jobs"] = 1
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            return pool.map(_compile_pooled_patch, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        return [compile_dataflow(**task) for task in tasks]
+
+def load_batch_manifest(manifest_path):
+    """ Returns the list of patches in a batch manifest, with the keys of each
+        patch renamed to compile_dataflow() arguments. Relative paths are
+        resolved against the directory of the manifest.
+        The manifest has the form:
+        {"patches": [{"in_path": "", "out_dir": "", "name": "", "gen": [],
+            "search_paths": [], "copyright": "", "results_path": ""}]}
+    """
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    resolve = lambda x: os.path.join(manifest_dir, os.path.expanduser(x))
+
+    patches = []
+    for p in manifest["patches"]:
+        patch = {"in_path": os.path.abspath(resolve(p["in_path"]))}
+        patch["out_dir"] = resolve(p["out_dir"]) if "out_dir" in p \
+            else os.path.dirname(patch["in_path"])
+        patch["results_path"] = resolve(p["results_path"]) if "results_path" in p \
+            else os.path.join(patch["out_dir"], "results.json")
+        if "name" in p:
+            patch["patch_name"] = p["name"]
+        if "gen" in p:
+            patch["generators"] = p["gen"]
+        if "search_paths" in p:
+            patch["search_paths"] = [resolve(x) for x in p["search_paths"]]
+        if "copyright" in p:
+            patch["copyright"] = p["copyright"]
+        patches.append(patch)
+    return patches
+
+def serve(socket_path=None, **kwargs):
+    """ Runs a compile server until it receives a shutdown request. Requests
+        are read from the given UNIX socket, or from stdin if no socket is
+        given. The keyword arguments are the default compile_dataflow()
+        arguments of all requests.
+    """
+    server = CompileServer(compile_dataflow, defaults=kwargs)
+    if socket_path:
+        server.serve_socket(socket_path)
+    else:
+        server.serve_stdio()
+
+def print_results(results):
+    """ Prints all errors and warnings in the results. Exceptions are cleared
+        such that the results can be JSONified.
+    """
+    for r in results.values():
+        # print any errors
+        if r["notifs"].get("has_error", False):
+            for i,error in enumerate(r["notifs"].get("errors", [])):
+                print "{4:3d}) {2}Error{3} {0}: {1}".format(
+                    r["stage"], error["message"], Colours.red, Colours.end, i+1)
+
+            # only print exception if no errors are indicated
+            if len(r["notifs"].get("errors", [])) == 0 and \
+            r["notifs"].get("exception",None) is not None:
+                print "{2}Error{3} {0} exception: {1}".format(
+                    r["stage"], r["notifs"]["exception"], Colours.red, Colours.end)
+
+            # clear any exceptions such that results can be JSONified if necessary
+            r["notifs"]["exception"] = []
+
+        # print any warnings
+        for i,warning in enumerate(r["notifs"].get("warnings", [])):
+            print "{4:3d}) {2}Warning{3} {0}: {1}".format(
+                r["stage"], warning["message"], Colours.yellow, Colours.end, i+1)
+
+def write_results(results, results_path):
+    """ Writes the results dictionary to the given path as JSON.
+    """
+    results_path = os.path.realpath(os.path.abspath(results_path))
+    results_dir = os.path.dirname(results_path)
+
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+
+    with open(results_path, "w") as f:
+        # the results are self-contained, table values are not written to a sidecar file
+        json.dump(results, f, default=TableValues.to_list)
+
 def main():
     tick = time.time()
 
@@ -327,6 +607,7 @@ def main():
         description="This is the Enzien Audio Heavy compiler. It compiles supported dataflow languages into C, and other supported frameworks.")
     parser.add_argument(
         "in_path",
+        nargs="?",
         help="The input dataflow file.")
     parser.add_argument(
         "-o",
@@ -359,48 +640,161 @@ def main():
     parser.add_argument(
         "--copyright",
         help="A string indicating the owner of the copyright.")
+    parser.add_argument(
+        "--emit-intermediates",
+        help="Write the intermediate HeavyLang (hv) and HeavyIR (ir) files to the output directory.",
+        action="count")
+    parser.add_argument(
+        "--production",
+        help="Remove comments and other editor-only objects from the HeavyLang graph, and write it as compact JSON. The generated code behaves the same.",
+        action="count")
+    parser.add_argument(
+        "--buffer-allocation",
+        choices=["greedy", "liveness"],
+        default="greedy",
+        help="How signal buffers are allocated. greedy assigns them by the number of connections of each outlet. liveness reuses a buffer as soon as its value has been read for the last time, which may need fewer temporary buffers.")
+    parser.add_argument(
+        "--signal-ordering",
+        choices=["depth-first", "working-set"],
+        default="depth-first",
+        help="How signal objects are ordered. depth-first orders the parents of each object in the order of its connections. working-set orders them such that fewer signal buffers are live at the same time, and each buffer is read soon after it has been written.")
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache the generated C sources in this directory, and reuse them if the patch has not changed.")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=CompileCache.DEFAULT_MAX_SIZE/(1024*1024),
+        help="The maximum size of the cache in megabytes. Least recently used entries are evicted first.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of generators and abstraction files to process in parallel, or the number of patches with --batch.")
+    parser.add_argument(
+        "--batch",
+        help="Compile all patches listed in a JSON manifest in one process. The results of each patch are written to its results_path, or to results.json in its output directory.")
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="-",
+        metavar="SOCKET_PATH",
+        help="Run as a compile server, which accepts JSON-RPC compile requests on a UNIX socket, or on stdin if no socket path (or -) is given.")
+    parser.add_argument(
+        "--watch",
+        help="Recompile the patch whenever it or any of its abstractions change. Only the stages and files affected by a change are regenerated.",
+        action="count")
+    parser.add_argument(
+        "--profile",
+        help="Record the time and peak memory of each stage, graph transformation and generator. These are printed and added to the results.",
+        action="count")
+    parser.add_argument(
+        "--profile-dump",
+        help="Also profile the compiler with cProfile, and write the statistics to the given path. They can be read with the pstats module.")
     args = parser.parse_args()
 
-    in_path = os.path.abspath(args.in_path)
-    results = compile_dataflow(
-        in_path=in_path,
-        out_dir=args.out_dir or os.path.dirname(in_path),
-        patch_name=args.name,
-        search_paths=args.search_paths,
-        generators=args.gen,
-        verbose=args.verbose,
-        copyright=args.copyright)
-
-    for r in results.values():
-        # print any errors
-        if r["notifs"].get("has_error", False):
-            for i,error in enumerate(r["notifs"].get("errors", [])):
-                print "{4:3d}) {2}Error{3} {0}: {1}".format(
-                    r["stage"], error["message"], Colours.red, Colours.end, i+1)
-
-            # only print exception if no errors are indicated
-            if len(r["notifs"].get("errors", [])) == 0 and \
-            r["notifs"].get("exception",None) is not None:
-                print "{2}Error{3} {0} exception: {1}".format(
-                    r["stage"], r["notifs"]["exception"], Colours.red, Colours.end)
+    if args.serve:
+        serve(
+            socket_path=None if args.serve == "-" else args.serve,
+            search_paths=args.search_paths,
+            verbose=args.verbose,
+            copyright=args.copyright,
+            emit_intermediates=args.emit_intermediates,
+            production=args.production,
+            buffer_allocation=args.buffer_allocation,
+            signal_ordering=args.signal_ordering,
+            cache_dir=args.cache_dir,
+            cache_size=args.cache_size*1024*1024,
+            jobs=args.jobs)
+        return
+
+    if args.batch:
+        patches = load_batch_manifest(args.batch)
+        batch_results = compile_many(
+            patches=[{k:v for k,v in p.iteritems() if k != "results_path"} for p in patches],
+            jobs=args.jobs,
+            patch_name=args.name,
+            search_paths=args.search_paths,
+            generators=args.gen,
+            verbose=args.verbose,
+            copyright=args.copyright,
+            emit_intermediates=args.emit_intermediates,
+            production=args.production,
+            buffer_allocation=args.buffer_allocation,
+            signal_ordering=args.signal_ordering,
+            cache_dir=args.cache_dir,
+            cache_size=args.cache_size*1024*1024)
+
+        for p, results in zip(patches, batch_results):
+            print "{0}:".format(p["in_path"])
+            print_results(results)
+            write_results(results, p["results_path"])
+
+        if args.verbose:
+            print "Total compile time: {0:.2f}ms".format(1000*(time.time()-tick))
+        return
+    elif args.in_path is None:
+        parser.error("Either an input dataflow file, --batch or --serve is required.")
 
-            # clear any exceptions such that results can be JSONified if necessary
-            r["notifs"]["exception"] = []
+    in_path = os.path.abspath(args.in_path)
 
-        # print any warnings
-        for i,warning in enumerate(r["notifs"].get("warnings", [])):
-            print "{4:3d}) {2}Warning{3} {0}: {1}".format(
-                r["stage"], warning["message"], Colours.yellow, Colours.end, i+1)
+    if args.watch:
+        try:
+            watch(
+                in_path=in_path,
+                out_dir=args.out_dir or os.path.dirname(in_path),
+                patch_name=args.name,
+                search_paths=args.search_paths,
+                generators=args.gen,
+                verbose=args.verbose,
+                copyright=args.copyright,
+                emit_intermediates=args.emit_intermediates,
+                production=args.production,
+                buffer_allocation=args.buffer_allocation,
+                signal_ordering=args.signal_ordering,
+                cache_dir=args.cache_dir,
+                cache_size=args.cache_size*1024*1024,
+                jobs=args.jobs)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    profiler = Profiler(
+        enabled=bool(args.profile or args.profile_dump),
+        cprofile=bool(args.profile_dump))
+    with profiler.measure("hvcc"):
+        results = compile_dataflow(
+            in_path=in_path,
+            out_dir=args.out_dir or os.path.dirname(in_path),
+            patch_name=args.name,
+            search_paths=args.search_paths,
+            generators=args.gen,
+            verbose=args.verbose,
+            copyright=args.copyright,
+            emit_intermediates=args.emit_intermediates,
+            production=args.production,
+            buffer_allocation=args.buffer_allocation,
+            signal_ordering=args.signal_ordering,
+            cache_dir=args.cache_dir,
+            cache_size=args.cache_size*1024*1024,
+            jobs=args.jobs,
+            profiler=profiler)
+
+    print_results(results)
+
+    if profiler.enabled:
+        results["profile"] = {
+            "stage": "profile",
+            "notifs": {},
+            "sections": profiler.records
+        }
+        Profiler.print_records(profiler.records)
+        if args.profile_dump:
+            profiler.dump_cprofile(args.profile_dump)
 
     if args.results_path:
-        results_path = os.path.realpath(os.path.abspath(args.results_path))
-        results_dir = os.path.dirname(results_path)
-
-        if not os.path.exists(results_dir):
-            os.makedirs(results_dir)
-
-        with open(results_path, "w") as f:
-            json.dump(results, f)
+        write_results(results, args.results_path)
 
     if args.verbose:
         print "Total compile time: {0:.2f}ms".format(1000*(time.time()-tick))
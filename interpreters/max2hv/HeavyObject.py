@@ -8,22 +8,34 @@ from MaxObject import MaxObject
 
 class HeavyObject(MaxObject):
 
-    with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.lang.json"), "r") as f:
-        __HEAVY_LANG_OBJS = json.loads(f.read())
-
-    with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
-        __HEAVY_IR_OBJS = json.loads(f.read())
+    # the HeavyLang and HeavyIR object definitions, loaded on first use
+    __HEAVY_LANG_OBJS = None
+    __HEAVY_IR_OBJS = None
 
     __re_dollar = re.compile("\$(\d+)")
 
+    @classmethod
+    def __get_heavy_lang_objs(clazz):
+        if HeavyObject.__HEAVY_LANG_OBJS is None:
+            with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.lang.json"), "r") as f:
+                HeavyObject.__HEAVY_LANG_OBJS = json.loads(f.read())
+        return HeavyObject.__HEAVY_LANG_OBJS
+
+    @classmethod
+    def __get_heavy_ir_objs(clazz):
+        if HeavyObject.__HEAVY_IR_OBJS is None:
+            with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
+                HeavyObject.__HEAVY_IR_OBJS = json.loads(f.read())
+        return HeavyObject.__HEAVY_IR_OBJS
+
     def __init__(self, obj_type, obj_args=None, obj_id=None, pos_x=0, pos_y=0):
         MaxObject.__init__(self, obj_type, obj_args, obj_id, pos_x, pos_y)
 
         # get the object dictionary (note that it is NOT a copy)
         if self.is_hvlang:
-            self.__obj_dict = HeavyObject.__HEAVY_LANG_OBJS[obj_type]
+            self.__obj_dict = HeavyObject.__get_heavy_lang_objs()[obj_type]
         elif self.is_hvir:
-            self.__obj_dict = HeavyObject.__HEAVY_IR_OBJS[obj_type]
+            self.__obj_dict = HeavyObject.__get_heavy_ir_objs()[obj_type]
         else:
             raise Exception("{0} is not a Heavy Lang or IR object.".format(obj_type))
 
@@ -47,16 +59,16 @@ class HeavyObject(MaxObject):
 
     @classmethod
     def is_heavy(clazz, obj_type):
-        return (obj_type in HeavyObject.__HEAVY_LANG_OBJS) or \
-            (obj_type in HeavyObject.__HEAVY_IR_OBJS)
+        return (obj_type in HeavyObject.__get_heavy_lang_objs()) or \
+            (obj_type in HeavyObject.__get_heavy_ir_objs())
 
     @property
     def is_hvlang(self):
-        return self.obj_type in HeavyObject.__HEAVY_LANG_OBJS
+        return self.obj_type in HeavyObject.__get_heavy_lang_objs()
 
     @property
     def is_hvir(self):
-        return self.obj_type in HeavyObject.__HEAVY_IR_OBJS
+        return self.obj_type in HeavyObject.__get_heavy_ir_objs()
 
     def get_outlet_connection_type(self, outlet_index):
         # TODO(mhroth): it's stupid that hvlang and hvir json have different
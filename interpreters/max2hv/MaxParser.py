@@ -14,16 +14,49 @@ from MaxUnopObject import MaxUnopObject
 
 class MaxParser:
 
+    __MAXLIB_DIR = os.path.join(os.path.dirname(__file__), "maxlib")
+
+    # the names of the files in the maxlib directory, (mtime, set(names)),
+    # and the parsed maxlib abstractions, {path: (mtime, patch)}.
+    # These are shared by all compiles in this process (e.g. in batch or
+    # server mode), for as long as the files are not modified. Parsing a
+    # graph does not modify the patch, so one copy serves all instances.
+    __maxlib_names = None
+    __maxlib_files = {}
+
     @classmethod
     def graph_from_file(clazz, file_path, obj_id=None, obj_args=None):
         with open(file_path, "r") as f:
-            graph_obj = json.loads(f.read())
+            graph_obj = json.load(f)
 
         return MaxParser.graph_from_object(graph_obj, obj_id, obj_args, file_path)
 
+    @classmethod
+    def __get_maxlib_names(clazz):
+        """ Returns the names of all files in the maxlib directory.
+        """
+        mtime = os.path.getmtime(MaxParser.__MAXLIB_DIR)
+        if MaxParser.__maxlib_names is None or MaxParser.__maxlib_names[0] != mtime:
+            MaxParser.__maxlib_names = (mtime, set(os.listdir(MaxParser.__MAXLIB_DIR)))
+        return MaxParser.__maxlib_names[1]
+
+    @classmethod
+    def __get_maxlib_patch(clazz, max_path):
+        """ Returns the parsed JSON of a maxlib abstraction. Every file is only
+            parsed again if it has been modified.
+        """
+        mtime = os.path.getmtime(max_path)
+        entry = MaxParser.__maxlib_files.get(max_path)
+        if entry is None or entry[0] != mtime:
+            with open(max_path, "r") as f:
+                entry = (mtime, json.load(f))
+            MaxParser.__maxlib_files[max_path] = entry
+        return entry[1]
+
     @classmethod
     def graph_from_object(clazz, obj, obj_id=None, obj_args=None, max_path=None):
         g = MaxGraph(obj_args=obj_args, obj_id=obj_id, max_path=max_path)
+        maxlib_names = MaxParser.__get_maxlib_names()
 
         # parse objects
         for o in obj["patcher"]["boxes"]:
@@ -66,9 +99,10 @@ class MaxParser:
 
                 # do we have an abstraction for this max object? Is it in the maxlib?
                 # TODO(mhroth): are there any other search paths to look through?
-                elif os.path.isfile(os.path.join(os.path.dirname(__file__), "maxlib", obj_type+".maxpat")):
-                    max_path = os.path.join(os.path.dirname(__file__), "maxlib", obj_type+".maxpat")
-                    x = MaxParser.graph_from_file(max_path, obj_id, obj_args)
+                elif obj_type+".maxpat" in maxlib_names:
+                    max_path = os.path.join(MaxParser.__MAXLIB_DIR, obj_type+".maxpat")
+                    x = MaxParser.graph_from_object(
+                        MaxParser.__get_maxlib_patch(max_path), obj_id, obj_args, max_path)
 
                 # is this an object that must be programmatically parsed?
                 elif obj_type in MaxParser.__MAX_CLASSES:
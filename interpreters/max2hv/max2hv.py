@@ -14,21 +14,25 @@ class max2hv:
         tick = time.time()
 
         max_graph = MaxParser.graph_from_file(max_path)
+        hv_graph = max_graph.to_hv()
 
-        if not os.path.exists(hv_dir):
-            os.makedirs(hv_dir)
+        if hv_dir is not None:
+            if not os.path.exists(hv_dir):
+                os.makedirs(hv_dir)
 
-        hv_file = os.path.basename(max_path).split(".")[0] + ".hv.json"
-        hv_path = os.path.join(hv_dir, hv_file)
-        with open(hv_path, "w") as f:
-            if verbose:
-                f.write(json.dumps(
-                    max_graph.to_hv(),
-                    sort_keys=True,
-                    indent=2,
-                    separators=(",", ": ")))
-            else:
-                f.write(json.dumps(max_graph.to_hv()))
+            hv_file = os.path.basename(max_path).split(".")[0] + ".hv.json"
+            hv_path = os.path.join(hv_dir, hv_file)
+            with open(hv_path, "w") as f:
+                if verbose:
+                    f.write(json.dumps(
+                        hv_graph,
+                        sort_keys=True,
+                        indent=2,
+                        separators=(",", ": ")))
+                else:
+                    f.write(json.dumps(hv_graph))
+        else:
+            hv_file = None
 
         return {
             "stage": "max2hv",
@@ -41,7 +45,8 @@ class max2hv:
             "in_file": os.path.basename(max_path),
             "out_dir": hv_dir,
             "out_file": hv_file,
-            "compile_time": (time.time() - tick)
+            "compile_time": (time.time() - tick),
+            "hv": hv_graph
         }
 
 def main():
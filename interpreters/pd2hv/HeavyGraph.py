@@ -14,12 +14,53 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
+import marshal
 import os
 
 from PdObject import PdObject
 from HeavyObject import HeavyObject
 
 class HeavyGraph(PdObject):
+
+    # the parsed Heavy graphs, shared by all instances.
+    # {path: (mtime, marshalled graph, {arg name: [(object id, key)]}, outlet connection types)}
+    __hv_graphs = {}
+
+    @classmethod
+    def __get_hv_graph(clazz, hv_path):
+        """ Returns the parsed Heavy graph at the given path. The graph is
+            marshalled, such that each instance can cheaply get its own copy.
+            All object arguments which refer to a graph argument are indexed
+            by the name of the argument.
+        """
+        hv_path = os.path.abspath(hv_path)
+        mtime = os.path.getmtime(hv_path)
+        entry = HeavyGraph.__hv_graphs.get(hv_path)
+        if entry is None or entry[0] != mtime:
+            # read the heavy graph
+            with open(hv_path, "r") as f:
+                hv_json = json.load(f)
+
+            # parse the heavy data structure to determine the outlet connection type
+            outlets = [o for o in hv_json["objects"].values() if o["type"] == "outlet"]
+            outlets.sort(key=lambda o:o["args"]["index"])
+
+            # index all object arguments of the form "$name"
+            arg_slots = {}
+            for obj_id, o in hv_json["objects"].iteritems():
+                for k,v in o["args"].iteritems():
+                    # TODO(mhroth): make resolution more robust
+                    if isinstance(v, basestring) and v.startswith("$"):
+                        arg_slots.setdefault(v[1:], []).append((obj_id, k))
+
+            entry = (
+                mtime,
+                marshal.dumps(hv_json),
+                arg_slots,
+                [o["args"]["type"] for o in outlets])
+            HeavyGraph.__hv_graphs[hv_path] = entry
+        return entry
+
     def __init__(self, hv_path, obj_args=None, pos_x=0, pos_y=0):
         PdObject.__init__(
             self,
@@ -27,14 +68,9 @@ class HeavyGraph(PdObject):
             obj_args,
             pos_x, pos_y)
 
-        # read the heavy graph
-        with open(hv_path, "r") as f:
-            self.hv_json = json.load(f)
-
-        # parse the heavy data structure to determine the outlet connection type
-        outlets = [o for o in self.hv_json["objects"].values() if o["type"] == "outlet"]
-        sorted(outlets, key=lambda o:o["args"]["index"])
-        self.__outlet_connection_types = [o["args"]["type"] for o in outlets]
+        _, hv_graph, arg_slots, self.__outlet_connection_types = \
+            HeavyGraph.__get_hv_graph(hv_path)
+        self.hv_json = marshal.loads(hv_graph) # a copy of the graph
 
         # resolve the arguments
         for i,a in enumerate(self.hv_json["args"]):
@@ -57,11 +93,8 @@ class HeavyGraph(PdObject):
                         str(e)))
 
             # resolve all arguments for each object in the graph
-            for o in self.hv_json["objects"].values():
-                for k,v in o["args"].items():
-                    # TODO(mhroth): make resolution more robust
-                    if v == "$"+a["name"]:
-                        o["args"][k] = arg_value
+            for obj_id, k in arg_slots.get(a["name"], []):
+                self.hv_json["objects"][obj_id]["args"][k] = arg_value
 
         # reset all arguments, as they have all been resolved
         # any required arguments would break hv2ir as they will no longer
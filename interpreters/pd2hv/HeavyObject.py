@@ -20,22 +20,36 @@ import os
 from NotificationEnum import NotificationEnum
 from PdObject import PdObject
 
+from core.tables.TableValues import TableValues
+
 class HeavyObject(PdObject):
 
-    with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.lang.json"), "r") as f:
-        __HEAVY_LANG_OBJS = json.load(f)
+    # the HeavyLang and HeavyIR object definitions, loaded on first use
+    __HEAVY_LANG_OBJS = None
+    __HEAVY_IR_OBJS = None
+
+    @classmethod
+    def __get_heavy_lang_objs(clazz):
+        if HeavyObject.__HEAVY_LANG_OBJS is None:
+            with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.lang.json"), "r") as f:
+                HeavyObject.__HEAVY_LANG_OBJS = json.load(f)
+        return HeavyObject.__HEAVY_LANG_OBJS
 
-    with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
-        __HEAVY_IR_OBJS = json.load(f)
+    @classmethod
+    def __get_heavy_ir_objs(clazz):
+        if HeavyObject.__HEAVY_IR_OBJS is None:
+            with open(os.path.join(os.path.dirname(__file__), "../../core/json/heavy.ir.json"), "r") as f:
+                HeavyObject.__HEAVY_IR_OBJS = json.load(f)
+        return HeavyObject.__HEAVY_IR_OBJS
 
     def __init__(self, obj_type, obj_args=None, pos_x=0, pos_y=0):
         PdObject.__init__(self, obj_type, obj_args, pos_x, pos_y)
 
         # get the object dictionary (note that it is NOT a copy)
         if self.is_hvlang:
-            self.__obj_dict = HeavyObject.__HEAVY_LANG_OBJS[obj_type]
+            self.__obj_dict = HeavyObject.__get_heavy_lang_objs()[obj_type]
         elif self.is_hvir:
-            self.__obj_dict = HeavyObject.__HEAVY_IR_OBJS[obj_type]
+            self.__obj_dict = HeavyObject.__get_heavy_ir_objs()[obj_type]
         else:
             assert False, "{0} is not a Heavy Lang or IR object.".format(obj_type)
 
@@ -100,6 +114,8 @@ class HeavyObject(PdObject):
             else:
                 return bool(value)
         elif value_type == "floatarray":
+            if TableValues.is_values(value):
+                return value # table values are already floats
             if isinstance(value, list):
                 return [float(v) for v in value]
             if isinstance(value, str) or isinstance(value, unicode):
@@ -129,11 +145,11 @@ class HeavyObject(PdObject):
 
     @property
     def is_hvlang(self):
-        return self.obj_type in HeavyObject.__HEAVY_LANG_OBJS
+        return self.obj_type in HeavyObject.__get_heavy_lang_objs()
 
     @property
     def is_hvir(self):
-        return self.obj_type in HeavyObject.__HEAVY_IR_OBJS
+        return self.obj_type in HeavyObject.__get_heavy_ir_objs()
 
     def get_inlet_connection_type(self, inlet_index):
         """ Returns the inlet connection type, None if the inlet does not exist.
@@ -58,6 +58,9 @@ class PdGraph(PdObject):
 
     def add_object(self, obj):
         obj.parent_graph = self
+        # the object id is based on its index in the graph, such that it
+        # remains the same as long as the patch is not reordered
+        obj.obj_id = "{0}_{1}".format(obj.obj_type, len(self.__objs))
         self.__objs.append(obj)
 
         if obj.obj_type in ["inlet", "inlet~"]:
@@ -14,23 +14,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from collections import defaultdict
-import random
-import string
 
 from interpreters.pd2hv.NotificationEnum import NotificationEnum
 
 class PdObject:
 
-    __RANDOM = random.Random()
-    __ID_CHARS = string.ascii_letters + string.digits
-
     def __init__(self, obj_type, obj_args=None, pos_x=0, pos_y=0):
         self.obj_type = obj_type
         # all arguments should be resolved when passed to a PdObject
         self.obj_args = obj_args or []
-        self.obj_id = "{0}_{1}".format(
-            obj_type,
-            "".join(PdObject.__RANDOM.choice(PdObject.__ID_CHARS) for _ in xrange(8)))
+        # the object id is made unique when the object is added to a graph
+        self.obj_id = obj_type
         self.pos_x = pos_x
         self.pos_y = pos_y
 
@@ -14,8 +14,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from collections import Counter
-from collections import OrderedDict
 import decimal
+import marshal
+import multiprocessing
 import os
 import re
 
@@ -34,11 +35,26 @@ from PdSelectObject import PdSelectObject     # select/sel
 from PdSendObject import PdSendObject         # s/s~/send/send~/throw~
 from PdTriggerObject import PdTriggerObject   # trigger/t
 from PdTableObject import PdTableObject       # table
+from PdTokenizer import PdRecord, PdTokenizer # .pd file records
 from PdUnpackObject import PdUnpackObject     # unpack
 from PdLibSignalGraph import PdLibSignalGraph # pd/lib abstraction connection checks
 
+from core.tables.TableValues import TableValues
+
 from NotificationEnum import NotificationEnum
 
+def _tokenize_pooled(pd_path):
+    """ Tokenizes a Pd file in a worker process. The records are returned
+        marshalled, which is much faster than pickling them. A file which
+        cannot be read is returned without records. It is then read again
+        while the graph is assembled, such that any error is reported in its
+        usual place.
+    """
+    try:
+        return pd_path, marshal.dumps([tuple(r) for r in PdTokenizer.tokenize(pd_path)])
+    except Exception:
+        return pd_path, None
+
 class PdParser:
 
     # library search paths
@@ -47,12 +63,14 @@ class PdParser:
     __PDLIB_DIR = os.path.join(os.path.dirname(__file__), "libs", "pd")
     __PDLIB_CONVERTED_DIR = os.path.join(os.path.dirname(__file__), "libs", "pd_converted")
 
+    # the records of the library files, shared by all parsers.
+    # {path: (mtime, records)}
+    __LIB_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "libs", "")
+    __lib_files = {}
+
     # detect a dollar argument in a string
     __RE_DOLLAR = re.compile("\$(\d+)")
 
-    # detect width parameter e.g. "#X obj 172 79 t b b, f 22;"
-    __RE_WIDTH = re.compile(", f \d+$")
-
     def __init__(self):
         # the current global value of $0
         # Note(joe): set a high starting value to avoid potential user naming conflicts
@@ -64,6 +82,27 @@ class PdParser:
         # search paths at this graph level
         self.__search_paths = []
 
+        # the set of all files read while parsing, including abstractions
+        self.dependencies = set()
+
+        # the set of all directories searched for abstractions
+        self.search_directories = set()
+
+        # the records of all files read by this parser, {path: records}
+        self.__files = {}
+
+        # the names of the files in each directory searched so far, {dir: set(names)}
+        self.__dir_index = {}
+
+        # the resolved abstractions, {(local_dir, abs_name): (path, num_lookups)}
+        # This is cleared whenever the search paths change.
+        self.__abs_paths = {}
+
+        # the number of directory listings made, and the number of file
+        # lookups answered from them, each of which used to be an isfile call
+        self.num_fs_calls = 0
+        self.num_file_lookups = 0
+
     @classmethod
     def get_supported_objects(clazz):
         """ Returns a set of all pd objects names supported by the parser.
@@ -72,42 +111,124 @@ class PdParser:
         pd_objects.extend(PdParser.__PD_CLASSES.keys())
         return pd_objects
 
-    @classmethod
-    def __get_hv_args(clazz, pd_path):
-        """ Pre-parse the file for Heavy arguments, such that they are available
-            as soon as a graph is created.
+    def __get_records(self, pd_path):
+        """ Returns the records of a Pd file. Every file is read at most once
+            by a parser. Library files are additionally shared between parsers,
+            for as long as they are not modified.
         """
-        num_canvas = -1
-        hv_arg_dict = OrderedDict()
-        hv_arg_list = None
-        with open(pd_path, "r") as f:
-            for l in f:
-                if l.startswith("#N canvas"):
-                    hv_arg_list = []
-                    hv_arg_dict[l.rstrip(";\r\n")] = hv_arg_list
-                    num_canvas += 1
-                elif "@hv_arg" in l:
-                    hv_arg_list.append(l.rstrip(";\r\n"))
-                elif l.startswith("#X restore"):
-                    num_canvas -= 1
-                    hv_arg_list = hv_arg_dict.values()[num_canvas]
-        return hv_arg_dict
-
-    @classmethod
-    def __get_pd_line(clazz, pd_path):
-        concat = "" # concatination state
-        with open(pd_path, "r") as f:
-            for l in f:
-                # concatenate split lines in the Pd file here
-                l = l.rstrip("\r\n") # account for windows CRLF
-                if l.endswith(";") and not l.endswith("\;"):
-                    out = l[:-1] # remove single ";"
-                    if len(concat) > 0:
-                        out = concat + " " + out
-                        concat = "" # reset concatenation state
-                    yield out
+        pd_path = os.path.abspath(pd_path)
+        records = self.__files.get(pd_path)
+        if records is None:
+            if pd_path.startswith(PdParser.__LIB_DIR):
+                mtime = os.path.getmtime(pd_path)
+                entry = PdParser.__lib_files.get(pd_path)
+                if entry is None or entry[0] != mtime:
+                    entry = (mtime, PdTokenizer.tokenize(pd_path))
+                    PdParser.__lib_files[pd_path] = entry
+                records = entry[1]
+            else:
+                records = PdTokenizer.tokenize(pd_path)
+            self.__files[pd_path] = records
+        return records
+
+    def prefetch_abstractions(self, file_path, jobs):
+        """ Tokenizes the abstraction files which a patch refers to in a pool
+            of the given number of worker processes, before the graph is
+            assembled. The files are discovered level by level, and the files
+            of each level are tokenized concurrently. The graph is then
+            assembled serially from the tokenized files, such that $0 and the
+            order of all objects are the same as without prefetching.
+            Library files are not prefetched, they are shared between parsers.
+            Abstractions are resolved with find_abstraction_path(), with the
+            search paths which the root patch adds, and the directories listed
+            while doing so are not listed again. The search paths are restored
+            afterwards, as they are added again while the graph is assembled.
+            Returns the number of abstraction files which were prefetched.
+        """
+        root_path = os.path.abspath(file_path)
+        search_paths = list(self.__search_paths)
+        search_directories = set(self.search_directories)
+        self.__search_paths.append(os.path.dirname(root_path)) # as in graph_from_file()
+        self.__abs_paths.clear()
+
+        def tokenize(pd_path):
+            try:
+                return PdTokenizer.tokenize(pd_path)
+            except Exception:
+                return None # the error is reported when the graph is assembled
+
+        num_prefetched = 0
+        pool = None
+        pending = [root_path]
+        try:
+            while pending:
+                if jobs > 1 and len(pending) > 1:
+                    if pool is None:
+                        pool = multiprocessing.Pool(jobs)
+                    tokenized = [(p, [PdRecord._make(r) for r in marshal.loads(m)] if m else None) \
+                        for p, m in pool.map(_tokenize_pooled, pending, chunksize=1)]
                 else:
-                    concat = (concat + " " + l) if len(concat) > 0 else l
+                    tokenized = [(p, tokenize(p)) for p in pending]
+
+                found = set()
+                for pd_path, records in tokenized:
+                    if records is None:
+                        continue
+                    self.__files[pd_path] = records
+                    if pd_path != root_path:
+                        num_prefetched += 1
+                    else:
+                        # only the declarations of the root patch are used
+                        for r in records:
+                            if r.kind == "declare" and len(r.tokens) >= 4 and r.tokens[2] == "-path":
+                                self.add_relative_search_directory(r.tokens[3])
+                    for r in records:
+                        # abstractions with $ arguments in their name are only known later
+                        if r.kind == "obj" and len(r.tokens) > 4 and "$" not in r.tokens[4]:
+                            abs_path = self.find_abstraction_path(os.path.dirname(pd_path), r.tokens[4])
+                            if abs_path is not None:
+                                found.add(abs_path)
+
+                pending = sorted(p for p in found \
+                    if p not in self.__files and not p.startswith(PdParser.__LIB_DIR))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            # only the directory index is kept for assembling the graph
+            self.__search_paths[:] = search_paths
+            self.__abs_paths.clear()
+            self.search_directories = search_directories
+        return num_prefetched
+
+    def __is_file(self, directory, filename):
+        """ Returns True if the file exists in the directory. Each directory
+            is listed only once.
+        """
+        # abstractions may be in a subdirectory, e.g. [abs/foo]
+        sub_dir, filename = os.path.split(filename)
+        if sub_dir:
+            directory = os.path.join(directory, sub_dir)
+
+        index = self.__dir_index.get(directory)
+        if index is None:
+            try:
+                index = set(os.listdir(directory))
+            except OSError:
+                index = set() # the directory does not exist
+            self.__dir_index[directory] = index
+            self.num_fs_calls += 1
+        self.num_file_lookups += 1
+        return filename in index
+
+    def get_fs_call_counts(self):
+        """ Returns the number of file system calls made to resolve objects,
+            and how many were saved by the directory index.
+        """
+        return {
+            "made": self.num_fs_calls,
+            "saved": self.num_file_lookups - self.num_fs_calls
+        }
 
     def add_relative_search_directory(self, search_dir):
         search_dir = os.path.abspath(os.path.join(
@@ -115,6 +236,7 @@ class PdParser:
             search_dir))
         if os.path.isdir(search_dir):
             self.__search_paths.append(search_dir)
+            self.__abs_paths.clear() # abstractions may now resolve differently
             return True
         else:
             return False
@@ -124,18 +246,29 @@ class PdParser:
             Checks the local directory first, then all declared paths.
         """
 
-        abs_filename = abs_name + ".pd"
+        key = (local_dir, abs_name)
+        if key in self.__abs_paths:
+            abs_path, num_lookups = self.__abs_paths[key]
+            self.num_file_lookups += num_lookups
+            return abs_path
+
+        num_lookups = self.num_file_lookups
+        abs_path = self.__find_abstraction_path(local_dir, abs_name + ".pd")
+        self.__abs_paths[key] = (abs_path, self.num_file_lookups - num_lookups)
+        return abs_path
 
+    def __find_abstraction_path(self, local_dir, abs_filename):
         # check local directory first
-        abs_path = os.path.join(os.path.abspath(local_dir), abs_filename)
-        if os.path.isfile(abs_path):
-            return abs_path
+        local_dir = os.path.abspath(local_dir)
+        self.search_directories.add(local_dir)
+        if self.__is_file(local_dir, abs_filename):
+            return os.path.join(local_dir, abs_filename)
 
         # check search paths in reverse order (last added search path first)
+        self.search_directories.update(self.__search_paths)
         for d in reversed(self.__search_paths):
-            abs_path = os.path.join(d, abs_filename)
-            if os.path.isfile(abs_path):
-                return abs_path
+            if self.__is_file(d, abs_filename):
+                return os.path.join(d, abs_filename)
 
         return None
 
@@ -150,22 +283,23 @@ class PdParser:
         if is_root:
             self.__search_paths.append(os.path.dirname(file_path))
 
-        file_hv_arg_dict = PdParser.__get_hv_args(file_path)
-        file_iterator = PdParser.__get_pd_line(file_path)
-        canvas_line = file_iterator.next()
+        self.dependencies.add(os.path.abspath(file_path))
+
+        file_iterator = iter(self.__get_records(file_path))
+        canvas = next(file_iterator, None)
 
         self.__DOLLAR_ZERO += 1 # increment $0
         graph_args = [self.__DOLLAR_ZERO] + (obj_args or [])
 
-        if not canvas_line.startswith("#N canvas"):
+        if canvas is None or canvas.kind != "canvas":
             g = pd_graph_class(graph_args, file_path, pos_x, pos_y)
-            g.add_error("Pd files must begin with \"#N canvas\": {0}".format(canvas_line))
+            g.add_error("Pd files must begin with \"#N canvas\": {0}".format(
+                canvas.line if canvas is not None else ""))
             return g
 
         g = self.graph_from_canvas(
             file_iterator,
-            file_hv_arg_dict,
-            canvas_line,
+            canvas,
             graph_args,
             file_path,
             pos_x, pos_y,
@@ -181,12 +315,11 @@ class PdParser:
 
         return g
 
-    def graph_from_canvas(self, file_iterator, file_hv_arg_dict, canvas_line, graph_args, pd_path, pos_x=0, pos_y=0, is_root=False, pd_graph_class=PdGraph):
+    def graph_from_canvas(self, file_iterator, canvas, graph_args, pd_path, pos_x=0, pos_y=0, is_root=False, pd_graph_class=PdGraph):
         """ Instantiate a PdGraph from an existing canvas.
             Note that graph_args includes $0.
-            @param file_hv_arg_dict  A dictionary containing all Heavy argument lines
-            for each "#N canvas" in this file.
-            @param canvas_line  The "#N canvas" which initiates this canvas.
+            @param file_iterator  An iterator over the remaining PdRecords of the file.
+            @param canvas  The "#N canvas" record which initiates this canvas.
             @param pd_graph_class  The python class to handle specific graph types
         """
         obj_array = None # an #A (table) object which is currently being parsed
@@ -194,299 +327,293 @@ class PdParser:
         g = pd_graph_class(graph_args, pd_path, pos_x, pos_y)
 
         # parse and add all Heavy arguments to the graph
-        for l in file_hv_arg_dict[canvas_line]:
-            line = l.split()
-            assert line[4] == "@hv_arg"
-            is_required = (line[9] == "true")
-            default_value = HeavyObject.force_arg_type(line[8], line[7]) \
+        for arg_index, name, value_type, default, is_required in canvas.hv_args:
+            default_value = HeavyObject.force_arg_type(default, value_type) \
                 if not is_required else None
             g.add_hv_arg(
-                arg_index=int(line[5][2:])-1, # strip off the leading "\$" and make index zero-based
-                name=line[6],
-                value_type=line[7],
+                arg_index=arg_index,
+                name=name,
+                value_type=value_type,
                 default_value=default_value,
                 required=is_required)
 
         try: # this try will capture any critical errors
-            for l in file_iterator:
-                # remove width parameter
-                line = PdParser.__RE_WIDTH.sub("", l).split()
-
-                if line[0] == "#N":
-                    if line[1] == "canvas":
-                        x = self.graph_from_canvas(
-                            file_iterator,
-                            file_hv_arg_dict,
-                            canvas_line=l,
-                            graph_args=graph_args, # subpatch inherits parent graph arguments, including $0
-                            pd_path=pd_path,
-                            pos_x=int(line[2]),
-                            pos_y=int(line[3]))
-                        g.add_object(x)
-
-                elif line[0] == "#X":
-                    if line[1] == "restore":
-                        if len(line) > 5 and line[5] == "@hv_obj":
-                            obj_args = PdParser.__resolve_object_args(
+            for r in file_iterator:
+                line = r.tokens
+
+                if r.kind == "canvas":
+                    x = self.graph_from_canvas(
+                        file_iterator,
+                        canvas=r,
+                        graph_args=graph_args, # subpatch inherits parent graph arguments, including $0
+                        pd_path=pd_path,
+                        pos_x=int(line[2]),
+                        pos_y=int(line[3]))
+                    g.add_object(x)
+
+                elif r.kind == "restore":
+                    if len(line) > 5 and line[5] == "@hv_obj":
+                        obj_args = PdParser.__resolve_object_args(
+                            obj_type=line[6],
+                            obj_args=line[7:],
+                            graph=g,
+                            raise_on_failure=False,
+                            is_root=is_root)
+                        if line[6] == "__switchcase":
+                            x = HvSwitchcase(
                                 obj_type=line[6],
-                                obj_args=line[7:],
-                                graph=g,
-                                raise_on_failure=False,
-                                is_root=is_root)
-                            if line[6] == "__switchcase":
-                                x = HvSwitchcase(
-                                    obj_type=line[6],
-                                    obj_args=obj_args,
-                                    pos_x=int(line[2]),
-                                    pos_y=int(line[3]))
-                            else:
-                                x = HeavyObject(
-                                    obj_type=line[6],
-                                    obj_args=obj_args,
-                                    pos_x=int(line[2]),
-                                    pos_y=int(line[3]))
-                            return x # return a Heavy object instead of a graph
+                                obj_args=obj_args,
+                                pos_x=int(line[2]),
+                                pos_y=int(line[3]))
                         else:
-                            # are we restoring an array object?
-                            # do some final sanity checks
-                            if obj_array is not None:
-                                declared_size = obj_array.obj_args["size"]
-                                values_size = len(obj_array.obj_args["values"])
-                                if declared_size != values_size:
-                                    new_size = max(declared_size, values_size)
-                                    obj_array.add_warning(
-                                        "Table \"{0}\" was declared as having {1} values, "
-                                        "but {2} were supplied. It will be resized to {3} "
-                                        "values (any unsupplied values will be zeroed).".format(
-                                            obj_array.obj_args["name"],
-                                            declared_size,
-                                            values_size,
-                                            new_size))
-                                    obj_array.obj_args["size"] = new_size
-                                    if new_size < declared_size:
-                                        obj_array.obj_args["values"] = obj_args["values"][:new_size]
-                                    else:
-                                        obj_array.obj_args["values"].extend([0.0 for _ in range(new_size-declared_size)])
-                                obj_array = None # done parsing the array
-
-                            # set the subpatch name
-                            g.subpatch_name = " ".join(line[5:]) if len(line) > 5 else "subpatch"
-                            return g # pop the graph
-
-                    elif line[1] == "text":
-                        # @hv_arg arguments are pre-parsed
-                        # TODO(mhroth): is it necessary to split the entire line at once?
-                        # always add the comment to the graph, regardless
-                        self.obj_counter["text"] += 1
+                            x = HeavyObject(
+                                obj_type=line[6],
+                                obj_args=obj_args,
+                                pos_x=int(line[2]),
+                                pos_y=int(line[3]))
+                        return x # return a Heavy object instead of a graph
+                    else:
+                        # are we restoring an array object?
+                        # do some final sanity checks
+                        if obj_array is not None:
+                            declared_size = obj_array.obj_args["size"]
+                            values_size = len(obj_array.obj_args["values"])
+                            if declared_size != values_size:
+                                new_size = max(declared_size, values_size)
+                                obj_array.add_warning(
+                                    "Table \"{0}\" was declared as having {1} values, "
+                                    "but {2} were supplied. It will be resized to {3} "
+                                    "values (any unsupplied values will be zeroed).".format(
+                                        obj_array.obj_args["name"],
+                                        declared_size,
+                                        values_size,
+                                        new_size))
+                                obj_array.obj_args["size"] = new_size
+                                if new_size < declared_size:
+                                    obj_array.obj_args["values"] = obj_args["values"][:new_size]
+                                else:
+                                    obj_array.obj_args["values"].extend([0.0 for _ in range(new_size-declared_size)])
+                            obj_array = None # done parsing the array
+
+                        # set the subpatch name
+                        g.subpatch_name = " ".join(line[5:]) if len(line) > 5 else "subpatch"
+                        return g # pop the graph
+
+                elif r.kind == "text":
+                    # @hv_arg arguments are pre-parsed
+                    # TODO(mhroth): is it necessary to split the entire line at once?
+                    # always add the comment to the graph, regardless
+                    self.obj_counter["text"] += 1
+                    g.add_object(HeavyObject(
+                        obj_type="comment",
+                        obj_args=[" ".join(line[4:])],
+                        pos_x = int(line[2]),
+                        pos_y = int(line[3])))
+
+                elif r.kind == "obj":
+                    x = None # a PdObject
+                    if len(line) > 4:
+                        obj_type = line[4]
+                        # sometimes objects have $ arguments in them as well
+                        obj_type = PdParser.__resolve_object_args(
+                            obj_type=obj_type,
+                            obj_args=[obj_type],
+                            graph=g,
+                            is_root=is_root)[0]
+                        obj_args = PdParser.__resolve_object_args(
+                            obj_type=obj_type,
+                            obj_args=line[5:],
+                            graph=g,
+                            is_root=is_root)
+                    else:
+                        g.add_warning(
+                            "This graph contains an empty object. "
+                            "It should be removed or defined.",
+                            NotificationEnum.WARNING_EMPTY_OBJECT)
                         g.add_object(HeavyObject(
                             obj_type="comment",
-                            obj_args=[" ".join(line[4:])],
+                            obj_args=["null object placeholder"],
                             pos_x = int(line[2]),
                             pos_y = int(line[3])))
+                        continue
 
-                    elif line[1] == "obj":
-                        x = None # a PdObject
-                        if len(line) > 4:
-                            obj_type = line[4]
-                            # sometimes objects have $ arguments in them as well
-                            obj_type = PdParser.__resolve_object_args(
-                                obj_type=obj_type,
-                                obj_args=[obj_type],
-                                graph=g,
-                                is_root=is_root)[0]
-                            obj_args = PdParser.__resolve_object_args(
-                                obj_type=obj_type,
-                                obj_args=line[5:],
-                                graph=g,
-                                is_root=is_root)
-                        else:
-                            g.add_warning(
-                                "This graph contains an empty object. "
-                                "It should be removed or defined.",
-                                NotificationEnum.WARNING_EMPTY_OBJECT)
-                            g.add_object(HeavyObject(
-                                obj_type="comment",
-                                obj_args=["null object placeholder"],
-                                pos_x = int(line[2]),
-                                pos_y = int(line[3])))
-                            continue
-
-                        # do we have an abstraction for this object?
-                        abs_path = self.find_abstraction_path(os.path.dirname(pd_path), obj_type)
-                        if abs_path is not None and not g.is_abstraction_on_call_stack(abs_path):
-                            # ensure that infinite recursion into abstractions is not possible
-                            x = self.graph_from_file(
-                                file_path=abs_path,
-                                obj_args=obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]),
-                                is_root=False)
-
-                        # is this object in lib/pd_converted?
-                        elif os.path.isfile(os.path.join(PdParser.__PDLIB_CONVERTED_DIR, obj_type+".hv.json")):
-                            self.obj_counter[obj_type] += 1
-                            hv_path = os.path.join(PdParser.__PDLIB_CONVERTED_DIR, obj_type+".hv.json")
-                            x = HeavyGraph(
-                                hv_path=hv_path,
-                                obj_args=obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]))
-
-                        # is this object in lib/heavy_converted?
-                        elif os.path.isfile(os.path.join(PdParser.__HVLIB_CONVERTED_DIR, obj_type+".hv.json")):
-                            self.obj_counter[obj_type] += 1
-                            hv_path = os.path.join(PdParser.__HVLIB_CONVERTED_DIR, obj_type+".hv.json")
-                            x = HeavyGraph(
-                                hv_path=hv_path,
-                                obj_args=obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]))
-
-                        # is this object in lib/pd?
-                        elif os.path.isfile(os.path.join(PdParser.__PDLIB_DIR, obj_type+".pd")):
-                            self.obj_counter[obj_type] += 1
-                            pdlib_path = os.path.join(PdParser.__PDLIB_DIR, obj_type+".pd")
-
-                            # mapping of pd/lib abstraction objects to classes
-                            # for checking connection validity
-                            clazz = {
-                                "abs~": PdLibSignalGraph,
-                                "clip~": PdLibSignalGraph,
-                                "cos~": PdLibSignalGraph,
-                                "dbtopow~": PdLibSignalGraph,
-                                "dbtorms~": PdLibSignalGraph,
-                                "exp~": PdLibSignalGraph,
-                                "ftom~": PdLibSignalGraph,
-                                "hip~": PdLibSignalGraph,
-                                "lop~": PdLibSignalGraph,
-                                "mtof~": PdLibSignalGraph,
-                                "powtodb~": PdLibSignalGraph,
-                                "q8_rsqrt~": PdLibSignalGraph,
-                                "q8_sqrt~": PdLibSignalGraph,
-                                "rmstodb~": PdLibSignalGraph,
-                                "rsqrt~": PdLibSignalGraph,
-                                "sqrt~": PdLibSignalGraph,
-                                "wrap~": PdLibSignalGraph
-                            }.get(obj_type, PdGraph)
-
-                            x = self.graph_from_file(
-                                file_path=pdlib_path,
-                                obj_args=obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]),
-                                is_root=False,
-                                pd_graph_class=clazz)
-
-                            # register any object-specific warnings or errors
-                            if obj_type in ["rzero~", "rzero_rev~", "czero~", "czero_rev~"]:
-                                g.add_warning(
-                                    "[{0}] accepts only signal input. "
-                                    "Arguments and control connections are ignored.".format(obj_type))
-
-                        # is this object in lib/heavy?
-                        elif os.path.isfile(os.path.join(PdParser.__HVLIB_DIR, obj_type+".pd")):
-                            self.obj_counter[obj_type] += 1
-                            hvlib_path = os.path.join(PdParser.__HVLIB_DIR, obj_type+".pd")
-                            x = self.graph_from_file(
-                                file_path=hvlib_path,
-                                obj_args=obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]),
-                                is_root=False)
-
-                        # is this an object that must be programatically parsed?
-                        elif obj_type in PdParser.__PD_CLASSES:
-                            self.obj_counter[obj_type] += 1
-                            obj_class = PdParser.__PD_CLASSES[obj_type]
-                            x = obj_class(
-                                obj_type,
-                                obj_args,
-                                pos_x=int(line[2]), pos_y=int(line[3]))
-
-                        elif PdParser.__is_float(obj_type):
-                            # parse float literals
-                            self.obj_counter["float"] += 1
-                            x = HeavyObject(
-                                obj_type="__var",
-                                obj_args=[float(obj_type)],
-                                pos_x=int(line[2]), pos_y=int(line[3]))
+                    # do we have an abstraction for this object?
+                    abs_path = self.find_abstraction_path(os.path.dirname(pd_path), obj_type)
+                    if abs_path is not None and not g.is_abstraction_on_call_stack(abs_path):
+                        # ensure that infinite recursion into abstractions is not possible
+                        x = self.graph_from_file(
+                            file_path=abs_path,
+                            obj_args=obj_args,
+                            pos_x=int(line[2]), pos_y=int(line[3]),
+                            is_root=False)
 
-                        else:
-                            g.add_error(
-                                "Don't know how to parse object \"{0}\". Is it an "
-                                "object supported by Heavy? Is it an abstraction? "
-                                "Have the search paths been correctly configured?".format(obj_type),
-                                NotificationEnum.ERROR_UNKNOWN_OBJECT)
-                            x = HeavyObject(
-                                obj_type="comment",
-                                obj_args=["null object placeholder ({0})".format(obj_type)])
+                    # is this object in lib/pd_converted?
+                    elif self.__is_file(PdParser.__PDLIB_CONVERTED_DIR, obj_type+".hv.json"):
+                        self.obj_counter[obj_type] += 1
+                        hv_path = os.path.join(PdParser.__PDLIB_CONVERTED_DIR, obj_type+".hv.json")
+                        self.dependencies.add(hv_path)
+                        x = HeavyGraph(
+                            hv_path=hv_path,
+                            obj_args=obj_args,
+                            pos_x=int(line[2]), pos_y=int(line[3]))
+
+                    # is this object in lib/heavy_converted?
+                    elif self.__is_file(PdParser.__HVLIB_CONVERTED_DIR, obj_type+".hv.json"):
+                        self.obj_counter[obj_type] += 1
+                        hv_path = os.path.join(PdParser.__HVLIB_CONVERTED_DIR, obj_type+".hv.json")
+                        self.dependencies.add(hv_path)
+                        x = HeavyGraph(
+                            hv_path=hv_path,
+                            obj_args=obj_args,
+                            pos_x=int(line[2]), pos_y=int(line[3]))
+
+                    # is this object in lib/pd?
+                    elif self.__is_file(PdParser.__PDLIB_DIR, obj_type+".pd"):
+                        self.obj_counter[obj_type] += 1
+                        pdlib_path = os.path.join(PdParser.__PDLIB_DIR, obj_type+".pd")
+
+                        # mapping of pd/lib abstraction objects to classes
+                        # for checking connection validity
+                        clazz = {
+                            "abs~": PdLibSignalGraph,
+                            "clip~": PdLibSignalGraph,
+                            "cos~": PdLibSignalGraph,
+                            "dbtopow~": PdLibSignalGraph,
+                            "dbtorms~": PdLibSignalGraph,
+                            "exp~": PdLibSignalGraph,
+                            "ftom~": PdLibSignalGraph,
+                            "hip~": PdLibSignalGraph,
+                            "lop~": PdLibSignalGraph,
+                            "mtof~": PdLibSignalGraph,
+                            "powtodb~": PdLibSignalGraph,
+                            "q8_rsqrt~": PdLibSignalGraph,
+                            "q8_sqrt~": PdLibSignalGraph,
+                            "rmstodb~": PdLibSignalGraph,
+                            "rsqrt~": PdLibSignalGraph,
+                            "sqrt~": PdLibSignalGraph,
+                            "wrap~": PdLibSignalGraph
+                        }.get(obj_type, PdGraph)
 
-                        g.add_object(x)
+                        x = self.graph_from_file(
+                            file_path=pdlib_path,
+                            obj_args=obj_args,
+                            pos_x=int(line[2]), pos_y=int(line[3]),
+                            is_root=False,
+                            pd_graph_class=clazz)
 
-                    elif line[1] in ["floatatom", "symbolatom"]:
-                        self.obj_counter[line[1]] += 1
+                        # register any object-specific warnings or errors
+                        if obj_type in ["rzero~", "rzero_rev~", "czero~", "czero_rev~"]:
+                            g.add_warning(
+                                "[{0}] accepts only signal input. "
+                                "Arguments and control connections are ignored.".format(obj_type))
+
+                    # is this object in lib/heavy?
+                    elif self.__is_file(PdParser.__HVLIB_DIR, obj_type+".pd"):
+                        self.obj_counter[obj_type] += 1
+                        hvlib_path = os.path.join(PdParser.__HVLIB_DIR, obj_type+".pd")
                         x = self.graph_from_file(
-                            file_path=os.path.join(PdParser.__PDLIB_DIR, line[1]+".pd"),
-                            obj_args=[],
+                            file_path=hvlib_path,
+                            obj_args=obj_args,
                             pos_x=int(line[2]), pos_y=int(line[3]),
                             is_root=False)
-                        g.add_object(x)
-
-                    elif line[1] == "array":
-                        assert obj_array is None, "#X array object is already being parsed."
-                        # array names can have dollar arguments in them.
-                        # ensure that they are resolved
-                        table_name = PdParser.__resolve_object_args(
-                            obj_type="array",
-                            obj_args=[line[2]],
-                            graph=g)[0]
-                        # Pd encodes arrays with length greater than 999,999 with
-                        # scientific notatation (e.g. 1e6) which Python's int() can't parse
-                        table_size = int(decimal.Decimal(line[3]))
-                        obj_array = HeavyObject(
-                            obj_type="table",
-                            # ensure that obj_array has its own values instance
-                            obj_args=[table_name, table_size, []])
-                        # TODO(mhroth): position information
-                        g.add_object(obj_array)
-
-                    elif line[1] == "msg":
-                        self.obj_counter["msg"] += 1
-                        g.add_object(PdMessageObject(
-                            obj_type="msg",
-                            obj_args=[" ".join(line[4:])],
-                            pos_x=int(line[2]),
-                            pos_y=int(line[3])))
-
-                    elif line[1] == "connect":
-                        g.add_parsed_connection(
-                            from_index=int(line[2]),
-                            from_outlet=int(line[3]),
-                            to_index=int(line[4]),
-                            to_inlet=int(line[5]))
-
-                    elif line[1] == "declare":
-                        if not is_root:
-                            g.add_warning(
-                                "[declare] objects are not supported in abstractions. "
-                                "They can only be in the root canvas.")
-                        elif len(line) >= 4 and line[2] == "-path":
-                            did_add = self.add_relative_search_directory(line[3])
-                            if not did_add:
-                                g.add_warning(
-                                    "\"{0}\" is not a valid relative abstraction "
-                                    "search path. It will be ignored.".format(line[3]))
 
-                        else:
-                            g.add_warning(
-                                "Heavy only supports the -path flag for the "
-                                "declare object.",
-                                NotificationEnum.WARNING_DECLARE_PATH)
+                    # is this an object that must be programatically parsed?
+                    elif obj_type in PdParser.__PD_CLASSES:
+                        self.obj_counter[obj_type] += 1
+                        obj_class = PdParser.__PD_CLASSES[obj_type]
+                        x = obj_class(
+                            obj_type,
+                            obj_args,
+                            pos_x=int(line[2]), pos_y=int(line[3]))
+
+                    elif PdParser.__is_float(obj_type):
+                        # parse float literals
+                        self.obj_counter["float"] += 1
+                        x = HeavyObject(
+                            obj_type="__var",
+                            obj_args=[float(obj_type)],
+                            pos_x=int(line[2]), pos_y=int(line[3]))
 
-                    elif line[1] == "coords":
-                        pass # don't do anything with this command
+                    else:
+                        g.add_error(
+                            "Don't know how to parse object \"{0}\". Is it an "
+                            "object supported by Heavy? Is it an abstraction? "
+                            "Have the search paths been correctly configured?".format(obj_type),
+                            NotificationEnum.ERROR_UNKNOWN_OBJECT)
+                        x = HeavyObject(
+                            obj_type="comment",
+                            obj_args=["null object placeholder ({0})".format(obj_type)])
+
+                    g.add_object(x)
+
+                elif r.kind in ["floatatom", "symbolatom"]:
+                    self.obj_counter[line[1]] += 1
+                    x = self.graph_from_file(
+                        file_path=os.path.join(PdParser.__PDLIB_DIR, line[1]+".pd"),
+                        obj_args=[],
+                        pos_x=int(line[2]), pos_y=int(line[3]),
+                        is_root=False)
+                    g.add_object(x)
+
+                elif r.kind == "array":
+                    assert obj_array is None, "#X array object is already being parsed."
+                    # array names can have dollar arguments in them.
+                    # ensure that they are resolved
+                    table_name = PdParser.__resolve_object_args(
+                        obj_type="array",
+                        obj_args=[line[2]],
+                        graph=g)[0]
+                    # Pd encodes arrays with length greater than 999,999 with
+                    # scientific notatation (e.g. 1e6) which Python's int() can't parse
+                    table_size = int(decimal.Decimal(line[3]))
+                    obj_array = HeavyObject(
+                        obj_type="table",
+                        # ensure that obj_array has its own values instance
+                        obj_args=[table_name, table_size, TableValues.new()])
+                    # TODO(mhroth): position information
+                    g.add_object(obj_array)
+
+                elif r.kind == "msg":
+                    self.obj_counter["msg"] += 1
+                    g.add_object(PdMessageObject(
+                        obj_type="msg",
+                        obj_args=[" ".join(line[4:])],
+                        pos_x=int(line[2]),
+                        pos_y=int(line[3])))
+
+                elif r.kind == "connect":
+                    g.add_parsed_connection(
+                        from_index=int(line[2]),
+                        from_outlet=int(line[3]),
+                        to_index=int(line[4]),
+                        to_inlet=int(line[5]))
+
+                elif r.kind == "declare":
+                    if not is_root:
+                        g.add_warning(
+                            "[declare] objects are not supported in abstractions. "
+                            "They can only be in the root canvas.")
+                    elif len(line) >= 4 and line[2] == "-path":
+                        did_add = self.add_relative_search_directory(line[3])
+                        if not did_add:
+                            g.add_warning(
+                                "\"{0}\" is not a valid relative abstraction "
+                                "search path. It will be ignored.".format(line[3]))
 
                     else:
-                        g.add_error("Don't know how to parse line: {0}".format(
-                            " ".join(line)))
+                        g.add_warning(
+                            "Heavy only supports the -path flag for the "
+                            "declare object.",
+                            NotificationEnum.WARNING_DECLARE_PATH)
+
+                elif r.kind == "coords":
+                    pass # don't do anything with this command
+
+                elif r.kind == "A":
+                    obj_array.obj_args["values"].fromlist([float(f) for f in line[2:]])
 
-                elif line[0] == "#A":
-                    obj_array.obj_args["values"].extend([float(f) for f in line[2:]])
+                elif r.kind == "N":
+                    pass # only canvases are parsed
 
                 else:
                     g.add_error("Don't know how to parse line: {0}".format(" ".join(line)))
@@ -516,6 +643,8 @@ class PdParser:
         # TODO(mhroth): can this be done more elegantly?
         resolved_obj_args = list(obj_args) # make a copy of the original obj_args
         for i,a in enumerate(obj_args):
+            if "$" not in a:
+                continue # nothing to resolve
             for m in set(PdParser.__RE_DOLLAR.findall(a)):
                 x = int(m) # the dollar index (i.e. $x)
                 if len(graph.obj_args) > x:
@@ -0,0 +1,96 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import namedtuple
+import re
+
+# A single statement of a Pd file.
+#   kind: the type of the record, e.g. "canvas", "obj", "msg", "connect",
+#       "array", "restore" or "A" (array values). None if the line cannot
+#       be parsed.
+#   line: the full line, without the trailing ";"
+#   tokens: a tuple of the whitespace separated tokens of the line, without
+#       the width parameter
+#   hv_args: the Heavy arguments of a canvas, as a list of (arg_index, name,
+#       value_type, default value string, required) tuples. None for all
+#       other records.
+# Records are immutable tuples (except for the Heavy arguments of canvases),
+# such that the garbage collector does not need to track them.
+PdRecord = namedtuple("PdRecord", ["kind", "line", "tokens", "hv_args"])
+
+class PdTokenizer:
+    """ Reads a Pd file in a single pass into a list of PdRecords.
+    """
+
+    # detect the end of a statement, a ";" at the end of a line which is not escaped
+    __RE_END = re.compile(r"(?<!\\);\r*(?:\n|\Z)")
+
+    # detect width parameter e.g. "#X obj 172 79 t b b, f 22"
+    __RE_WIDTH = re.compile(", f \d+$")
+
+    @classmethod
+    def tokenize(clazz, pd_path):
+        """ Returns the records of a Pd file. The Heavy arguments declared in
+            a canvas (i.e. "#X text ... @hv_arg ...") are attached to the
+            record of that canvas.
+        """
+        with open(pd_path, "r") as f:
+            statements = PdTokenizer.__RE_END.split(f.read())
+
+        records = []
+        canvas_stack = [] # the records of the currently open canvases
+        # the last statement is either empty or not terminated
+        for l in statements[:-1]:
+            if "\n" in l:
+                # concatenate split lines
+                l = l.replace("\r\n", "\n").replace("\n", " ").lstrip()
+
+            # remove width parameter
+            if ", f " in l:
+                tokens = tuple(PdTokenizer.__RE_WIDTH.sub("", l).split())
+            else:
+                tokens = tuple(l.split())
+
+            kind = PdTokenizer.__get_kind(tokens)
+            if kind == "canvas":
+                r = PdRecord(kind, l, tokens, [])
+                canvas_stack.append(r)
+            else:
+                r = PdRecord(kind, l, tokens, None)
+                if kind == "restore":
+                    if canvas_stack:
+                        canvas_stack.pop()
+                elif kind == "text" and len(tokens) > 4 and tokens[4] == "@hv_arg":
+                    canvas_stack[-1].hv_args.append((
+                        int(tokens[5][2:])-1, # strip off the leading "\$" and make index zero-based
+                        tokens[6],
+                        tokens[7],
+                        tokens[8],
+                        tokens[9] == "true"))
+            records.append(r)
+        return records
+
+    @classmethod
+    def __get_kind(clazz, tokens):
+        if len(tokens) < 2:
+            return None
+        elif tokens[0] == "#X":
+            return tokens[1]
+        elif tokens[0] == "#N":
+            return "canvas" if tokens[1] == "canvas" else "N"
+        elif tokens[0] == "#A":
+            return "A"
+        else:
+            return None
@@ -19,6 +19,7 @@ import os
 import time
 
 from PdParser import PdParser
+from core.tables.TableValues import TableValues
 
 class Colours:
     purple = "\033[95m"
@@ -39,10 +40,47 @@ class pd2hv:
         return PdParser.get_supported_objects()
 
     @classmethod
-    def compile(clazz, pd_path, hv_dir, search_paths=None, verbose=False, export_args=False):
+    def strip_editor_objects(clazz, hv_graph):
+        """ Removes everything from a HeavyLang graph which only matters in
+            the editor: comments (also the placeholders of empty objects), the
+            coordinates of all objects, and subgraphs which are then empty and
+            not connected (e.g. [cnv]). Returns the number of removed objects.
+        """
+        hv_graph.pop("properties", None)
+        connected_ids = set()
+        for c in hv_graph["connections"]:
+            connected_ids.add(c["from"]["id"])
+            connected_ids.add(c["to"]["id"])
+
+        num_removed = 0
+        for obj_id, o in hv_graph["objects"].items():
+            if o["type"] == "graph":
+                num_removed += pd2hv.strip_editor_objects(o)
+                if len(o["objects"]) == 0 and obj_id not in connected_ids:
+                    del hv_graph["objects"][obj_id]
+                    num_removed += 1
+            elif o["type"] == "comment":
+                del hv_graph["objects"][obj_id]
+                num_removed += 1
+            else:
+                o.pop("properties", None)
+        return num_removed
+
+    @classmethod
+    def compile(clazz, pd_path, hv_dir, search_paths=None, verbose=False, export_args=False, production=False, jobs=1):
+        """ Converts a Pd patch into a HeavyLang graph. The graph is returned
+            under the "hv" key of the results. It is additionally written
+            to hv_dir, unless hv_dir is None.
+            In production mode, all editor-only objects are removed from the
+            graph, and it is written without any whitespace, even if verbose.
+            If jobs is larger than one, the abstraction files of the patch are
+            tokenized in a pool of worker processes before the graph is built.
+        """
         tick = time.time()
 
         parser = PdParser() # create parser state
+        if jobs > 1:
+            parser.prefetch_abstractions(pd_path, jobs)
         pd_graph = parser.graph_from_file(pd_path)
         notices = pd_graph.get_notices()
 
@@ -61,24 +99,35 @@ class pd2hv:
                 "in_file": os.path.basename(pd_path),
                 "out_dir": None,
                 "out_file": None,
-                "compile_time": (time.time() - tick)
+                "compile_time": (time.time() - tick),
+                "dependencies": sorted(parser.dependencies),
+                "search_directories": sorted(parser.search_directories),
+                "fs_calls": parser.get_fs_call_counts()
             }
 
-        if not os.path.exists(hv_dir):
-            os.makedirs(hv_dir)
-
-        hv_file = os.path.splitext(os.path.basename(pd_path))[0] + ".hv.json"
-        hv_path = os.path.join(hv_dir, hv_file)
-        with open(hv_path, "w") as f:
-            if verbose:
-                json.dump(
-                pd_graph.to_hv(export_args=export_args),
-                f,
-                sort_keys=True,
-                indent=2,
-                separators=(",", ": "))
+        hv_graph = pd_graph.to_hv(export_args=export_args)
+        num_stripped = pd2hv.strip_editor_objects(hv_graph) if production else 0
+
+        if hv_dir is not None:
+            if not os.path.exists(hv_dir):
+                os.makedirs(hv_dir)
+
+            hv_file = os.path.splitext(os.path.basename(pd_path))[0] + ".hv.json"
+            hv_path = os.path.join(hv_dir, hv_file)
+            # table values are written to a binary sidecar file
+            if production:
+                TableValues.dump(hv_graph, hv_path, separators=(",", ":"))
+            elif verbose:
+                TableValues.dump(
+                    hv_graph,
+                    hv_path,
+                    sort_keys=True,
+                    indent=2,
+                    separators=(",", ": "))
             else:
-                json.dump(pd_graph.to_hv(export_args=export_args), f)
+                TableValues.dump(hv_graph, hv_path)
+        else:
+            hv_file = None
 
         return {
             "stage": "pd2hv",
@@ -93,7 +142,12 @@ class pd2hv:
             "in_file": os.path.basename(pd_path),
             "out_dir": hv_dir,
             "out_file": hv_file,
-            "compile_time": (time.time() - tick)
+            "compile_time": (time.time() - tick),
+            "dependencies": sorted(parser.dependencies),
+            "search_directories": sorted(parser.search_directories),
+            "fs_calls": parser.get_fs_call_counts(),
+            "stripped": num_stripped,
+            "hv": hv_graph
         }
 
 def main():
@@ -109,6 +163,10 @@ def main():
         "--export",
         help="Export Heavy arguments. Use this to make precompiled patches.",
         action="count")
+    parser.add_argument(
+        "--production",
+        help="Remove comments and other editor-only objects, and write compact JSON.",
+        action="count")
     parser.add_argument(
         "-v",
         "--verbose",
@@ -124,7 +182,8 @@ def main():
         hv_dir=args.hv_dir,
         search_paths=None,
         verbose=args.verbose,
-        export_args=args.export)
+        export_args=args.export,
+        production=args.production)
 
     for i,n in enumerate(result["notifs"]["errors"]):
         print "{0:3d}) {1}Error #{2:4d}:{3} {4}".format(
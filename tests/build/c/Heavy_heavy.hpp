@@ -0,0 +1,83 @@
+/**
+ * Copyright (c) 2026 Enzien Audio, Ltd.
+ * 
+ * Redistribution and use in source and binary forms, with or without modification,
+ * are permitted provided that the following conditions are met:
+ * 
+ * 1. Redistributions of source code must retain the above copyright notice,
+ *    this list of conditions, and the following disclaimer.
+ * 
+ * 2. Redistributions in binary form must reproduce the phrase "powered by heavy",
+ *    the heavy logo, and a hyperlink to https://enzienaudio.com, all in a visible
+ *    form.
+ * 
+ *   2.1 If the Application is distributed in a store system (for example,
+ *       the Apple "App Store" or "Google Play"), the phrase "powered by heavy"
+ *       shall be included in the app description or the copyright text as well as
+ *       the in the app itself. The heavy logo will shall be visible in the app
+ *       itself as well.
+ * 
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+ * AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+ * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ * ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+ * FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+ * DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+ * SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+ * CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+ * OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+ * THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ * 
+ */
+
+#ifndef _HEAVY_CONTEXT_HEAVY_HPP_
+#define _HEAVY_CONTEXT_HEAVY_HPP_
+
+// object includes
+#include "HeavyContext.hpp"
+#include "HvControlPrint.h"
+#include "HvControlUnop.h"
+#include "HvControlCast.h"
+#include "HvControlBinop.h"
+
+class Heavy_heavy : public HeavyContext {
+
+ public:
+  Heavy_heavy(double sampleRate, int poolKb=10, int inQueueKb=2, int outQueueKb=0);
+  ~Heavy_heavy();
+
+  const char *getName() override { return "heavy"; }
+  int getNumInputChannels() override { return 0; }
+  int getNumOutputChannels() override { return 2; }
+
+  int process(float **inputBuffers, float **outputBuffer, int n) override;
+  int processInline(float *inputBuffers, float *outputBuffer, int n) override;
+  int processInlineInterleaved(float *inputBuffers, float *outputBuffer, int n) override;
+
+  int getParameterInfo(int index, HvParameterInfo *info) override;
+
+ private:
+  HvTable *getTableForHash(hv_uint32_t tableHash) override;
+  void scheduleMessageForReceiver(hv_uint32_t receiverHash, HvMessage *m) override;
+
+  // static sendMessage functions
+  static void cMsg_dMKUSKzh_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_tI8ooq7O_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_y5EUezto_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cBinop_cSWyj6us_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cUnop_6k976NCl_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cMsg_fYE3hQXv_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_2sA3vpqs_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cMsg_tAxv16re_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_zJ0akcsO_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cReceive_kh9Fsnnd_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_d7wIbQ9V_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cCast_aN8fFF0Q_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cMsg_FyzAaN8R_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+  static void cMsg_hWWdNU7D_sendMessage(HeavyContextInterface *, int, const HvMessage *);
+
+  // objects
+  ControlBinop cBinop_cSWyj6us;
+};
+
+#endif // _HEAVY_CONTEXT_HEAVY_HPP_
@@ -0,0 +1,232 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import defaultdict
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+import core.hv2ir.HeavyGraph
+from core.hv2ir.BufferPool import BufferPool
+from core.hv2ir.HeavyException import HeavyException
+
+SIGNAL_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "signal")
+SPEED_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "speed")
+
+class ListBufferPool:
+    """ The previous implementation of the BufferPool, which keeps a list of
+        buffers per retain count. It is the reference for the buffer assignment.
+    """
+
+    def __init__(self):
+        self.pool = {
+            "~f>": defaultdict(list),
+            "~i>": defaultdict(list)
+        }
+
+    def num_buffers(self, connection_type=None):
+        if connection_type is None:
+            return self.num_buffers("~f>") + self.num_buffers("~i>")
+        else:
+            return sum(len(v) for v in self.pool[connection_type].values())
+
+    def get_buffer(self, connection_type, count=1, excludeSet=None):
+        excludeSet = excludeSet if excludeSet is not None else set()
+        pool = self.pool[connection_type]
+        b = next((b for b in reversed(pool[0]) if b not in excludeSet), None)
+        if b is not None:
+            pool[0].remove(b)
+        else:
+            b = (connection_type, self.num_buffers(connection_type))
+        pool[count].append(b)
+        return b
+
+    def retain_buffer(self, b, count=1):
+        if b[0] in ["zero", "input"]:
+            return 0
+        else:
+            pool = self.pool[b[0]]
+            for k, v in pool.iteritems():
+                if b in v:
+                    v.remove(b)
+                    pool[k+count].append(b)
+                    return k+count
+            raise HeavyException("{0} not found in BufferPool!".format(b))
+
+    def release_buffer(self, b, count=1):
+        return self.retain_buffer(b, -count)
+
+class RecordingBufferPool(BufferPool):
+    """ A BufferPool which records all calls and their results.
+    """
+
+    def __init__(self):
+        BufferPool.__init__(self)
+        self.calls = []
+
+    def get_buffer(self, connection_type, count=1, excludeSet=None):
+        b = BufferPool.get_buffer(self, connection_type, count, excludeSet)
+        self.calls.append(("get_buffer", (connection_type, count, set(excludeSet or ())), b))
+        return b
+
+    def retain_buffer(self, b, count=1):
+        k = BufferPool.retain_buffer(self, b, count)
+        self.calls.append(("retain_buffer", (b, count), k))
+        return k
+
+    def release_buffer(self, b, count=1):
+        k = BufferPool.release_buffer(self, b, count)
+        self.calls.append(("release_buffer", (b, count), k))
+        return k
+
+class TestBufferPool(unittest.TestCase):
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="TestBufferPool-")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _assert_same_calls(self, calls):
+        """ Replays the calls on the reference implementation, which must give the same results.
+        """
+        reference = ListBufferPool()
+        for method, args, result in calls:
+            self.assertEqual(result, getattr(reference, method)(*args), "{0}{1}".format(method, args))
+
+    def test_special_buffers(self):
+        pool = BufferPool()
+        self.assertEqual(0, pool.retain_buffer(("zero", 0)))
+        self.assertEqual(0, pool.release_buffer(("input", 1)))
+        self.assertRaises(HeavyException, pool.release_buffer, ("~f>", 0))
+        self.assertRaises(HeavyException, pool.num_buffers, "-->")
+
+        # the most recently released buffer is reused first, unless it is excluded
+        a = pool.get_buffer("~f>")
+        b = pool.get_buffer("~f>")
+        self.assertEqual(("~f>", 1), b)
+        self.assertEqual(0, pool.release_buffer(a))
+        self.assertEqual(0, pool.release_buffer(b))
+        self.assertEqual(b, pool.get_buffer("~f>", 2))
+        self.assertEqual(("~f>", 2), pool.get_buffer("~f>", 0, excludeSet={a}))
+        self.assertEqual(("~i>", 0), pool.get_buffer("~i>"))
+        self.assertEqual(4, pool.num_buffers())
+        self.assertEqual(3, pool.num_buffers("~f>"))
+
+    def test_random_operations(self):
+        random.seed(0)
+        for _ in xrange(20):
+            pool = RecordingBufferPool()
+            buffers = []
+            for _ in xrange(500):
+                x = random.random()
+                if x < 0.3 or len(buffers) == 0:
+                    exclude_set = set(random.sample(buffers, min(len(buffers), random.randint(0, 2))))
+                    buffers.append(pool.get_buffer(random.choice(["~f>", "~i>"]), random.randint(0, 3), exclude_set))
+                elif x < 0.5:
+                    pool.retain_buffer(random.choice(buffers), random.randint(-1, 2))
+                else:
+                    pool.release_buffer(random.choice(buffers))
+            self._assert_same_calls(pool.calls)
+            self.assertEqual(len(set(buffers)), pool.num_buffers())
+
+    def test_patches(self):
+        # the buffers of real patches are assigned exactly as before
+        pd_paths = [os.path.join(SPEED_TEST_DIR, f) \
+            for f in sorted(os.listdir(SPEED_TEST_DIR)) if f.endswith(".pd")]
+        pools = []
+
+        def create_pool():
+            pools.append(RecordingBufferPool())
+            return pools[-1]
+
+        try:
+            core.hv2ir.HeavyGraph.BufferPool = create_pool
+            for pd_path in pd_paths:
+                results = hvcc.compile_dataflow(pd_path, self.out_dir, generators=[])
+                for r in results.values():
+                    self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        finally:
+            core.hv2ir.HeavyGraph.BufferPool = BufferPool
+
+        self.assertEqual(len(pd_paths), len(pools))
+        for pool in pools:
+            self.assertGreater(len(pool.calls), 0)
+            self._assert_same_calls(pool.calls)
+
+    def _compile(self, pd_path, out_name, **kwargs):
+        results = hvcc.compile_dataflow(pd_path, os.path.join(self.out_dir, out_name), **kwargs)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        with open(os.path.join(self.out_dir, out_name, "c", "Heavy_heavy.cpp"), "r") as f:
+            return results["hv2ir"]["temporary_buffers"], f.read()
+
+    def test_liveness(self):
+        # the values of the unconnected outlets of the abstraction are never read
+        num_outlets = 8
+        with open(os.path.join(self.out_dir, "multi.pd"), "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n#X obj 10 10 inlet~;\n")
+            for i in xrange(num_outlets):
+                f.write("#X obj 10 50 *~ {0};\n#X obj 10 90 outlet~;\n".format(i+2))
+                f.write("#X connect 0 0 {0} 0;\n#X connect {0} 0 {1} 0;\n".format(2*i+1, 2*i+2))
+        pd_path = os.path.join(self.out_dir, "main.pd")
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n#X obj 10 10 osc~ 440;\n#X obj 10 40 multi;\n")
+            f.write("#X obj 10 70 multi;\n#X obj 10 100 dac~;\n")
+            f.write("#X connect 0 0 1 0;\n#X connect 1 0 2 0;\n#X connect 2 {0} 3 0;\n".format(num_outlets-1))
+
+        buffers, _ = self._compile(pd_path, "greedy")
+        self.assertEqual(["greedy"], buffers.keys())
+        buffers, _ = self._compile(pd_path, "liveness", buffer_allocation="liveness")
+        self.assertLess(buffers["liveness"]["float"], buffers["greedy"]["float"])
+
+        # otherwise the buffers are assigned exactly as before
+        pd_path = os.path.join(SPEED_TEST_DIR, "test-00-fire.pd")
+        _, greedy_cpp = self._compile(pd_path, "greedy")
+        buffers, liveness_cpp = self._compile(pd_path, "liveness", buffer_allocation="liveness")
+        self.assertEqual(buffers["greedy"], buffers["liveness"])
+        self.assertEqual(greedy_cpp, liveness_cpp)
+
+    def test_signal_ordering(self):
+        # the working-set ordering never needs more temporary buffers, and fewer for the fire patches
+        pd_paths = [os.path.join(d, f) for d in [SIGNAL_TEST_DIR, SPEED_TEST_DIR] \
+            for f in sorted(os.listdir(d)) if f.endswith(".pd")]
+        fewer = []
+        for pd_path in pd_paths:
+            buffers = []
+            for signal_ordering in ["depth-first", "working-set"]:
+                results = hvcc.compile_dataflow(pd_path, os.path.join(self.out_dir, signal_ordering),
+                    generators=[], signal_ordering=signal_ordering)
+                buffers.append(results.get("hv2ir", {}).get("temporary_buffers"))
+            if buffers[0] is None:
+                continue # the patch does not compile, e.g. it needs other search paths
+            for t in ["float", "integer"]:
+                self.assertLessEqual(buffers[1]["greedy"][t], buffers[0]["greedy"][t],
+                    "{0}: {1} {2}".format(os.path.basename(pd_path), t, buffers))
+            if buffers[1]["greedy"]["float"] < buffers[0]["greedy"]["float"]:
+                fewer.append(os.path.basename(pd_path))
+        for pd_name in ["test-00-fire.pd", "test-01-fire.pd", "test-02-fire.pd"]:
+            self.assertIn(pd_name, fewer)
+
+        self.assertRaises(HeavyException, core.hv2ir.HeavyGraph.HeavyGraph.prepare,
+            core.hv2ir.HeavyGraph.HeavyGraph(), signal_ordering="breadth-first")
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_buffer_pool.TestBufferPool"
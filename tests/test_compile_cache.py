@@ -0,0 +1,100 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+from core.cache.CompileCache import CompileCache
+
+class TestCompileCache(unittest.TestCase):
+
+    # a patch with a local abstraction
+    __ROOT_PATCH = "#N canvas 0 0 450 300 10;\n#X obj 10 10 abs~;\n#X obj 10 40 dac~;\n#X connect 0 0 1 0;\n#X connect 0 0 1 1;\n"
+    __ABS_PATCH = "#N canvas 0 0 450 300 10;\n#X obj 10 10 osc~ {0};\n#X obj 10 40 outlet~;\n#X connect 0 0 1 0;\n"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestCompileCache-")
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.patch_dir = os.path.join(self.tmp_dir, "patch")
+        os.makedirs(self.patch_dir)
+        self.pd_path = os.path.join(self.patch_dir, "root.pd")
+        self._write_patch("root.pd", TestCompileCache.__ROOT_PATCH)
+        self._write_patch("abs~.pd", TestCompileCache.__ABS_PATCH.format(440))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_patch(self, name, content):
+        with open(os.path.join(self.patch_dir, name), "w") as f:
+            f.write(content)
+
+    def _compile(self, out_name="out", **kwargs):
+        results = hvcc.compile_dataflow(
+            self.pd_path,
+            os.path.join(self.tmp_dir, out_name),
+            cache_dir=self.cache_dir,
+            **kwargs)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        return results
+
+    def _get_cache_states(self, results):
+        return {k: r.get("cache") for k, r in results.iteritems() if k in {"pd2hv", "hv2ir", "ir2c"}}
+
+    def test_hit(self):
+        self.assertEqual({"pd2hv": "miss", "hv2ir": "miss", "ir2c": "miss"},
+            self._get_cache_states(self._compile("out1")))
+        self.assertEqual({"pd2hv": "hit", "hv2ir": "hit", "ir2c": "hit"},
+            self._get_cache_states(self._compile("out2")))
+
+        # restored sources are identical to the generated ones
+        c1 = os.path.join(self.tmp_dir, "out1", "c")
+        c2 = os.path.join(self.tmp_dir, "out2", "c")
+        self.assertEqual(sorted(os.listdir(c1)), sorted(os.listdir(c2)))
+        _, mismatch, errors = filecmp.cmpfiles(c1, c2, os.listdir(c1), shallow=False)
+        self.assertEqual([], mismatch + errors)
+
+    def test_options_miss(self):
+        self._compile()
+        results = self._compile(patch_name="other")
+        self.assertEqual("miss", results["ir2c"]["cache"])
+
+    def test_abstraction_changed_miss(self):
+        self._compile()
+        self._write_patch("abs~.pd", TestCompileCache.__ABS_PATCH.format(220))
+        self.assertEqual("miss", self._compile()["ir2c"]["cache"])
+        self.assertEqual("hit", self._compile()["ir2c"]["cache"])
+
+    def test_abstraction_shadowed_miss(self):
+        # a new local abstraction overrides the library object of the same name
+        self._write_patch("root.pd", TestCompileCache.__ROOT_PATCH.replace("abs~", "osc~ 440"))
+        self._compile()
+        self._write_patch("osc~.pd", TestCompileCache.__ABS_PATCH.format(220))
+        self.assertEqual("miss", self._compile()["ir2c"]["cache"])
+
+    def test_eviction(self):
+        self._compile()
+        cache = CompileCache(self.cache_dir, max_size=1)
+        cache.evict()
+        self.assertEqual("miss", self._compile()["ir2c"]["cache"])
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_compile_cache.TestCompileCache"
@@ -0,0 +1,245 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append("../")
+from utils.pdgen import PdPatchGenerator
+
+SCRIPT_DIR = os.path.dirname(__file__)
+
+class TestCompileScaling(unittest.TestCase):
+    """ Measures how the time and peak memory of each stage of the compiler
+        grow with the size of synthetic patches. Every compile runs in its own
+        process, such that the peak memory of one does not hide the next.
+        The results are appended to a JSON history. A test fails if a stage
+        now scales worse than it used to on the same machine.
+    """
+
+    # the history of all measurements, per shape. It is kept outside of the
+    # build directory, which other tests delete.
+    HISTORY_PATH = os.environ.get("HVCC_COMPILE_SCALING_HISTORY",
+        os.path.join(SCRIPT_DIR, "benchmarks", "compile_scaling.json"))
+
+    # the number of measurements per shape which are kept in the history
+    __MAX_HISTORY = 100
+
+    # the sizes of the patches of each shape. See PdPatchGenerator.get_shapes().
+    __SIZES = {
+        "fanout": [100, 200, 400],
+        "chain": [250, 500, 1000],
+        "abstractions": [100, 200, 400],
+        "sendreceive": [100, 200, 400],
+        "table": [100000, 200000, 400000]
+    }
+
+    __STAGES = ["pd2hv", "hv2ir", "ir2c"]
+
+    # the best of this many compiles is reported
+    __NUM_ITERATIONS = 3
+
+    # The growth of a stage is measured as the exponent k of time ~ size^k.
+    # A stage regresses if k is larger than the median of the history by more
+    # than this threshold, e.g. if linear becomes quadratic. Stages that are
+    # faster than the minimum time at the largest size are only noise.
+    __EXPONENT_THRESHOLD = 0.3
+    __MIN_TIME = 0.05
+
+    # the peak memory at the largest size may not be this much larger than
+    # the median of the history
+    __MEMORY_THRESHOLD = 1.25
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="TestCompileScaling-")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _compile(self, pd_path):
+        """ Compiles a patch in a new process. Returns the best time of each
+            stage in seconds, and the peak memory of the process in bytes.
+        """
+        root_dir = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+        out_dir = os.path.join(os.path.dirname(pd_path), "out")
+        results_path = os.path.join(os.path.dirname(pd_path), "results.json")
+        times = {s: [] for s in TestCompileScaling.__STAGES}
+        peak_memory = []
+        for _ in xrange(TestCompileScaling.__NUM_ITERATIONS):
+            subprocess.check_output([
+                sys.executable, os.path.join(root_dir, "hvcc.py"), pd_path,
+                "-o", out_dir,
+                "--profile",
+                "--results_path", results_path], cwd=root_dir)
+            with open(results_path, "r") as f:
+                results = json.load(f)
+            for r in results.values():
+                self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+            for s in results["profile"]["sections"]:
+                if s["depth"] == 0:
+                    peak_memory.append(s["peak_memory"])
+                elif s["depth"] == 1 and s["name"] in times:
+                    times[s["name"]].append(s["time"])
+        return {k: min(v) for k, v in times.iteritems()}, min(peak_memory)
+
+    @classmethod
+    def _get_exponent(clazz, sizes, times):
+        """ Returns the slope of the least squares fit of log(time) over log(size).
+        """
+        x = [math.log(s) for s in sizes]
+        y = [math.log(max(t, 1e-6)) for t in times]
+        x_mean = sum(x) / len(x)
+        y_mean = sum(y) / len(y)
+        return sum((a-x_mean)*(b-y_mean) for a, b in zip(x, y)) / \
+            sum((a-x_mean)**2 for a in x)
+
+    @classmethod
+    def _median(clazz, values):
+        values = sorted(values)
+        return 0.5 * (values[(len(values)-1)/2] + values[len(values)/2])
+
+    def _update_history(self, record):
+        """ Appends a record to the history, and returns the previous records
+            of the same shape and sizes.
+        """
+        history = []
+        if os.path.isfile(TestCompileScaling.HISTORY_PATH):
+            with open(TestCompileScaling.HISTORY_PATH, "r") as f:
+                history = json.load(f)
+        previous = [r for r in history \
+            if r["shape"] == record["shape"] and r["sizes"] == record["sizes"]]
+
+        history = [r for r in history if r["shape"] != record["shape"]] + \
+            (previous + [record])[-TestCompileScaling.__MAX_HISTORY:]
+        if not os.path.isdir(os.path.dirname(TestCompileScaling.HISTORY_PATH)):
+            os.makedirs(os.path.dirname(TestCompileScaling.HISTORY_PATH))
+        with open(TestCompileScaling.HISTORY_PATH, "w") as f:
+            json.dump(history, f, indent=2, sort_keys=True)
+        return previous
+
+    def _test_shape(self, shape):
+        sizes = TestCompileScaling.__SIZES[shape]
+        record = {
+            "shape": shape,
+            "sizes": sizes,
+            "date": time.time(),
+            "times": {s: [] for s in TestCompileScaling.__STAGES},
+            "peak_memory": []
+        }
+
+        print ""
+        print "{0:<16} {1:>12} {2:>12} {3:>12} {4:>12}".format(
+            shape, "pd2hv (ms)", "hv2ir (ms)", "ir2c (ms)", "peak (MB)")
+        for size in sizes:
+            pd_path = PdPatchGenerator.write(shape, size,
+                os.path.join(self.out_dir, "{0}-{1}".format(shape, size), "{0}.pd".format(shape)))
+            times, peak_memory = self._compile(pd_path)
+            for s in TestCompileScaling.__STAGES:
+                record["times"][s].append(times[s])
+            record["peak_memory"].append(peak_memory)
+            print "{0:<16} {1:>12.2f} {2:>12.2f} {3:>12.2f} {4:>12.1f}".format(
+                size, *([1000*times[s] for s in TestCompileScaling.__STAGES] + [peak_memory/1048576.0]))
+
+        record["exponents"] = {s: TestCompileScaling._get_exponent(sizes, record["times"][s]) \
+            for s in TestCompileScaling.__STAGES}
+        print "{0:<16} {1:>12.2f} {2:>12.2f} {3:>12.2f}".format(
+            "exponent", *[record["exponents"][s] for s in TestCompileScaling.__STAGES])
+
+        # the measurement is recorded even if it regresses
+        self._assert_no_regression(record, self._update_history(record))
+
+    def _assert_no_regression(self, record, previous):
+        """ Fails if a stage of the record scales worse than in the previous
+            records, or if it needs more memory.
+        """
+        if not previous:
+            return
+
+        shape = record["shape"]
+        sizes = record["sizes"]
+        for s in TestCompileScaling.__STAGES:
+            if record["times"][s][-1] >= TestCompileScaling.__MIN_TIME:
+                expected = TestCompileScaling._median([r["exponents"][s] for r in previous])
+                self.assertLessEqual(
+                    record["exponents"][s],
+                    expected + TestCompileScaling.__EXPONENT_THRESHOLD,
+                    "{0} of {1} patches now grows with size^{2:.2f}, it used to grow with size^{3:.2f}.".format(
+                        s, shape, record["exponents"][s], expected))
+
+        expected = TestCompileScaling._median([r["peak_memory"][-1] for r in previous])
+        self.assertLessEqual(
+            record["peak_memory"][-1],
+            TestCompileScaling.__MEMORY_THRESHOLD * expected,
+            "{0} patches of size {1} now need {2:.1f}MB, they used to need {3:.1f}MB.".format(
+                shape, sizes[-1], record["peak_memory"][-1]/1048576.0, expected/1048576.0))
+
+    def test_fanout(self):
+        self._test_shape("fanout")
+
+    def test_chain(self):
+        self._test_shape("chain")
+
+    def test_abstractions(self):
+        self._test_shape("abstractions")
+
+    def test_sendreceive(self):
+        self._test_shape("sendreceive")
+
+    def test_table(self):
+        self._test_shape("table")
+
+    def test_regression(self):
+        # the history must survive the tests which delete the build directory
+        history_path = TestCompileScaling.HISTORY_PATH
+        self.assertNotEqual(
+            os.path.abspath(os.path.join(SCRIPT_DIR, "build")),
+            os.path.commonprefix([os.path.abspath(history_path), os.path.abspath(os.path.join(SCRIPT_DIR, "build"))]))
+
+        # a history of linear growth, which is then followed by quadratic growth
+        TestCompileScaling.HISTORY_PATH = os.path.join(self.out_dir, "history", "compile_scaling.json")
+        try:
+            sizes = [100, 200, 400]
+            def get_record(k, peak_memory):
+                times = [1e-3 * size**k for size in sizes]
+                return {
+                    "shape": "chain",
+                    "sizes": sizes,
+                    "date": time.time(),
+                    "times": {s: times for s in TestCompileScaling.__STAGES},
+                    "peak_memory": [peak_memory] * len(sizes),
+                    "exponents": {s: TestCompileScaling._get_exponent(sizes, times) \
+                        for s in TestCompileScaling.__STAGES}
+                }
+            for _ in xrange(3):
+                self._assert_no_regression(get_record(1.0, 1e8), self._update_history(get_record(1.0, 1e8)))
+
+            # the regressions are reported
+            previous = self._update_history(get_record(2.0, 1e8))
+            self.assertEqual(3, len(previous))
+            self.assertRaises(AssertionError, self._assert_no_regression, get_record(2.0, 1e8), previous)
+            self.assertRaises(AssertionError, self._assert_no_regression, get_record(1.0, 2e8), previous)
+            self._assert_no_regression(get_record(1.1, 1.1e8), previous)
+        finally:
+            TestCompileScaling.HISTORY_PATH = history_path
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_compile_scaling.TestCompileScaling"
@@ -0,0 +1,108 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import filecmp
+import json
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append("../")
+import hvcc
+from core.server.CompileServer import CompileClient, CompileServer
+
+SPEED_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "speed")
+
+class TestCompileServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestCompileServer-")
+        self.pd_path = os.path.abspath(os.path.join(SPEED_TEST_DIR, "test-14-obj-osc.pd"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _start_server(self):
+        socket_path = os.path.join(self.tmp_dir, "hvcc.sock")
+        thread = threading.Thread(target=hvcc.serve, args=(socket_path,))
+        thread.start()
+        for _ in xrange(500):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.01)
+        return socket_path, thread
+
+    def test_compile(self):
+        socket_path, thread = self._start_server()
+        client = CompileClient(socket_path)
+        try:
+            self.assertEqual("pong", client.call("ping"))
+
+            # the same connection serves several requests
+            out_dirs = [os.path.join(self.tmp_dir, "out{0}".format(i)) for i in xrange(2)]
+            for out_dir in out_dirs:
+                results = client.compile(in_path=self.pd_path, out_dir=out_dir)
+                self.assertEqual(["pd2hv", "hv2ir", "ir2c", "ir2c_perf"], results.keys())
+                for r in results.values():
+                    self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+
+            # the output is the same as that of a compile in this process
+            results = hvcc.compile_dataflow(self.pd_path, os.path.join(self.tmp_dir, "local"))
+            self.assertEqual(json.loads(json.dumps(results["hv2ir"]["ir"])),
+                client.compile(in_path=self.pd_path, out_dir=out_dirs[0])["hv2ir"]["ir"])
+            c_local = os.path.join(self.tmp_dir, "local", "c")
+            for out_dir in out_dirs:
+                _, mismatch, errors = filecmp.cmpfiles(c_local, os.path.join(out_dir, "c"),
+                    os.listdir(c_local), shallow=False)
+                self.assertEqual([], mismatch + errors)
+
+            # errors in the patch are reported in the results
+            results = client.compile(in_path=os.path.join(self.tmp_dir, "none.pd"), out_dir=self.tmp_dir)
+            self.assertTrue(results["hvcc"]["notifs"]["has_error"])
+
+            with self.assertRaises(RuntimeError):
+                client.call("unknown")
+        finally:
+            client.shutdown()
+            client.close()
+            thread.join()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_stdio(self):
+        server = CompileServer(hvcc.compile_dataflow)
+        stdin = StringIO.StringIO("\n".join([
+            json.dumps({"jsonrpc": "2.0", "id": 1, "method": "compile",
+                "params": {"in_path": self.pd_path, "out_dir": self.tmp_dir}}),
+            "{not json",
+            json.dumps({"jsonrpc": "2.0", "method": "ping"}), # notifications have no response
+            json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}),
+            json.dumps({"jsonrpc": "2.0", "id": 3, "method": "ping"})
+        ]) + "\n")
+        stdout = StringIO.StringIO()
+        server.serve_stdio(stdin, stdout)
+
+        responses = [json.loads(l) for l in stdout.getvalue().splitlines()]
+        self.assertEqual([1, None, 2], [r["id"] for r in responses])
+        self.assertIn("ir2c", responses[0]["result"])
+        self.assertEqual(CompileServer.PARSE_ERROR, responses[1]["error"]["code"])
+        self.assertEqual(3, server.num_requests)
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_compile_server.TestCompileServer"
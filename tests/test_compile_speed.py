@@ -0,0 +1,58 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+from utils.compilebench import CompileBenchmark
+
+class TestCompileSpeed(unittest.TestCase):
+    """ Checks the properties of the compiler which the benchmarks in
+        utils/compilebench.py measure, as far as they do not depend on the
+        speed of the machine. Run utils/compilebench.py for the timings.
+    """
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="TestCompileSpeed-")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def test_abstraction_instances(self):
+        # every directory is listed once, however many abstractions are instantiated
+        rows = [CompileBenchmark.abstraction_instances(self.out_dir,
+            num_iterations=1, num_instances=n)[0] for n in [20, 200]]
+        self.assertEqual(rows[0]["fs calls"], rows[1]["fs calls"])
+        self.assertLessEqual(rows[1]["fs calls"], 10)
+        self.assertGreater(rows[1]["saved"], 100*rows[1]["fs calls"])
+
+    def test_hv2ir_memory(self):
+        # bytes per object of the parsed and prepared graph. Before the hv2ir
+        # objects had __slots__, these were 3207, 3494 and 4180.
+        max_bytes = {"chain 4000": 1600, "sendreceive 400": 2200, "fanout 400": 2500}
+        for r in CompileBenchmark.hv2ir_memory(self.out_dir):
+            self.assertLess(r["per (B)"], max_bytes[r["patch"]], str(r))
+
+    def test_hv2ir_scaling(self):
+        # The prepare time per object is about constant. It grew with the
+        # size of the chain while removing an object searched the whole graph.
+        rows = CompileBenchmark.hv2ir_scaling(self.out_dir, num_iterations=3, sizes=(1000, 4000))
+        self.assertLess(rows[1]["per (us)"], 2.5*rows[0]["per (us)"], str(rows))
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_compile_speed.TestCompileSpeed"
@@ -0,0 +1,74 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+
+SPEED_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "speed")
+
+class TestDeterminism(unittest.TestCase):
+    """ The same patch must always generate the same C sources.
+    """
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="TestDeterminism-")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _compile(self, pd_path, out_name):
+        results = hvcc.compile_dataflow(pd_path, os.path.join(self.out_dir, out_name))
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        return results
+
+    def _test_identical_output(self, pd_name):
+        pd_path = os.path.join(SPEED_TEST_DIR, pd_name)
+        self._compile(pd_path, "a")
+        self._compile(pd_path, "b")
+
+        c_a = os.path.join(self.out_dir, "a", "c")
+        c_b = os.path.join(self.out_dir, "b", "c")
+        _, mismatch, errors = filecmp.cmpfiles(c_a, c_b, os.listdir(c_a), shallow=False)
+        self.assertEqual([], mismatch + errors)
+
+    def test_identical_output(self):
+        self._test_identical_output("test-00-fire.pd")
+
+    def test_identical_output_noise(self):
+        # noise~ objects are seeded from their id
+        self._test_identical_output("test-13-obj-noise.pd")
+
+    def test_stable_ids(self):
+        # adding an object to a patch does not change the ids of existing objects
+        pd_path = os.path.join(SPEED_TEST_DIR, "test-00-fire.pd")
+        pd_path_extra = os.path.join(self.out_dir, "test-00-fire.pd")
+        shutil.copy2(pd_path, pd_path_extra)
+        with open(pd_path_extra, "a") as f:
+            f.write("#X obj 10 10 print extra;\n")
+
+        ids = set(self._compile(pd_path, "a")["hv2ir"]["ir"]["objects"].keys())
+        ids_extra = set(self._compile(pd_path_extra, "b")["hv2ir"]["ir"]["objects"].keys())
+        self.assertTrue(ids < ids_extra)
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_determinism.TestDeterminism"
@@ -0,0 +1,93 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+
+class TestIncremental(unittest.TestCase):
+    """ Incremental recompiles, as used by hvcc --watch.
+    """
+
+    __PATCH = "#N canvas 0 0 450 300 10;\n#X obj {0} 10 osc~ {1};\n#X obj 10 40 dac~;\n#X connect 0 0 1 0;\n#X connect 0 0 1 1;\n"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestIncremental-")
+        self.pd_path = os.path.join(self.tmp_dir, "root.pd")
+        self.c_dir = os.path.join(self.tmp_dir, "c")
+        self.incremental = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _compile(self, x, freq):
+        with open(self.pd_path, "w") as f:
+            f.write(TestIncremental.__PATCH.format(x, freq))
+
+        # set all generated files to an old modification time to see which are rewritten
+        if os.path.isdir(self.c_dir):
+            for f in os.listdir(self.c_dir):
+                os.utime(os.path.join(self.c_dir, f), (0, 0))
+
+        results = hvcc.compile_dataflow(self.pd_path, self.tmp_dir, incremental=self.incremental)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        return results
+
+    def _get_skipped_stages(self, results):
+        return [k for k, r in results.iteritems() if r.get("incremental") == "skipped"]
+
+    def _get_rewritten_files(self):
+        return sorted(f for f in os.listdir(self.c_dir) \
+            if os.path.getmtime(os.path.join(self.c_dir, f)) > 0)
+
+    def test_unchanged_graph(self):
+        self._compile(10, 440)
+        results = self._compile(10, 440)
+        self.assertEqual(["hv2ir", "ir2c", "ir2c_perf"], self._get_skipped_stages(results))
+        self.assertEqual(["pd2hv", "hv2ir", "ir2c", "ir2c_perf"], results.keys())
+        self.assertEqual([], self._get_rewritten_files())
+
+    def test_unchanged_ir(self):
+        # moving an object changes the graph, but not the IR
+        self._compile(10, 440)
+        results = self._compile(20, 440)
+        self.assertEqual(["ir2c", "ir2c_perf"], self._get_skipped_stages(results))
+        self.assertEqual([], self._get_rewritten_files())
+
+    def test_changed_ir(self):
+        self._compile(10, 440)
+        results = self._compile(10, 220)
+        self.assertEqual([], self._get_skipped_stages(results))
+        # only the context implementation depends on the frequency
+        self.assertEqual(["Heavy_heavy.cpp"], self._get_rewritten_files())
+
+    def test_error(self):
+        # a failed compile is not reused
+        self._compile(10, 440)
+        with open(self.pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n#X obj 10 10 unknown_object;\n")
+        results = hvcc.compile_dataflow(self.pd_path, self.tmp_dir, incremental=self.incremental)
+        self.assertTrue(results["pd2hv"]["notifs"]["has_error"])
+        self.assertEqual({}, self.incremental)
+        self.assertEqual([], self._get_skipped_stages(self._compile(10, 440)))
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_incremental.TestIncremental"
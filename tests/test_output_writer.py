@@ -0,0 +1,107 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+from generators.output.OutputWriter import OutputWriter
+
+SPEED_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "speed")
+
+class TestOutputWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestOutputWriter-")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _get_mtimes(self, directory):
+        return {os.path.join(d, f): os.path.getmtime(os.path.join(d, f)) \
+            for d, _, files in os.walk(directory) for f in files}
+
+    def _set_old_mtimes(self, directory):
+        for path in self._get_mtimes(directory):
+            os.utime(path, (0, 0))
+
+    def test_write(self):
+        path = os.path.join(self.tmp_dir, "a", "b.txt")
+        writer = OutputWriter()
+        writer.write(path, u"hello")
+        writer.write(path, "hello")
+        writer.write(path, "world")
+        self.assertEqual({"written": 2, "skipped": 1, "removed": 0}, writer.get_counts())
+        with open(path, "r") as f:
+            self.assertEqual("world", f.read())
+
+    def test_write_stream(self):
+        path = os.path.join(self.tmp_dir, "a", "b.txt")
+        writer = OutputWriter()
+        writer.write_stream(path, [u"hel", "lo"])
+        writer.write_stream(path, (c for c in "hello"))
+        writer.write_stream(path, ["world"])
+        self.assertEqual({"written": 2, "skipped": 1, "removed": 0}, writer.get_counts())
+        self.assertEqual(["b.txt"], os.listdir(os.path.dirname(path)))
+        with open(path, "r") as f:
+            self.assertEqual("world", f.read())
+
+    def test_copy_tree(self):
+        src_dir = os.path.join(self.tmp_dir, "src")
+        dst_dir = os.path.join(self.tmp_dir, "dst")
+        writer = OutputWriter()
+        writer.write(os.path.join(src_dir, "a.c"), "a")
+        writer.write(os.path.join(src_dir, "sub", "b.c"), "b")
+        writer.write(os.path.join(dst_dir, "old.c"), "old")
+        writer.write(os.path.join(dst_dir, "build", "a.o"), "o")
+
+        writer = OutputWriter()
+        writer.copy_tree(src_dir, dst_dir)
+        writer.copy_tree(src_dir, dst_dir)
+        writer.remove_stale(dst_dir)
+        self.assertEqual({"written": 2, "skipped": 2, "removed": 1}, writer.get_counts())
+        self.assertEqual(
+            sorted(os.path.join(dst_dir, f) for f in ["a.c", os.path.join("sub", "b.c"), os.path.join("build", "a.o")]),
+            sorted(self._get_mtimes(dst_dir).keys()))
+
+    def test_generators(self):
+        # all generators which do not depend on external tools
+        generators = ["bela", "fabric", "pdext", "unity", "vst2", "wwise"]
+        pd_path = os.path.join(SPEED_TEST_DIR, "test-14-obj-osc.pd")
+        results = hvcc.compile_dataflow(pd_path, self.tmp_dir, generators=generators)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        self.assertGreater(results["c2unity"]["files"]["written"], 0)
+
+        # recompiling the same patch does not touch any files
+        self._set_old_mtimes(self.tmp_dir)
+        results = hvcc.compile_dataflow(pd_path, self.tmp_dir, generators=generators)
+        for k, r in results.iteritems():
+            if "files" in r:
+                self.assertEqual(0, r["files"]["written"], k)
+                self.assertGreater(r["files"]["skipped"], 0, k)
+        self.assertEqual([], [p for p, t in self._get_mtimes(self.tmp_dir).iteritems() if t > 0])
+
+        # a renamed patch removes the previously generated wrapper sources
+        results = hvcc.compile_dataflow(pd_path, self.tmp_dir, generators=generators, patch_name="other")
+        self.assertEqual(2, results["c2vst2"]["files"]["removed"])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "vst2.4", "source", "HeavyVst2_heavy.cpp")))
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_output_writer.TestOutputWriter"
@@ -0,0 +1,167 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+from interpreters.pd2hv.HeavyGraph import HeavyGraph
+from interpreters.pd2hv.PdParser import PdParser
+from interpreters.pd2hv.pd2hv import pd2hv
+
+class TestPdParser(unittest.TestCase):
+
+    __ABS_PATCH = "#N canvas 0 0 450 300 10;\n#X obj 10 10 inlet;\n#X obj 10 40 outlet;\n#X connect 0 0 1 0;\n"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestPdParser-")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_patch(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def _to_hv_json(self, g):
+        # loadbang priorities are global, and differ between parses
+        return re.sub("\"priority\": -?\\d+", "", json.dumps(g.to_hv(), sort_keys=True))
+
+    def test_search_paths(self):
+        self._write_patch(os.path.join("lib", "declared.pd"), TestPdParser.__ABS_PATCH)
+        self._write_patch(os.path.join("sub", "nested.pd"), TestPdParser.__ABS_PATCH)
+        self._write_patch("local.pd", TestPdParser.__ABS_PATCH)
+        lines = ["#N canvas 0 0 450 300 10;", "#X declare -path lib;"]
+        for _ in xrange(10):
+            lines.extend([
+                "#X obj 10 10 declared;",
+                "#X obj 10 10 sub/nested;",
+                "#X obj 10 10 local;",
+                "#X obj 10 10 lop~ 100;"
+            ])
+        pd_path = self._write_patch("root.pd", "\n".join(lines) + "\n")
+
+        parser = PdParser()
+        g = parser.graph_from_file(pd_path)
+        self.assertEqual([], g.get_notices()["errors"])
+        self.assertIn(os.path.join(self.tmp_dir, "lib", "declared.pd"), parser.dependencies)
+        self.assertIn(os.path.join(self.tmp_dir, "sub", "nested.pd"), parser.dependencies)
+
+        # every directory is listed only once, and each abstraction is resolved once
+        fs_calls = parser.get_fs_call_counts()
+        self.assertGreater(fs_calls["saved"], 10*fs_calls["made"])
+
+    def test_missing_abstraction(self):
+        pd_path = self._write_patch("root.pd", "#N canvas 0 0 450 300 10;\n#X obj 10 10 missing;\n")
+        g = PdParser().graph_from_file(pd_path)
+        self.assertEqual(1, len(g.get_notices()["errors"]))
+
+    def test_prefetch_abstractions(self):
+        self._write_patch(os.path.join("lib", "declared.pd"),
+            "#N canvas 0 0 450 300 10;\n#X obj 10 10 inlet;\n#X obj 10 40 nested;\n#X connect 0 0 1 0;\n")
+        self._write_patch(os.path.join("lib", "nested.pd"), TestPdParser.__ABS_PATCH)
+        self._write_patch(os.path.join("sub", "local.pd"), TestPdParser.__ABS_PATCH)
+        pd_path = self._write_patch("root.pd", "\n".join([
+            "#N canvas 0 0 450 300 10;",
+            "#X declare -path lib;",
+            "#X obj 10 10 declared;",
+            "#X obj 10 40 sub/local;",
+            "#X obj 10 70 declared;",
+            "#X obj 10 100 lop~ 100;",
+            "#X connect 1 0 2 0;"
+        ]) + "\n")
+
+        parser = PdParser()
+        g = parser.graph_from_file(pd_path)
+        self.assertEqual([], g.get_notices()["errors"])
+
+        # the abstractions are tokenized in two levels, library files are not prefetched
+        prefetching_parser = PdParser()
+        self.assertEqual(3, prefetching_parser.prefetch_abstractions(pd_path, jobs=2))
+        num_fs_calls = prefetching_parser.get_fs_call_counts()["made"]
+        self.assertEqual(
+            self._to_hv_json(g),
+            self._to_hv_json(prefetching_parser.graph_from_file(pd_path)))
+        self.assertEqual(parser.dependencies, prefetching_parser.dependencies)
+        self.assertEqual(parser.search_directories, prefetching_parser.search_directories)
+
+        # the directories listed while prefetching are not listed again
+        self.assertGreater(num_fs_calls, 0)
+        self.assertEqual(parser.get_fs_call_counts()["made"], prefetching_parser.get_fs_call_counts()["made"])
+
+    def test_heavy_graph_args(self):
+        hv_path = self._write_patch("gain.hv.json", json.dumps({
+            "type": "graph",
+            "imports": [],
+            "args": [{"name": "gain", "value_type": "float", "default": 1.0, "required": False}],
+            "objects": {
+                "in": {"type": "inlet", "args": {"type": "-~>", "index": 0}},
+                "mul": {"type": "*~", "args": {"k": "$gain"}},
+                "out": {"type": "outlet", "args": {"type": "-~>", "index": 0}}
+            },
+            "connections": [
+                {"from": {"id": "in", "outlet": 0}, "to": {"id": "mul", "inlet": 0}, "type": "-~>"},
+                {"from": {"id": "mul", "outlet": 0}, "to": {"id": "out", "inlet": 0}, "type": "-~>"}
+            ]
+        }))
+
+        # every instance resolves its arguments in its own copy of the graph
+        x = HeavyGraph(hv_path, obj_args=[0.5])
+        y = HeavyGraph(hv_path)
+        self.assertEqual([], x.get_notices()["errors"])
+        self.assertEqual(0.5, x.to_hv()["objects"]["mul"]["args"]["k"])
+        self.assertEqual(1.0, y.to_hv()["objects"]["mul"]["args"]["k"])
+        self.assertEqual("-~>", y.get_outlet_connection_type(0))
+
+    def test_production(self):
+        pd_path = self._write_patch("root.pd", "\n".join([
+            "#N canvas 0 0 450 300 10;",
+            "#X obj 10 10 loadbang;",
+            "#X text 10 40 a comment;",
+            "#X obj 10 70 cnv 15 100 60 empty empty empty 20 12 0 14 -233017 -66577 0;",
+            "#X obj 10 100;",
+            "#N canvas 0 0 450 300 sub 0;",
+            "#X obj 10 10 inlet;",
+            "#X text 10 40 another comment;",
+            "#X obj 10 70 print;",
+            "#X connect 0 0 2 0;",
+            "#X restore 10 130 pd sub;",
+            "#X connect 0 0 4 0;"
+        ]) + "\n")
+        hv_default = pd2hv.compile(pd_path, None)["hv"]
+        results = pd2hv.compile(pd_path, None, production=True)
+        hv_production = results["hv"]
+
+        # the remaining objects keep their ids
+        self.assertEqual(["graph_0", "graph_4"], sorted(hv_production["objects"].keys()))
+        self.assertEqual(["graph_2", "inlet_0"], sorted(hv_production["objects"]["graph_4"]["objects"].keys()))
+        self.assertEqual(hv_default["connections"], hv_production["connections"])
+
+        # also the comments in the library abstractions are removed
+        self.assertGreater(results["stripped"], 5)
+        self.assertNotIn("\"comment\"", json.dumps(hv_production))
+        self.assertNotIn("\"properties\"", json.dumps(hv_production))
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_pd_parser.TestPdParser"
@@ -0,0 +1,78 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+from interpreters.pd2hv.PdTokenizer import PdTokenizer
+
+class TestPdTokenizer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestPdTokenizer-")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _tokenize(self, content):
+        pd_path = os.path.join(self.tmp_dir, "test.pd")
+        with open(pd_path, "wb") as f:
+            f.write(content)
+        return PdTokenizer.tokenize(pd_path)
+
+    def test_records(self):
+        records = self._tokenize(
+            "#N canvas 0 0 450 300 10;\n"
+            "#X obj 10 10 t b b, f 22;\n"
+            "#X msg 10 40 1 \\; 2;\n"
+            "#X connect 0 0 1 0;\n"
+            "#A 0 1 2;\n"
+            "#N struct foo float x;\n")
+        self.assertEqual(["canvas", "obj", "msg", "connect", "A", "N"], [r.kind for r in records])
+        self.assertEqual(("#X", "obj", "10", "10", "t", "b", "b"), records[1].tokens)
+        self.assertEqual("#X msg 10 40 1 \\; 2", records[2].line)
+
+    def test_split_lines(self):
+        records = self._tokenize(
+            "#N canvas 0 0 450 300 10;\r\n"
+            "#X text 10 10 a comment\r\n"
+            "over two lines;\r\n"
+            "\r\n"
+            "#X obj 10 40 f;\r\n"
+            "#X obj 10 70 unterminated")
+        self.assertEqual(3, len(records))
+        self.assertEqual("#X text 10 10 a comment over two lines", records[1].line)
+        self.assertEqual("#X obj 10 40 f", records[2].line)
+
+    def test_hv_args(self):
+        records = self._tokenize(
+            "#N canvas 0 0 450 300 10;\n"
+            "#N canvas 0 0 450 300 10;\n"
+            "#X restore 10 10 pd a;\n"
+            "#N canvas 0 0 450 300 10;\n"
+            "#X text 10 10 @hv_arg \\$1 freq float 440 false;\n"
+            "#X restore 10 40 pd b;\n"
+            "#X text 10 10 @hv_arg \\$2 gain float 1 true;\n")
+        canvases = [r for r in records if r.kind == "canvas"]
+        self.assertEqual([(1, "gain", "float", "1", True)], canvases[0].hv_args)
+        self.assertEqual([], canvases[1].hv_args)
+        self.assertEqual([(0, "freq", "float", "440", False)], canvases[2].hv_args)
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_pd_tokenizer.TestPdTokenizer"
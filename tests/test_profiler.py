@@ -0,0 +1,81 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+from core.profiler.Profiler import Profiler
+
+SPEED_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "speed")
+
+class TestProfiler(unittest.TestCase):
+
+    __PASSES = [
+        "_resolve_connection_types",
+        "_remove_unused_inlet_connections",
+        "remap_send_receive",
+        "reduce",
+        "cascade_expansion",
+        "fma_replacement",
+        "group_control_receivers",
+        "assign_signal_buffers"
+    ]
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="TestProfiler-")
+        self.pd_path = os.path.join(SPEED_TEST_DIR, "test-14-obj-osc.pd")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _compile(self, profiler, **kwargs):
+        with profiler.measure("hvcc"):
+            results = hvcc.compile_dataflow(self.pd_path, self.out_dir,
+                generators=["pdext", "unity"], profiler=profiler, **kwargs)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        return [(r["name"], r["depth"]) for r in profiler.records]
+
+    def test_sections(self):
+        sections = self._compile(Profiler())
+        self.assertEqual(
+            [("hvcc", 0), ("pd2hv", 1), ("hv2ir", 1), ("parse", 2), ("prepare", 2)] + \
+            [(p, 3) for p in TestProfiler.__PASSES] + \
+            [("to_ir", 2), ("ir2c", 1), ("c2pdext", 1), ("c2unity", 1)],
+            sections)
+
+    def test_pooled_generators(self):
+        # the records of the worker processes are merged
+        sections = self._compile(Profiler(), jobs=2)
+        self.assertEqual([("c2pdext", 1), ("c2unity", 1)], sections[-2:])
+
+    def test_disabled(self):
+        self.assertEqual([], self._compile(Profiler(enabled=False)))
+
+    def test_cprofile(self):
+        profiler = Profiler(cprofile=True)
+        self._compile(profiler)
+        prof_path = os.path.join(self.out_dir, "hvcc.prof")
+        profiler.dump_cprofile(prof_path)
+        self.assertTrue(any(f[2] == "compile_dataflow" for f in pstats.Stats(prof_path).stats))
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_profiler.TestProfiler"
@@ -95,7 +95,7 @@ class TestPdSignalPatches(unittest.TestCase):
             self.fail(e)
 
     @classmethod
-    def _run_hvcc(clazz, pd_path):
+    def _run_hvcc(clazz, pd_path, **kwargs):
         """Run hvcc on a Pd file. Returns the output directory.
         """
 
@@ -104,7 +104,7 @@ class TestPdSignalPatches(unittest.TestCase):
         if os.path.exists(out_dir):
             shutil.rmtree(out_dir)
 
-        hvcc_results = hvcc.compile_dataflow(pd_path, out_dir)
+        hvcc_results = hvcc.compile_dataflow(pd_path, out_dir, **kwargs)
         for r in hvcc_results.values():
             # if there are any errors from hvcc, fail immediately
             # TODO(mhroth): standardise how errors and warnings are returned between stages
@@ -113,7 +113,7 @@ class TestPdSignalPatches(unittest.TestCase):
 
         return out_dir
 
-    def _test_signal_patch(self, pd_file):
+    def _test_signal_patch(self, pd_file, **kwargs):
         """Compiles, runs, and tests a signal patch.
         """
 
@@ -123,7 +123,7 @@ class TestPdSignalPatches(unittest.TestCase):
         self.assertTrue(os.path.exists(golden_path), "File not found: {0}".format(golden_path))
 
         try:
-            out_dir = TestPdSignalPatches._run_hvcc(pd_path)
+            out_dir = TestPdSignalPatches._run_hvcc(pd_path, **kwargs)
         except Exception as e:
             self.fail(str(e))
 
@@ -155,6 +155,18 @@ class TestPdSignalPatches(unittest.TestCase):
     def test_phasor_control(self):
         self._test_signal_patch("test-phasor-control.pd")
 
+    def test_line_liveness(self):
+        self._test_signal_patch("test-line.pd", buffer_allocation="liveness")
+
+    def test_phasor_control_liveness(self):
+        self._test_signal_patch("test-phasor-control.pd", buffer_allocation="liveness")
+
+    def test_line_working_set(self):
+        self._test_signal_patch("test-line.pd", signal_ordering="working-set")
+
+    def test_phasor_control_working_set(self):
+        self._test_signal_patch("test-phasor-control.pd", signal_ordering="working-set")
+
 def main():
     parser = argparse.ArgumentParser(
         description="A script used to generate golden files for signal tests.")
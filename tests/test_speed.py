@@ -33,6 +33,8 @@ class TestPdPatches(unittest.TestCase):
 
     def _compile_and_run_patch(self, pd_path, out_dir, samplerate=None, blocksize=None, num_iterations=None, flag=None):
         hvcc_results = hvcc.compile_dataflow(pd_path, out_dir, verbose=False)
+        for r in hvcc_results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
 
         # determine correct compiler flags
         flag = flag or "HV_SIMD_NONE"
@@ -50,10 +52,8 @@ class TestPdPatches(unittest.TestCase):
         # all warnings are errors (except for #warning)
         # assertions are NOT turned off (help to catch errors)
         c_flags += [
-            "-std=c11",
             "-O3", "-ffast-math", "-DNDEBUG",
-            "-Werror", "-Wno-#warnings", "-Wno-unused-function",
-            "-lm"]
+            "-Werror", "-Wno-#warnings", "-Wno-unused-function"]
 
         exe_path = os.path.join(out_dir, "heavy")
         c_src_dir = os.path.join(out_dir, "c")
@@ -61,11 +61,20 @@ class TestPdPatches(unittest.TestCase):
         # copy additional source
         shutil.copy2(os.path.join(SCRIPT_DIR, "test_speed.c"), c_src_dir)
 
-        c_sources = [os.path.join(c_src_dir, c) for c in os.listdir(c_src_dir) if c.endswith(".c")]
-
-        # run the compile command
-        cmd = ["clang"] + c_flags + c_sources + ["-o", exe_path]
-        subprocess.check_output(cmd)
+        # the C and C++ sources are compiled separately, and linked together
+        o_files = []
+        for c in sorted(os.listdir(c_src_dir)):
+            if c.endswith(".c"):
+                cmd = ["clang", "-std=c11"]
+            elif c.endswith(".cpp"):
+                cmd = ["clang++", "-std=c++11", "-fno-exceptions", "-fno-rtti"]
+            else:
+                continue
+            o_files.append(os.path.join(c_src_dir, c + ".o"))
+            subprocess.check_output(cmd + c_flags + ["-c", os.path.join(c_src_dir, c), "-o", o_files[-1]])
+
+        # run the link command
+        subprocess.check_output(["clang++"] + o_files + ["-lm", "-o", exe_path])
 
         # run executable
         result = subprocess.check_output([
@@ -0,0 +1,94 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../")
+import hvcc
+from core.tables.TableValues import TableValues
+from generators.ir2c.HeavyTable import HeavyTable
+
+CONTROL_TEST_DIR = os.path.join(os.path.dirname(__file__), "pd", "control")
+
+class TestTableValues(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="TestTableValues-")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_sidecar(self):
+        json_path = os.path.join(self.tmp_dir, "heavy.hv.json")
+        obj = {
+            "a": {"values": TableValues.new([0.5, -1.0, 2.0])},
+            "b": {"values": TableValues.new([0.25])},
+            "c": {"values": [1.0, 2.0]}
+        }
+        TableValues.dump(obj, json_path, sort_keys=True)
+        self.assertEqual(16, os.path.getsize(os.path.join(self.tmp_dir, "heavy.hv.tables")))
+
+        # the JSON only refers to the table values
+        with open(json_path, "r") as f:
+            refs = json.load(f)
+        self.assertEqual({"sidecar": "heavy.hv.tables", "offset": 3, "length": 1}, refs["b"]["values"])
+        self.assertEqual([1.0, 2.0], refs["c"]["values"])
+
+        self.assertEqual(obj, TableValues.load(json_path))
+
+        # a graph without table values has no sidecar file
+        TableValues.dump({"c": obj["c"]}, json_path)
+        self.assertEqual(["heavy.hv.json"], os.listdir(self.tmp_dir))
+
+    def test_table_data_decl(self):
+        values = TableValues.new([0.0, 1.0, -0.5, 0.1, 1e-10, -3.0, 0.0])
+        decl = HeavyTable.get_table_data_decl("__table", "x", {"values": values})
+        self.assertEqual(
+            "float hTable_x_data[7] = {0.0f, 1.0f, -0.5f, 0.100000001f, 1.00000001e-10f, -3.0f, 0.0f};",
+            "".join(decl[0]))
+
+    def test_emit_intermediates(self):
+        pd_path = os.path.join(CONTROL_TEST_DIR, "test-array.pd")
+        results = hvcc.compile_dataflow(pd_path, self.tmp_dir, emit_intermediates=True)
+        for r in results.values():
+            self.assertFalse(r["notifs"].get("has_error", False), str(r["notifs"]))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir, "hv", "test-array.hv.tables")))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir, "ir", "heavy.heavy.ir.tables")))
+        with open(os.path.join(self.tmp_dir, "c", "Heavy_heavy.cpp"), "r") as f:
+            cpp = f.read()
+
+        # the HeavyIR is read back from the intermediate files
+        results = hvcc.compile_dataflow(os.path.join(self.tmp_dir, "c"), self.tmp_dir)
+        self.assertNotIn("hvcc", results)
+
+        # the C sources are the same if they are generated from the intermediate files
+        ir_path = os.path.join(self.tmp_dir, "ir", "heavy.heavy.ir.json")
+        results = hvcc.get_stage("ir2c").compile(
+            hv_ir_path=ir_path,
+            static_dir=os.path.join(os.path.dirname(hvcc.__file__), "generators", "ir2c", "static"),
+            output_dir=os.path.join(self.tmp_dir, "c"),
+            externs=hvcc.generate_extern_info(TableValues.load(ir_path), {}))
+        self.assertFalse(results["notifs"]["has_error"])
+        self.assertEqual(0, results["files"]["written"])
+        with open(os.path.join(self.tmp_dir, "c", "Heavy_heavy.cpp"), "r") as f:
+            self.assertEqual(cpp, f.read())
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_table_values.TestTableValues"
@@ -0,0 +1,52 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import unittest
+
+sys.path.append("../")
+from generators.template_env import template_env_manager
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "generators", "ir2c", "templates")
+
+def upper(s):
+    return s.upper()
+
+def lower(s):
+    return s.lower()
+
+class TestTemplateEnvManager(unittest.TestCase):
+
+    def test_shared_environment(self):
+        env = template_env_manager.get_environment(TEMPLATE_DIR, filters={"to_case": upper})
+        self.assertIs(env, template_env_manager.get_environment(
+            os.path.join(TEMPLATE_DIR, "."), filters={"to_case": upper}))
+
+    def test_filters_and_encoding(self):
+        # callers with other filters or another encoding never get an environment without theirs
+        env = template_env_manager.get_environment(TEMPLATE_DIR, filters={"to_case": upper})
+        env_lower = template_env_manager.get_environment(TEMPLATE_DIR, filters={"to_case": lower})
+        env_both = template_env_manager.get_environment(TEMPLATE_DIR, filters={"to_case": upper, "from_case": lower})
+        env_latin = template_env_manager.get_environment(TEMPLATE_DIR, filters={"to_case": upper}, encoding="latin-1")
+        self.assertEqual(4, len(set([env, env_lower, env_both, env_latin])))
+        self.assertIs(upper, env.filters["to_case"])
+        self.assertIs(lower, env_lower.filters["to_case"])
+        self.assertIs(lower, env_both.filters["from_case"])
+        self.assertEqual("latin-1", env_latin.loader.encoding)
+        self.assertNotIn("to_case", template_env_manager.get_environment(TEMPLATE_DIR).filters)
+
+if __name__ == "__main__":
+    print "Usage: $ nose2 test_template_env_manager.TestTemplateEnvManager"
@@ -0,0 +1,566 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import hvcc
+from interpreters.pd2hv.PdParser import PdParser
+from interpreters.pd2hv.PdTokenizer import PdTokenizer
+from core.profiler.Profiler import Profiler
+from core.server.CompileServer import CompileClient
+from utils.pdgen import PdPatchGenerator
+
+SCRIPT_DIR = os.path.dirname(__file__)
+ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+SPEED_TEST_DIR = os.path.join(ROOT_DIR, "tests", "pd", "speed")
+CONTROL_TEST_DIR = os.path.join(ROOT_DIR, "tests", "pd", "control")
+
+class CompileBenchmark:
+    """ Benchmarks of the compiler itself (as opposed to utils/signalbench.py,
+        which benchmarks the generated code). Each benchmark returns its
+        results as a list of rows, {column: value}, which main() prints as a
+        table. Timed operations report the best of num_iterations runs.
+    """
+
+    # the columns of the results of each benchmark, in the order they are printed
+    __COLUMNS = {
+        "in_memory_pipeline": ["patch", "files (ms)", "memory (ms)", "saved (%)"],
+        "parallel_generators": ["generators", "jobs", "total (ms)"],
+        "batch_compile": ["patches", "process (ms)", "batch (ms)", "saved (%)"],
+        "abstraction_instances": ["instances", "parse (ms)", "per (us)", "fs calls", "saved"],
+        "parallel_abstractions": ["abstractions", "jobs", "parse (ms)"],
+        "max_abstraction_instances": ["instances", "max2hv (ms)", "per (us)"],
+        "heavy_graph_instances": ["instances", "parse (ms)", "per (us)"],
+        "large_tables": ["values", "compile (ms)", "per (us)", "intermediates (ms)"],
+        "production_mode": ["mode", "hv (KB)", "hv2ir parse (ms)", "compile (ms)"],
+        "hv2ir_memory": ["patch", "objects", "parse (MB)", "prepare (MB)", "per (B)"],
+        "hv2ir_scaling": ["chain", "prepare (ms)", "reduce (ms)", "per (us)"],
+        "tokenizer_scaling": ["lines", "tokenize (ms)", "tokenize per (us)", "parse (ms)", "parse per (us)"],
+        "startup": ["command", "time (ms)"],
+        "compile_server": ["patch", "process (ms)", "server (ms)"]
+    }
+
+    @classmethod
+    def get_benchmarks(clazz):
+        return sorted(CompileBenchmark.__COLUMNS.keys())
+
+    @classmethod
+    def get_columns(clazz, name):
+        return list(CompileBenchmark.__COLUMNS[name])
+
+    @classmethod
+    def run(clazz, name, out_dir, num_iterations=5):
+        """ Runs a benchmark by name. Returns its rows.
+        """
+        return getattr(clazz, name)(out_dir, num_iterations)
+
+    @classmethod
+    def __check(clazz, results):
+        for r in results.values():
+            if r["notifs"].get("has_error", False):
+                raise Exception(str(r["notifs"]))
+
+    @classmethod
+    def __time_compile(clazz, pd_path, out_dir, num_iterations, **kwargs):
+        """ Returns the best compile time of a patch, in seconds.
+        """
+        times = []
+        for _ in xrange(num_iterations):
+            tick = time.time()
+            results = hvcc.compile_dataflow(pd_path, out_dir, **kwargs)
+            times.append(time.time() - tick)
+            CompileBenchmark.__check(results)
+        return min(times)
+
+    @classmethod
+    def __get_patches(clazz, pd_dir):
+        return [os.path.join(pd_dir, f) for f in sorted(os.listdir(pd_dir)) if f.endswith(".pd")]
+
+    @classmethod
+    def in_memory_pipeline(clazz, out_dir, num_iterations=5):
+        rows = []
+        for pd_path in CompileBenchmark.__get_patches(SPEED_TEST_DIR):
+            t_files = CompileBenchmark.__time_compile(pd_path, out_dir, num_iterations, emit_intermediates=True)
+            t_memory = CompileBenchmark.__time_compile(pd_path, out_dir, num_iterations, emit_intermediates=False)
+            rows.append({
+                "patch": os.path.basename(pd_path),
+                "files (ms)": 1000*t_files,
+                "memory (ms)": 1000*t_memory,
+                "saved (%)": 100.0*(t_files-t_memory)/t_files
+            })
+        return rows
+
+    @classmethod
+    def parallel_generators(clazz, out_dir, num_iterations=5):
+        # all generators which do not depend on external tools
+        generators = ["bela", "fabric", "pdext", "unity", "vst2", "wwise"]
+        pd_path = os.path.join(SPEED_TEST_DIR, "test-00-fire.pd")
+        return [{
+            "generators": len(generators),
+            "jobs": jobs,
+            "total (ms)": 1000*CompileBenchmark.__time_compile(pd_path, out_dir, num_iterations,
+                generators=generators, jobs=jobs)
+        } for jobs in sorted(set([1, multiprocessing.cpu_count()]))]
+
+    @classmethod
+    def batch_compile(clazz, out_dir, num_iterations=5):
+        pd_paths = CompileBenchmark.__get_patches(CONTROL_TEST_DIR)[:20]
+        hvcc_path = os.path.join(ROOT_DIR, "hvcc.py")
+
+        # one hvcc process per patch
+        tick = time.time()
+        for i, pd_path in enumerate(pd_paths):
+            subprocess.check_output([sys.executable, hvcc_path, pd_path,
+                "-o", os.path.join(out_dir, "process", str(i))])
+        t_process = time.time() - tick
+
+        # all patches in one process
+        tick = time.time()
+        hvcc.compile_many([{
+            "in_path": pd_path,
+            "out_dir": os.path.join(out_dir, "batch", str(i))
+        } for i, pd_path in enumerate(pd_paths)])
+        t_batch = time.time() - tick
+
+        return [{
+            "patches": len(pd_paths),
+            "process (ms)": 1000*t_process,
+            "batch (ms)": 1000*t_batch,
+            "saved (%)": 100.0*(t_process-t_batch)/t_process
+        }]
+
+    @classmethod
+    def abstraction_instances(clazz, out_dir, num_iterations=5, num_instances=2000):
+        # many instances of a few library abstractions
+        pd_path = os.path.join(out_dir, "instances.pd")
+        obj_types = ["lop~ 1000", "hip~ 10", "*~ 0.5", "+~ 1", "clip~ -1 1", "wrap~"]
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n#X obj 10 10 osc~ 440;\n")
+            for i in xrange(num_instances):
+                f.write("#X obj 10 10 {0};\n".format(obj_types[i % len(obj_types)]))
+            f.write("#X obj 10 10 dac~;\n")
+            for i in xrange(num_instances+1):
+                f.write("#X connect {0} 0 {1} 0;\n".format(i, i+1))
+
+        times = []
+        for _ in xrange(num_iterations):
+            parser = PdParser()
+            tick = time.time()
+            g = parser.graph_from_file(pd_path)
+            times.append(time.time() - tick)
+            if g.get_notices()["errors"]:
+                raise Exception(str(g.get_notices()["errors"]))
+        fs_calls = parser.get_fs_call_counts()
+
+        return [{
+            "instances": num_instances,
+            "parse (ms)": 1000*min(times),
+            "per (us)": 1000000*min(times)/num_instances,
+            "fs calls": fs_calls["made"],
+            "saved": fs_calls["saved"]
+        }]
+
+    @classmethod
+    def parallel_abstractions(clazz, out_dir, num_iterations=5):
+        # many distinct abstractions, which can be tokenized independently
+        num_abstractions = 32
+        num_objects = 500
+        pd_path = os.path.join(out_dir, "project.pd")
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n")
+            for i in xrange(num_abstractions):
+                f.write("#X obj 10 10 abs_{0};\n".format(i))
+        for i in xrange(num_abstractions):
+            with open(os.path.join(out_dir, "abs_{0}.pd".format(i)), "w") as f:
+                f.write("#N canvas 0 0 450 300 10;\n#X obj 10 10 inlet;\n")
+                for j in xrange(num_objects):
+                    f.write("#X obj 10 {0} + {1};\n".format(j, j))
+                    f.write("#X text 100 {0} adds {1} to the output of the object above;\n".format(j, j))
+                for j in xrange(num_objects):
+                    if j % 10 != 0: # in short chains
+                        f.write("#X connect {0} 0 {1} 0;\n".format(2*j-1, 2*j+1))
+
+        rows = []
+        for jobs in sorted(set([1, max(2, multiprocessing.cpu_count())])):
+            times = []
+            for _ in xrange(num_iterations):
+                parser = PdParser()
+                tick = time.time()
+                if jobs > 1:
+                    parser.prefetch_abstractions(pd_path, jobs)
+                g = parser.graph_from_file(pd_path)
+                times.append(time.time() - tick)
+                if g.get_notices()["errors"]:
+                    raise Exception(str(g.get_notices()["errors"]))
+            rows.append({"abstractions": num_abstractions, "jobs": jobs, "parse (ms)": 1000*min(times)})
+        return rows
+
+    @classmethod
+    def max_abstraction_instances(clazz, out_dir, num_iterations=5):
+        rows = []
+        for num_instances in [100, 1000]:
+            # many instances of a maxlib abstraction
+            max_path = os.path.join(out_dir, "instances-{0}.maxpat".format(num_instances))
+            boxes = [{"box": {"id": "dac", "maxclass": "newobj", "text": "dac~", "patching_rect": [10, 100, 30, 20]}}]
+            lines = []
+            for i in xrange(num_instances):
+                boxes.append({"box": {"id": "obj-{0}".format(i), "maxclass": "newobj",
+                    "text": "cycle~ {0}".format(100+i), "patching_rect": [10, 10, 60, 20]}})
+                lines.append({"patchline": {"source": ["obj-{0}".format(i), 0],
+                    "destination": ["dac", 0], "disabled": 0, "hidden": 0}})
+            with open(max_path, "w") as f:
+                json.dump({"patcher": {"boxes": boxes, "lines": lines}}, f)
+
+            times = []
+            stdout = sys.stdout
+            for _ in xrange(num_iterations):
+                sys.stdout = open(os.devnull, "w") # every instance warns about its comments
+                try:
+                    tick = time.time()
+                    results = hvcc.get_stage("max2hv").compile(max_path, None)
+                    times.append(time.time() - tick)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                CompileBenchmark.__check({"max2hv": results})
+            rows.append({
+                "instances": num_instances,
+                "max2hv (ms)": 1000*min(times),
+                "per (us)": 1000000*min(times)/num_instances
+            })
+        return rows
+
+    @classmethod
+    def heavy_graph_instances(clazz, out_dir, num_iterations=5):
+        # many instances of a Heavy graph (lorenz~ is implemented as a .hv.json graph)
+        pd_path = os.path.join(out_dir, "hv_instances.pd")
+        num_instances = 1000
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n")
+            for i in xrange(num_instances):
+                f.write("#X obj 10 10 lorenz~;\n")
+
+        times = []
+        for _ in xrange(num_iterations):
+            tick = time.time()
+            g = PdParser().graph_from_file(pd_path)
+            g.to_hv()
+            times.append(time.time() - tick)
+            if g.get_notices()["errors"]:
+                raise Exception(str(g.get_notices()["errors"]))
+
+        return [{
+            "instances": num_instances,
+            "parse (ms)": 1000*min(times),
+            "per (us)": 1000000*min(times)/num_instances
+        }]
+
+    @classmethod
+    def large_tables(clazz, out_dir, num_iterations=5):
+        rows = []
+        for num_values in [10000, 100000, 1000000]:
+            pd_path = PdPatchGenerator.write("table", num_values,
+                os.path.join(out_dir, "table-{0}".format(num_values), "table.pd"))
+            t_compile = CompileBenchmark.__time_compile(pd_path, out_dir, num_iterations)
+            t_intermediates = CompileBenchmark.__time_compile(pd_path, out_dir, num_iterations,
+                emit_intermediates=True)
+            rows.append({
+                "values": num_values,
+                "compile (ms)": 1000*t_compile,
+                "per (us)": 1000000*t_compile/num_values,
+                "intermediates (ms)": 1000*t_intermediates
+            })
+        return rows
+
+    @classmethod
+    def production_mode(clazz, out_dir, num_iterations=5):
+        # a documented patch, where every object has a comment and a [cnv] label
+        pd_path = os.path.join(out_dir, "documented.pd")
+        num_objects = 1000
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n")
+            for i in xrange(num_objects):
+                f.write("#X obj 10 {0} + 1;\n".format(i))
+                f.write("#X text 100 {0} adds one to the output of the object above \\, \"+ 1\";\n".format(i))
+                f.write("#X obj 90 {0} cnv 15 200 20 empty empty empty 20 12 0 14 -233017 -66577 0;\n".format(i))
+            for i in xrange(num_objects-1):
+                if (i+1) % 10 != 0: # in short chains
+                    f.write("#X connect {0} 0 {1} 0;\n".format(3*i, 3*(i+1)))
+
+        rows = []
+        for production in [False, True]:
+            t_parse = []
+            t_compile = []
+            for _ in xrange(num_iterations):
+                profiler = Profiler()
+                tick = time.time()
+                results = hvcc.compile_dataflow(pd_path, out_dir,
+                    emit_intermediates=True, production=production, profiler=profiler)
+                t_compile.append(time.time() - tick)
+                CompileBenchmark.__check(results)
+                t_parse.append(next(r["time"] for r in profiler.records if r["name"] == "parse"))
+            rows.append({
+                "mode": "production" if production else "default",
+                "hv (KB)": os.path.getsize(os.path.join(out_dir, "hv", "documented.hv.json"))/1024.0,
+                "hv2ir parse (ms)": 1000*min(t_parse),
+                "compile (ms)": 1000*min(t_compile)
+            })
+        return rows
+
+    @classmethod
+    def hv2ir_memory(clazz, out_dir, num_iterations=1,
+            patches=(("chain", 4000), ("sendreceive", 400), ("fanout", 400))):
+        """ Measures the memory of the hv2ir graph of generated patches, as the
+            size of all objects tracked by the garbage collector. Each patch is
+            measured once, in a new process.
+        """
+        script = "\n".join([
+            "import gc, json, sys",
+            "sys.path.insert(0, {0!r})".format(ROOT_DIR),
+            "from core.hv2ir.HeavyParser import HeavyParser",
+            "from core.profiler.Profiler import Profiler",
+            "from core.tables.TableValues import TableValues",
+            "def size():",
+            "    gc.collect()",
+            "    return sum(sys.getsizeof(o) for o in gc.get_objects())",
+            "hv_path = sys.argv[1]",
+            "hv_json = TableValues.load(hv_path)",
+            "m0 = size()",
+            "g = HeavyParser.graph_from_object(hv_json, hv_file=hv_path, path_stack={hv_path}, xname='heavy')",
+            "m1 = size()",
+            "g.prepare(Profiler(enabled=False))",
+            "m2 = size()",
+            "print json.dumps([sum(g.get_object_counter(recursive=True).values()), m1-m0, m2-m1])"
+        ])
+
+        rows = []
+        for shape, size in patches:
+            pd_path = PdPatchGenerator.write(shape, size,
+                os.path.join(out_dir, shape, "{0}.pd".format(shape)))
+            CompileBenchmark.__check({"pd2hv": hvcc.get_stage("pd2hv").compile(
+                pd_path, os.path.join(out_dir, shape, "hv"))})
+
+            num_objects, m_parse, m_prepare = json.loads(subprocess.check_output([
+                sys.executable, "-c", script,
+                os.path.join(out_dir, shape, "hv", "{0}.hv.json".format(shape))]))
+            rows.append({
+                "patch": "{0} {1}".format(shape, size),
+                "objects": num_objects,
+                "parse (MB)": m_parse/1048576.0,
+                "prepare (MB)": m_prepare/1048576.0,
+                "per (B)": float(m_parse+m_prepare)/num_objects
+            })
+        return rows
+
+    @classmethod
+    def hv2ir_scaling(clazz, out_dir, num_iterations=1, sizes=(1000, 3000, 10000)):
+        """ Measures the graph transformations of hv2ir for chains of control
+            objects of the given sizes.
+        """
+        rows = []
+        for size in sizes:
+            pd_path = PdPatchGenerator.write("chain", size,
+                os.path.join(out_dir, "chain-{0}".format(size), "chain.pd"))
+            times = []
+            for _ in xrange(num_iterations):
+                profiler = Profiler(enabled=True)
+                CompileBenchmark.__check(hvcc.compile_dataflow(pd_path, out_dir,
+                    generators=[], profiler=profiler))
+                times.append({r["name"]: r["time"] for r in profiler.records})
+            t_prepare = min(t["prepare"] for t in times)
+            rows.append({
+                "chain": size,
+                "prepare (ms)": 1000*t_prepare,
+                "reduce (ms)": 1000*min(t["reduce"] for t in times),
+                "per (us)": 1000000*t_prepare/size
+            })
+        return rows
+
+    @classmethod
+    def __write_control_patch(clazz, pd_path, num_lines):
+        """ Writes a patch of about the given number of lines, with a chain of
+            control objects, messages and comments.
+        """
+        lines = ["#N canvas 0 0 450 300 10;"]
+        num_objects = num_lines/2
+        for i in xrange(num_objects):
+            if i % 3 == 0:
+                lines.append("#X obj 10 {0} + {0};".format(i))
+            elif i % 3 == 1:
+                lines.append("#X msg 10 {0} \\$1 {0};".format(i))
+            else:
+                lines.append("#X obj 10 {0} t f f, f 10;".format(i))
+        lines.append("#X text 10 10 a comment which is split")
+        lines.append("over two lines;")
+        for i in xrange(num_objects-1):
+            lines.append("#X connect {0} 0 {1} 0;".format(i, i+1))
+        with open(pd_path, "w") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+
+    @classmethod
+    def tokenizer_scaling(clazz, out_dir, num_iterations=5):
+        rows = []
+        for num_lines in [1000, 10000, 100000]:
+            pd_path = os.path.join(out_dir, "lines-{0}.pd".format(num_lines))
+            CompileBenchmark.__write_control_patch(pd_path, num_lines)
+
+            times = []
+            for _ in xrange(num_iterations):
+                tick = time.time()
+                PdTokenizer.tokenize(pd_path)
+                times.append(time.time() - tick)
+            t_tokenize = min(times)
+
+            tick = time.time()
+            g = PdParser().graph_from_file(pd_path)
+            t_parse = time.time() - tick
+            if g.get_notices()["errors"]:
+                raise Exception(str(g.get_notices()["errors"]))
+
+            rows.append({
+                "lines": num_lines,
+                "tokenize (ms)": 1000*t_tokenize,
+                "tokenize per (us)": 1000000*t_tokenize/num_lines,
+                "parse (ms)": 1000*t_parse,
+                "parse per (us)": 1000000*t_parse/num_lines
+            })
+        return rows
+
+    @classmethod
+    def startup(clazz, out_dir, num_iterations=5):
+        hvcc_path = os.path.join(ROOT_DIR, "hvcc.py")
+        pd_path = os.path.join(CONTROL_TEST_DIR, "test-bang.pd")
+        cache_dir = os.path.join(out_dir, "cache")
+        commands = [
+            ("import hvcc", [sys.executable, "-c", "import hvcc"]),
+            ("--help", [sys.executable, hvcc_path, "--help"]),
+            ("-g c", [sys.executable, hvcc_path, pd_path, "-o", out_dir]),
+            ("-g c (cache hit)", [sys.executable, hvcc_path, pd_path, "-o", out_dir, "--cache-dir", cache_dir])
+        ]
+
+        rows = []
+        for name, args in commands:
+            times = []
+            for _ in xrange(num_iterations):
+                tick = time.time()
+                subprocess.check_output(args, cwd=ROOT_DIR)
+                times.append(time.time() - tick)
+            rows.append({"command": name, "time (ms)": 1000*min(times)})
+        return rows
+
+    @classmethod
+    def compile_server(clazz, out_dir, num_iterations=5):
+        pd_paths = CompileBenchmark.__get_patches(CONTROL_TEST_DIR)[:5]
+        pd_paths.append(os.path.join(SPEED_TEST_DIR, "test-14-obj-osc.pd"))
+        hvcc_path = os.path.join(ROOT_DIR, "hvcc.py")
+
+        socket_path = os.path.join(out_dir, "hvcc.sock")
+        thread = threading.Thread(target=hvcc.serve, args=(socket_path,))
+        thread.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        client = CompileClient(socket_path)
+
+        rows = []
+        try:
+            for pd_path in pd_paths:
+                patch_dir = os.path.join(out_dir, os.path.basename(pd_path))
+
+                # a new hvcc process
+                tick = time.time()
+                subprocess.check_output([sys.executable, hvcc_path, pd_path, "-o", patch_dir])
+                t_process = time.time() - tick
+
+                # the best recompile on an already running server
+                times = []
+                for _ in xrange(num_iterations):
+                    tick = time.time()
+                    client.compile(in_path=pd_path, out_dir=patch_dir)
+                    times.append(time.time() - tick)
+
+                rows.append({
+                    "patch": os.path.basename(pd_path),
+                    "process (ms)": 1000*t_process,
+                    "server (ms)": 1000*min(times)
+                })
+        finally:
+            client.shutdown()
+            client.close()
+            thread.join()
+        return rows
+
+    @classmethod
+    def print_rows(clazz, name, rows):
+        """ Prints the rows of a benchmark as a table.
+        """
+        columns = CompileBenchmark.__COLUMNS[name]
+        widths = [32] + [max(12, len(c)) for c in columns[1:]]
+
+        def format_value(v, w):
+            return "{0:>{1}.2f}".format(v, w) if isinstance(v, float) else "{0:>{1}}".format(v, w)
+
+        print "{0:<{1}} {2}".format(columns[0], widths[0],
+            " ".join("{0:>{1}}".format(c, w) for c, w in zip(columns[1:], widths[1:])))
+        for r in rows:
+            print "{0:<{1}} {2}".format(r[columns[0]], widths[0],
+                " ".join(format_value(r[c], w) for c, w in zip(columns[1:], widths[1:])))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the compiler on generated and test patches, and prints the results.")
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help="The benchmarks to run. Defaults to all of them: " + ", ".join(CompileBenchmark.get_benchmarks()))
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="The number of runs of each timed operation, of which the best is reported.")
+    parser.add_argument(
+        "-o",
+        "--out_dir",
+        help="The directory of the compiled patches. Defaults to a temporary directory, which is removed afterwards.")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in CompileBenchmark.get_benchmarks():
+            parser.error("unknown benchmark: {0}".format(name))
+
+    for name in args.benchmarks or CompileBenchmark.get_benchmarks():
+        out_dir = os.path.join(os.path.abspath(os.path.expanduser(args.out_dir)), name) if args.out_dir \
+            else tempfile.mkdtemp(prefix="compilebench-")
+        if not os.path.isdir(out_dir):
+            os.makedirs(out_dir)
+        try:
+            print name
+            CompileBenchmark.print_rows(name, CompileBenchmark.run(name, out_dir, args.iterations))
+            print ""
+        finally:
+            if not args.out_dir:
+                shutil.rmtree(out_dir)
+
+if __name__ == "__main__":
+    main()
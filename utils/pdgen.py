@@ -0,0 +1,160 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+
+class PdPatchGenerator:
+    """ Generates synthetic Pd patches of a given shape and size, in order to
+        measure how the compiler scales. All patches compile without errors.
+    """
+
+    # the length of each chain of the "chain" shape. Longer chains exceed
+    # the recursion limit of the compiler.
+    __CHAIN_LENGTH = 100
+
+    # the number of values per "#A" line of the "table" shape
+    __VALUES_PER_LINE = 1000
+
+    @classmethod
+    def get_shapes(clazz):
+        """ Returns the names of all shapes, and what their size refers to.
+        """
+        return {
+            "fanout": "signal objects connected to the same outlet",
+            "chain": "control objects, in chains of {0}".format(PdPatchGenerator.__CHAIN_LENGTH),
+            "abstractions": "distinct abstraction files",
+            "sendreceive": "distinct send/receive names",
+            "table": "values in a table"
+        }
+
+    @classmethod
+    def write(clazz, shape, size, pd_path):
+        """ Writes a patch of the given shape and size. Any abstractions are
+            written to the same directory. Returns the path of the patch.
+        """
+        if not os.path.isdir(os.path.dirname(pd_path)):
+            os.makedirs(os.path.dirname(pd_path))
+        lines = {
+            "fanout": PdPatchGenerator.__get_fanout_lines,
+            "chain": PdPatchGenerator.__get_chain_lines,
+            "abstractions": PdPatchGenerator.__get_abstractions_lines,
+            "sendreceive": PdPatchGenerator.__get_sendreceive_lines,
+            "table": PdPatchGenerator.__get_table_lines
+        }[shape](size, os.path.dirname(pd_path))
+
+        with open(pd_path, "w") as f:
+            f.write("#N canvas 0 0 450 300 10;\n")
+            for l in lines:
+                f.write(l + ";\n")
+        return pd_path
+
+    @classmethod
+    def __get_fanout_lines(clazz, size, pd_dir):
+        # [osc~] -> size * [*~] -> [dac~]
+        lines = ["#X obj 10 10 osc~ 440", "#X obj 10 100 dac~"]
+        lines.extend("#X obj 10 50 *~ {0}".format(1.0/(i+1)) for i in xrange(size))
+        for i in xrange(size):
+            lines.append("#X connect 0 0 {0} 0".format(i+2))
+            lines.append("#X connect {0} 0 1 0".format(i+2))
+        return lines
+
+    @classmethod
+    def __get_chain_lines(clazz, size, pd_dir):
+        # [loadbang] -> [+ 1] -> [+ 1] -> ... -> [print]
+        lines = []
+        connections = []
+        for i in xrange(0, size, PdPatchGenerator.__CHAIN_LENGTH):
+            lines.append("#X obj 10 10 loadbang")
+            for j in xrange(min(PdPatchGenerator.__CHAIN_LENGTH, size-i)):
+                lines.append("#X obj 10 {0} + 1".format(20+j))
+                connections.append("#X connect {0} 0 {1} 0".format(len(lines)-2, len(lines)-1))
+            lines.append("#X obj 10 10 print chain_{0}".format(i))
+            connections.append("#X connect {0} 0 {1} 0".format(len(lines)-2, len(lines)-1))
+        return lines + connections
+
+    @classmethod
+    def __get_abstractions_lines(clazz, size, pd_dir):
+        # [osc~] -> size * [abs_N] -> [dac~]
+        lines = ["#X obj 10 10 osc~ 440", "#X obj 10 100 dac~"]
+        for i in xrange(size):
+            with open(os.path.join(pd_dir, "abs_{0}.pd".format(i)), "w") as f:
+                f.write("#N canvas 0 0 450 300 10;\n")
+                f.write("#X obj 10 10 inlet~;\n")
+                f.write("#X obj 10 40 *~ {0};\n".format(1.0/(i+1)))
+                f.write("#X obj 10 70 outlet~;\n")
+                f.write("#X connect 0 0 1 0;\n#X connect 1 0 2 0;\n")
+            lines.append("#X obj 10 50 abs_{0}".format(i))
+        for i in xrange(size):
+            lines.append("#X connect 0 0 {0} 0".format(i+2))
+            lines.append("#X connect {0} 0 1 0".format(i+2))
+        return lines
+
+    @classmethod
+    def __get_sendreceive_lines(clazz, size, pd_dir):
+        # [loadbang] -> size * [s name_N], and size * [r name_N] -> [+ N] -> [print]
+        lines = ["#X obj 10 10 loadbang", "#X obj 10 100 print"]
+        connections = []
+        for i in xrange(size):
+            lines.append("#X obj 10 40 s name_{0}".format(i))
+            connections.append("#X connect 0 0 {0} 0".format(len(lines)-1))
+            lines.append("#X obj 100 40 r name_{0}".format(i))
+            lines.append("#X obj 100 70 + {0}".format(i))
+            connections.append("#X connect {0} 0 {1} 0".format(len(lines)-2, len(lines)-1))
+            connections.append("#X connect {0} 0 1 0".format(len(lines)-1))
+        return lines + connections
+
+    @classmethod
+    def __get_table_lines(clazz, size, pd_dir):
+        # a table of size values, read by [tabread4~] -> [dac~]
+        lines = [
+            "#N canvas 0 0 450 300 (subpatch) 0",
+            "#X array table {0} float 3".format(size)
+        ]
+        n = PdPatchGenerator.__VALUES_PER_LINE
+        for i in xrange(0, size, n):
+            lines.append("#A {0} {1}".format(i, " ".join("{0:g}".format(((i+j) % 100)/100.0 - 0.5) \
+                for j in xrange(min(n, size-i)))))
+        lines.extend([
+            "#X coords 0 1 {0} -1 200 140 1".format(size),
+            "#X restore 10 10 graph",
+            "#X obj 10 200 tabread4~ table",
+            "#X obj 10 230 dac~",
+            "#X connect 1 0 2 0"
+        ])
+        return lines
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generates a synthetic Pd patch, e.g. to measure how the compiler scales.")
+    parser.add_argument(
+        "shape",
+        choices=sorted(PdPatchGenerator.get_shapes().keys()),
+        help="The shape of the patch. " + ", ".join("{0}: the size is the number of {1}".format(k, v) \
+            for k, v in sorted(PdPatchGenerator.get_shapes().items())))
+    parser.add_argument(
+        "size",
+        type=int,
+        help="The size of the patch.")
+    parser.add_argument(
+        "pd_path",
+        help="The path of the generated patch. Abstractions are written to the same directory.")
+    args = parser.parse_args()
+
+    print PdPatchGenerator.write(args.shape, args.size,
+        os.path.abspath(os.path.expanduser(args.pd_path)))
+
+if __name__ == "__main__":
+    main()
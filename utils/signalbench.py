@@ -0,0 +1,168 @@
+# Copyright (C) 2014-2018 Enzien Audio, Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import hvcc
+
+SCRIPT_DIR = os.path.dirname(__file__)
+TESTS_DIR = os.path.join(SCRIPT_DIR, "..", "tests")
+
+class SignalBenchmark:
+    """ Measures the us/block of the generated code of patches, with each
+        signal ordering. Each patch is built once per ordering, and the
+        builds are run alternately, such that a disturbance of the machine
+        affects all of them alike. The best run is reported.
+    """
+
+    __SIGNAL_ORDERINGS = ["depth-first", "working-set"]
+
+    __SIMD_FLAGS = {
+        "HV_SIMD_NONE": ["-DHV_SIMD_NONE"],
+        "HV_SIMD_SSE": ["-msse", "-msse2", "-msse3", "-mssse3", "-msse4.1", "-msse4.2"],
+        "HV_SIMD_AVX": ["-msse", "-msse2", "-msse3", "-mssse3", "-msse4.1", "-msse4.2", "-mavx", "-mfma"],
+        "HV_SIMD_NEON": ["-mcpu=cortex-a7", "-mfloat-abi=hard"]
+    }
+
+    @classmethod
+    def build(clazz, pd_path, out_dir, flag="HV_SIMD_SSE", cc="clang", cxx="clang++", **kwargs):
+        """ Compiles a patch together with tests/test_speed.c into an
+            executable. Returns the path of the executable.
+        """
+        results = hvcc.compile_dataflow(pd_path, out_dir, **kwargs)
+        for r in results.values():
+            if r["notifs"].get("has_error", False):
+                raise Exception("{0} does not compile: {1}".format(pd_path, r["notifs"]))
+
+        c_src_dir = os.path.join(out_dir, "c")
+        shutil.copy2(os.path.join(TESTS_DIR, "test_speed.c"), c_src_dir)
+
+        c_flags = SignalBenchmark.__SIMD_FLAGS[flag] + ["-O3", "-ffast-math", "-DNDEBUG", "-w"]
+        o_files = []
+        for c in sorted(os.listdir(c_src_dir)):
+            if c.endswith(".c"):
+                cmd = [cc, "-std=c11"]
+            elif c.endswith(".cpp"):
+                cmd = [cxx, "-std=c++11", "-fno-exceptions", "-fno-rtti"]
+            else:
+                continue
+            o_files.append(os.path.join(c_src_dir, c + ".o"))
+            subprocess.check_output(cmd + c_flags + ["-c", os.path.join(c_src_dir, c), "-o", o_files[-1]])
+
+        exe_path = os.path.join(out_dir, "heavy")
+        subprocess.check_output([cxx] + o_files + ["-lm", "-o", exe_path])
+        return exe_path
+
+    @classmethod
+    def run(clazz, pd_paths, out_dir, block_size=512, num_iterations=20000, num_runs=5, **kwargs):
+        """ Prints the best us/block of each patch with each signal ordering.
+            Returns them as {pd name: [us/block]}, in the order of get_signal_orderings().
+        """
+        orderings = SignalBenchmark.__SIGNAL_ORDERINGS
+        results = {}
+        print "{0:<24} {1:>12} {2:>12} {3:>8}".format("us/block", orderings[0], orderings[1], "change")
+        for pd_path in pd_paths:
+            pd_name = os.path.basename(pd_path)
+            exe_paths = [SignalBenchmark.build(pd_path,
+                os.path.join(out_dir, os.path.splitext(pd_name)[0], o),
+                signal_ordering=o, **kwargs) for o in orderings]
+
+            ticks = [[] for _ in orderings]
+            for _ in xrange(num_runs):
+                for i, exe_path in enumerate(exe_paths):
+                    ticks[i].append(float(subprocess.check_output(
+                        [exe_path, "48000", str(block_size), str(num_iterations)])))
+            results[pd_name] = [min(t) for t in ticks]
+            print "{0:<24} {1:>12.3f} {2:>12.3f} {3:>7.1f}%".format(
+                pd_name, results[pd_name][0], results[pd_name][1],
+                100.0*(results[pd_name][1]-results[pd_name][0])/results[pd_name][0])
+        return results
+
+    @classmethod
+    def get_signal_orderings(clazz):
+        return list(SignalBenchmark.__SIGNAL_ORDERINGS)
+
+    @classmethod
+    def get_simd_flags(clazz):
+        return sorted(SignalBenchmark.__SIMD_FLAGS.keys())
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares the us/block of the generated code of patches with each signal ordering.")
+    parser.add_argument(
+        "pd_paths",
+        nargs="*",
+        help="The patches to measure. Defaults to all patches in tests/pd/speed.")
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=512,
+        help="The number of samples per block.")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=20000,
+        help="The number of blocks processed per run.")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="The number of runs per patch and ordering, of which the best is reported.")
+    parser.add_argument(
+        "--simd",
+        choices=SignalBenchmark.get_simd_flags(),
+        default="HV_SIMD_SSE",
+        help="The SIMD instruction set to compile for.")
+    parser.add_argument(
+        "--cc",
+        default="clang",
+        help="The C compiler.")
+    parser.add_argument(
+        "--cxx",
+        default="clang++",
+        help="The C++ compiler, which also links the executable.")
+    parser.add_argument(
+        "-o",
+        "--out_dir",
+        help="The directory of the builds. Defaults to a temporary directory, which is removed afterwards.")
+    args = parser.parse_args()
+
+    pd_paths = [os.path.abspath(os.path.expanduser(p)) for p in args.pd_paths]
+    if not pd_paths:
+        speed_dir = os.path.abspath(os.path.join(TESTS_DIR, "pd", "speed"))
+        pd_paths = [os.path.join(speed_dir, f) for f in sorted(os.listdir(speed_dir)) if f.endswith(".pd")]
+
+    out_dir = os.path.abspath(os.path.expanduser(args.out_dir)) if args.out_dir \
+        else tempfile.mkdtemp(prefix="signalbench-")
+    try:
+        SignalBenchmark.run(pd_paths, out_dir,
+            block_size=args.block_size,
+            num_iterations=args.iterations,
+            num_runs=args.runs,
+            flag=args.simd,
+            cc=args.cc,
+            cxx=args.cxx)
+    finally:
+        if not args.out_dir:
+            shutil.rmtree(out_dir)
+
+if __name__ == "__main__":
+    main()